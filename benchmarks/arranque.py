@@ -0,0 +1,125 @@
+"""
+Arranque de gunicorn: tiempo hasta la primera solicitud y memoria por worker.
+
+Levanta gunicorn con config/gunicorn.conf.py en tres variantes:
+
+- base: sin preload, sin gc.freeze, sin calentamiento
+- preload: app precargada en el maestro, sin gc.freeze ni calentamiento
+- completo: preload + calentamiento + gc.freeze (la configuración por defecto)
+
+En cada una mide el tiempo hasta que el puerto acepta conexiones, la duración
+de la primera solicitud a /api/clientes/ y el tiempo total desde el arranque
+hasta esa primera respuesta. Después de --solicitudes solicitudes lee
+/proc/<pid>/smaps_rollup de cada worker: RSS, PSS y USS (memoria privada).
+Solo funciona en Linux.
+
+    python benchmarks/arranque.py --workers 4 --solicitudes 300
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+VARIANTES = {
+    "base": {"GUNICORN_PRELOAD": "false", "GUNICORN_GC_FREEZE": "false", "GUNICORN_CALENTAR": "false"},
+    "preload": {"GUNICORN_PRELOAD": "true", "GUNICORN_GC_FREEZE": "false", "GUNICORN_CALENTAR": "false"},
+    "completo": {"GUNICORN_PRELOAD": "true", "GUNICORN_GC_FREEZE": "true", "GUNICORN_CALENTAR": "true"},
+}
+
+
+def _esperar_puerto(puerto: int, limite_s: float = 60) -> None:
+    fin = time.monotonic() + limite_s
+    while time.monotonic() < fin:
+        try:
+            socket.create_connection(("127.0.0.1", puerto), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.01)
+    raise TimeoutError(f"gunicorn no abrió el puerto {puerto}")
+
+
+def _get(url: str) -> float:
+    inicio = time.perf_counter()
+    with urllib.request.urlopen(url, timeout=30) as resp:
+        resp.read()
+        assert resp.status == 200, resp.status
+    return (time.perf_counter() - inicio) * 1000
+
+
+def _workers(maestro: int) -> list[int]:
+    with open(f"/proc/{maestro}/task/{maestro}/children") as f:
+        return [int(pid) for pid in f.read().split()]
+
+
+def _memoria_kb(pid: int) -> dict:
+    campos = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for linea in f:
+            partes = linea.split()
+            if len(partes) == 3 and partes[2] == "kB":
+                campos[partes[0].rstrip(":")] = int(partes[1])
+    return {
+        "rss": campos["Rss"],
+        "pss": campos["Pss"],
+        "uss": campos["Private_Clean"] + campos["Private_Dirty"],
+    }
+
+
+def _medir(nombre: str, workers: int, solicitudes: int, puerto: int) -> dict:
+    env = {**os.environ, **VARIANTES[nombre], "GUNICORN_WORKERS": str(workers), "GUNICORN_ACCESSLOG": ""}
+    env.setdefault("ALLOWED_HOSTS", "localhost,127.0.0.1")
+    inicio = time.perf_counter()
+    proceso = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "config/gunicorn.conf.py",
+         "--bind", f"127.0.0.1:{puerto}", "config.wsgi:application"],
+        cwd=RAIZ,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{puerto}/api/clientes/"
+    try:
+        _esperar_puerto(puerto)
+        listo = time.perf_counter() - inicio
+        primera = _get(url)
+        ttfr = time.perf_counter() - inicio
+
+        with ThreadPoolExecutor(workers * 2) as ex:
+            list(ex.map(_get, [url] * solicitudes))
+
+        memorias = [_memoria_kb(pid) for pid in _workers(proceso.pid)]
+        promedio = {k: round(sum(m[k] for m in memorias) / len(memorias) / 1024, 1) for k in ("rss", "pss", "uss")}
+        return {
+            "listo_s": round(listo, 2),
+            "primera_ms": round(primera, 1),
+            "ttfr_s": round(ttfr, 2),
+            **{f"{k}_mb": v for k, v in promedio.items()},
+            "maestro_rss_mb": round(_memoria_kb(proceso.pid)["rss"] / 1024, 1),
+        }
+    finally:
+        proceso.terminate()
+        proceso.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--solicitudes", type=int, default=300)
+    parser.add_argument("--puerto", type=int, default=8765)
+    args = parser.parse_args()
+
+    columnas = ("listo_s", "primera_ms", "ttfr_s", "rss_mb", "pss_mb", "uss_mb", "maestro_rss_mb")
+    print(f"{'variante':<10}" + "".join(f"{c:>15}" for c in columnas))
+    for nombre in VARIANTES:
+        r = _medir(nombre, args.workers, args.solicitudes, args.puerto)
+        print(f"{nombre:<10}" + "".join(f"{r[c]:>15}" for c in columnas))
+
+
+if __name__ == "__main__":
+    main()
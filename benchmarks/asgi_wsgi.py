@@ -0,0 +1,236 @@
+"""
+Benchmark de lecturas: API síncrona bajo WSGI vs /api/async/ bajo ASGI.
+
+Llama directamente a los handlers de Django, sin servidor HTTP de por medio:
+WSGI con un pool de --concurrencia hilos (como un worker gthread) y ASGI con
+--concurrencia corutinas en un event loop (como un worker uvicorn). Cada modo
+corre en su propio proceso.
+
+    python benchmarks/asgi_wsgi.py --solicitudes 2000 --concurrencia 50 --latencia-ms 2
+
+--latencia-ms agrega una espera por consulta SQL para simular el RTT de una BD
+remota; con Postgres local la consulta casi no espera I/O y el resultado lo
+domina la CPU (y el GIL). Usa la BD de las variables POSTGRES_*; crea un
+cliente temporal con algunas facturas y los elimina al terminar.
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+
+def _preparar(latencia_ms: float):
+    sys.path.insert(0, str(RAIZ))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+
+    django.setup()
+    from django.db.backends.signals import connection_created
+
+    if latencia_ms:
+
+        def con_latencia(execute, sql, params, many, context):
+            time.sleep(latencia_ms / 1000)
+            return execute(sql, params, many, context)
+
+        def instalar(sender, connection, **kwargs):
+            connection.execute_wrappers.append(con_latencia)
+
+        connection_created.connect(instalar, weak=False)
+
+
+def _datos():
+    from django.db import connections
+
+    from clientes.modelos import Cliente, EstadoCliente
+    from facturas.modelos import Factura
+
+    cliente = Cliente.objects.create(
+        rut=f"9{int(time.time()) % 10000000:07d}-K",
+        razon_social="Benchmark",
+        email="bench@example.com",
+        linea_credito="1000000.00",
+        linea_disponible="1000000.00",
+        estado=EstadoCliente.ACTIVO,
+    )
+    Factura.objects.bulk_create(
+        [
+            Factura(
+                cliente=cliente,
+                numero_factura=f"BENCH-{i}",
+                rut_deudor="76.543.210-3",
+                razon_social_deudor="Deudor",
+                monto_total="1000.00",
+                fecha_emision="2026-02-01",
+                fecha_vencimiento="2026-03-01",
+            )
+            for i in range(50)
+        ]
+    )
+    connections.close_all()
+    return cliente
+
+
+def _resumen(tiempos: list[float], total: float) -> dict:
+    tiempos.sort()
+    return {
+        "p50_ms": round(statistics.median(tiempos), 2),
+        "p95_ms": round(tiempos[int(len(tiempos) * 0.95) - 1], 2),
+        "rps": round(len(tiempos) / total, 1),
+    }
+
+
+def _medir_wsgi(urls: dict, solicitudes: int, concurrencia: int) -> dict:
+    from django.core.handlers.wsgi import WSGIHandler
+
+    handler = WSGIHandler()
+
+    def una(url):
+        ruta, _, query = url.partition("?")
+        environ = {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": ruta,
+            "QUERY_STRING": query,
+            "SCRIPT_NAME": "",
+            "SERVER_NAME": "localhost",
+            "SERVER_PORT": "80",
+            "HTTP_HOST": "localhost",
+            "wsgi.input": io.BytesIO(),
+            "wsgi.url_scheme": "http",
+        }
+        estado = []
+        inicio = time.perf_counter()
+        respuesta = handler(environ, lambda status, headers: estado.append(status))
+        b"".join(respuesta)
+        respuesta.close()
+        assert estado[0].startswith("200"), estado
+        return (time.perf_counter() - inicio) * 1000
+
+    resultados = {}
+    with ThreadPoolExecutor(concurrencia) as ex:
+        for nombre, url in urls.items():
+            list(ex.map(una, [url] * concurrencia))  # calentamiento
+            inicio = time.perf_counter()
+            tiempos = list(ex.map(una, [url] * solicitudes))
+            resultados[nombre] = _resumen(tiempos, time.perf_counter() - inicio)
+    return resultados
+
+
+def _medir_asgi(urls: dict, solicitudes: int, concurrencia: int) -> dict:
+    from django.core.handlers.asgi import ASGIHandler
+
+    handler = ASGIHandler()
+
+    async def una(url):
+        ruta, _, query = url.partition("?")
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": ruta,
+            "root_path": "",
+            "query_string": query.encode(),
+            "headers": [(b"host", b"localhost")],
+            "server": ("localhost", 80),
+            "client": ("127.0.0.1", 0),
+        }
+        estado = []
+
+        async def recibir():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def enviar(mensaje):
+            if mensaje["type"] == "http.response.start":
+                estado.append(mensaje["status"])
+
+        inicio = time.perf_counter()
+        await handler(scope, recibir, enviar)
+        assert estado[0] == 200, estado
+        return (time.perf_counter() - inicio) * 1000
+
+    async def lote(url, n):
+        semaforo = asyncio.Semaphore(concurrencia)
+
+        async def limitada():
+            async with semaforo:
+                return await una(url)
+
+        return await asyncio.gather(*(limitada() for _ in range(n)))
+
+    async def medir():
+        resultados = {}
+        for nombre, url in urls.items():
+            await lote(url, concurrencia)  # calentamiento
+            inicio = time.perf_counter()
+            tiempos = await lote(url, solicitudes)
+            resultados[nombre] = _resumen(list(tiempos), time.perf_counter() - inicio)
+        return resultados
+
+    return asyncio.run(medir())
+
+
+def _medir(modo: str, solicitudes: int, concurrencia: int, latencia_ms: float) -> dict:
+    _preparar(latencia_ms)
+    from clientes.modelos import Cliente
+
+    cliente = _datos()
+    prefijo = "/api/async" if modo == "asgi" else "/api"
+    urls = {
+        "linea_disponible": f"{prefijo}/clientes/{cliente.id}/linea-disponible/",
+        "facturas": f"{prefijo}/facturas/?cliente_id={cliente.id}",
+    }
+    try:
+        medir = _medir_asgi if modo == "asgi" else _medir_wsgi
+        return medir(urls, solicitudes, concurrencia)
+    finally:
+        cliente.facturas.all().delete()
+        Cliente.objects.filter(id=cliente.id).delete()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--solicitudes", type=int, default=2000)
+    parser.add_argument("--concurrencia", type=int, default=50)
+    parser.add_argument("--latencia-ms", type=float, default=0)
+    parser.add_argument("--modo", choices=["wsgi", "asgi"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.modo:
+        print(json.dumps(_medir(args.modo, args.solicitudes, args.concurrencia, args.latencia_ms)))
+        return
+
+    filas = {}
+    for modo in ("wsgi", "asgi"):
+        salida = subprocess.run(
+            [
+                sys.executable, __file__, "--modo", modo,
+                "--solicitudes", str(args.solicitudes),
+                "--concurrencia", str(args.concurrencia),
+                "--latencia-ms", str(args.latencia_ms),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        filas[modo] = json.loads(salida.strip().splitlines()[-1])
+
+    print(f"{'endpoint':<18}{'modo':<6}{'p50 ms':>9}{'p95 ms':>9}{'req/s':>9}")
+    for endpoint in filas["wsgi"]:
+        for modo in filas:
+            r = filas[modo][endpoint]
+            print(f"{endpoint:<18}{modo:<6}{r['p50_ms']:>9}{r['p95_ms']:>9}{r['rps']:>9}")
+
+
+if __name__ == "__main__":
+    main()
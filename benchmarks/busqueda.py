@@ -0,0 +1,120 @@
+"""
+Benchmark de GET /api/buscar: latencia (p50/p95) de la búsqueda unificada
+sobre una tabla de facturas de tamaño realista.
+
+Inserta --facturas facturas con generate_series (1.000 deudores distintos,
+razones sociales armadas con un vocabulario chico, así hay términos muy
+comunes y otros raros), ejecuta ANALYZE y mide la vista completa (búsqueda,
+serialización y renderizado) para consultas por texto, con error de tipeo,
+por número de factura y por RUT.
+
+    python benchmarks/busqueda.py --facturas 5000000 --repeticiones 50
+
+Usa la BD configurada por las variables POSTGRES_*, con las migraciones
+aplicadas (requiere pg_trgm); crea los datos dentro de una transacción que se
+revierte al terminar. Con 5M de facturas la carga toma varios minutos.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+CONSULTAS = [
+    ("texto común", "minera"),
+    ("texto raro", "pacifico austral"),
+    ("error de tipeo", "constructra"),
+    ("número de factura", "F-4242424"),
+    ("RUT", "10.000.013-K"),
+]
+
+
+class _Revertir(Exception):
+    pass
+
+
+def _percentiles(funcion, repeticiones: int) -> tuple[float, float]:
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    cuantiles = statistics.quantiles(tiempos, n=20)
+    return statistics.median(tiempos), cuantiles[18]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--facturas", type=int, default=1_000_000)
+    parser.add_argument("--repeticiones", type=int, default=50)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(RAIZ))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+
+    django.setup()
+    from django.db import connection, transaction
+    from rest_framework.test import APIClient
+
+    from clientes.modelos import Cliente, EstadoCliente
+
+    api = APIClient()
+    resultados = []
+    try:
+        with transaction.atomic():
+            cliente = Cliente.objects.create(
+                rut="12.345.678-5",
+                razon_social="Benchmark",
+                email="bench@example.com",
+                linea_credito="1000000.00",
+                linea_disponible="1000000.00",
+                estado=EstadoCliente.ACTIVO,
+            )
+            inicio = time.perf_counter()
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO facturas_factura (
+                        cliente_id, numero_factura, rut_deudor, razon_social_deudor, monto_total,
+                        fecha_emision, fecha_vencimiento, estado, creado_en, actualizado_en
+                    )
+                    SELECT
+                        %s,
+                        'F-' || i,
+                        '10.000.' || lpad((i %% 1000)::text, 3, '0') || '-K',
+                        (ARRAY['Minera', 'Constructora', 'Comercial', 'Transportes', 'Inversiones'])[1 + i %% 5]
+                            || ' ' || (ARRAY['Andes', 'Pacifico', 'Austral', 'Norte', 'Sur', 'Valle', 'Bio Bio'])[1 + (i / 5) %% 7]
+                            || ' ' || (i %% 1000) || ' SpA',
+                        1000 + i %% 100000,
+                        DATE '2026-01-01',
+                        DATE '2026-03-01',
+                        'disponible',
+                        now(),
+                        now()
+                    FROM generate_series(1, %s) AS i
+                    """,
+                    [cliente.id, args.facturas],
+                )
+                cursor.execute("ANALYZE facturas_factura")
+            print(f"{args.facturas} facturas cargadas en {time.perf_counter() - inicio:.0f} s")
+
+            for nombre, q in CONSULTAS:
+                resp = api.get("/api/buscar", {"q": q})
+                assert resp.status_code == 200, resp.content
+                p50, p95 = _percentiles(lambda: api.get("/api/buscar", {"q": q}), args.repeticiones)
+                resultados.append((nombre, q, len(resp.json()["facturas"]), p50, p95))
+            raise _Revertir
+    except _Revertir:
+        pass
+
+    print(f"{'consulta':<20}{'q':<20}{'facturas':>9}{'p50':>10}{'p95':>10}")
+    for nombre, q, encontradas, p50, p95 in resultados:
+        print(f"{nombre:<20}{q:<20}{encontradas:>9}{p50:>8.1f}ms{p95:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark de conexiones: latencia de endpoints baratos con y sin pool.
+
+Ejecuta N solicitudes (ciclo completo de Django, incluido el cierre de
+conexión al final de cada una) contra /health/ y
+/api/clientes/{id}/linea-disponible/, primero con DB_POOL=false y luego con
+DB_POOL=true, cada modo en su propio proceso.
+
+    python benchmarks/conexiones.py --solicitudes 500 --hilos 4
+
+Usa la BD configurada por las variables POSTGRES_*; crea un cliente temporal
+y lo elimina al terminar.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+
+def _medir(solicitudes: int, hilos: int) -> dict:
+    sys.path.insert(0, str(RAIZ))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+
+    django.setup()
+    from django.db import connections
+    from django.test import Client
+
+    from clientes.modelos import Cliente, EstadoCliente
+
+    cliente = Cliente.objects.create(
+        rut=f"9{int(time.time()) % 10000000:07d}-K",
+        razon_social="Benchmark",
+        email="bench@example.com",
+        linea_credito="1000.00",
+        linea_disponible="1000.00",
+        estado=EstadoCliente.ACTIVO,
+    )
+    connections.close_all()
+    urls = {"health": "/health/", "linea_disponible": f"/api/clientes/{cliente.id}/linea-disponible/"}
+
+    def una(url):
+        inicio = time.perf_counter()
+        resp = Client(HTTP_HOST="localhost").get(url)
+        assert resp.status_code == 200, resp.content
+        return (time.perf_counter() - inicio) * 1000
+
+    resultados = {}
+    try:
+        for nombre, url in urls.items():
+            for _ in range(20):  # calentamiento
+                una(url)
+            inicio = time.perf_counter()
+            with ThreadPoolExecutor(hilos) as ex:
+                tiempos = sorted(ex.map(una, [url] * solicitudes))
+            total = time.perf_counter() - inicio
+            resultados[nombre] = {
+                "p50_ms": round(statistics.median(tiempos), 2),
+                "p95_ms": round(tiempos[int(len(tiempos) * 0.95) - 1], 2),
+                "rps": round(solicitudes / total, 1),
+            }
+    finally:
+        Cliente.objects.filter(id=cliente.id).delete()
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--solicitudes", type=int, default=500)
+    parser.add_argument("--hilos", type=int, default=1)
+    parser.add_argument("--modo", choices=["sin_pool", "pool"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.modo:
+        print(json.dumps(_medir(args.solicitudes, args.hilos)))
+        return
+
+    filas = {}
+    for modo, pool in (("sin_pool", "false"), ("pool", "true")):
+        salida = subprocess.run(
+            [sys.executable, __file__, "--modo", modo, "--solicitudes", str(args.solicitudes), "--hilos", str(args.hilos)],
+            env={**os.environ, "DB_POOL": pool},
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        filas[modo] = json.loads(salida.strip().splitlines()[-1])
+
+    print(f"{'endpoint':<18}{'modo':<10}{'p50 ms':>9}{'p95 ms':>9}{'req/s':>9}")
+    for endpoint in filas["sin_pool"]:
+        for modo in filas:
+            r = filas[modo][endpoint]
+            print(f"{endpoint:<18}{modo:<10}{r['p50_ms']:>9}{r['p95_ms']:>9}{r['rps']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Microbenchmark de JSON: JSONRenderer/JSONParser de DRF contra los de
+core.json_rapido (orjson), sobre páginas típicas de listados.
+
+- "facturas": página como la de GET /api/facturas/ (montos y fechas ya como
+  str, así los entrega el serializador).
+- "crudo": las mismas filas con Decimal y datetime sin convertir (el caso
+  de respuestas armadas a mano, p.ej. resultados de lote).
+- "lote": parseo de un POST /api/operaciones/lote/ de 500 solicitudes.
+
+Verifica que ambos produzcan los mismos bytes / los mismos datos.
+
+    python benchmarks/json_rapido.py --repeticiones 300
+
+No usa la BD.
+"""
+import argparse
+import datetime
+import io
+import os
+import statistics
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+
+def _medir(funcion, repeticiones: int) -> float:
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+
+def _factura(i: int, crudo: bool) -> dict:
+    creado = datetime.datetime(2026, 2, 1, 12, 0, i % 60, 123456, tzinfo=datetime.timezone.utc)
+    monto = Decimal(f"{1000 + i * 37}.{i % 100:02d}")
+    return {
+        "id": i,
+        "cliente": 1 + i % 50,
+        "numero_factura": f"F-{i:06d}",
+        "rut_deudor": "76.543.210-3",
+        "razon_social_deudor": "Deudor Comercial SpA",
+        "monto_total": monto if crudo else f"{monto:f}",
+        "fecha_emision": datetime.date(2026, 2, 1) if crudo else "2026-02-01",
+        "fecha_vencimiento": datetime.date(2026, 3, 1) if crudo else "2026-03-01",
+        "estado": "disponible",
+        "creado_en": creado if crudo else creado.isoformat().replace("+00:00", "Z"),
+        "actualizado_en": creado if crudo else creado.isoformat().replace("+00:00", "Z"),
+    }
+
+
+def _pagina(filas: int, crudo: bool) -> dict:
+    return {
+        "count": 12345,
+        "next": "http://localhost:8000/api/facturas/?page=2",
+        "previous": None,
+        "results": [_factura(i, crudo) for i in range(filas)],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticiones", type=int, default=300)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(RAIZ))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+
+    django.setup()
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from core.json_rapido import ParserJSON, RenderizadorJSON
+
+    drf, rapido = JSONRenderer(), RenderizadorJSON()
+    print(f"Mediana de {args.repeticiones} repeticiones")
+    print(f"{'caso':<22}{'DRF':>10}{'orjson':>10}")
+    for nombre, crudo in (("facturas", False), ("crudo", True)):
+        for filas in (20, 100, 500):
+            data = _pagina(filas, crudo)
+            assert drf.render(data) == rapido.render(data)
+            ms_drf = _medir(lambda: drf.render(data), args.repeticiones)
+            ms_rapido = _medir(lambda: rapido.render(data), args.repeticiones)
+            print(f"{nombre + ' x' + str(filas):<22}{ms_drf:>8.3f}ms{ms_rapido:>8.3f}ms  ({ms_drf / ms_rapido:.1f}x)")
+
+    cuerpo = drf.render(
+        {"operaciones": [{"cliente": i, "facturas_ids": list(range(i, i + 5)), "tasa_descuento": 2.5} for i in range(500)]}
+    )
+    contexto = {"encoding": "utf-8"}
+    assert JSONParser().parse(io.BytesIO(cuerpo), None, contexto) == ParserJSON().parse(io.BytesIO(cuerpo), None, contexto)
+    ms_drf = _medir(lambda: JSONParser().parse(io.BytesIO(cuerpo), None, contexto), args.repeticiones)
+    ms_rapido = _medir(lambda: ParserJSON().parse(io.BytesIO(cuerpo), None, contexto), args.repeticiones)
+    print(f"{'lote x500 (parse)':<22}{ms_drf:>8.3f}ms{ms_rapido:>8.3f}ms  ({ms_drf / ms_rapido:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
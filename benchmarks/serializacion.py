@@ -0,0 +1,102 @@
+"""
+Benchmark de serialización de listados: ModelSerializer de DRF contra el
+camino rápido de core.serializacion_rapida (.values() + Convertidor).
+
+Mide, para una página de facturas, el tiempo de consultar y convertir las
+filas (sin HTTP ni renderizado JSON), y verifica que ambos produzcan el mismo
+JSON.
+
+    python benchmarks/serializacion.py --filas 500 --repeticiones 50
+
+Usa la BD configurada por las variables POSTGRES_*; crea los datos dentro de
+una transacción que se revierte al terminar.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+
+class _Revertir(Exception):
+    pass
+
+
+def _medir(funcion, repeticiones: int) -> float:
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, default=500)
+    parser.add_argument("--repeticiones", type=int, default=50)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(RAIZ))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+
+    django.setup()
+    from django.db import transaction
+    from rest_framework.renderers import JSONRenderer
+
+    from clientes.modelos import Cliente, EstadoCliente
+    from core.serializacion_rapida import convertidor, valores
+    from facturas.api.serializadores import SerializadorFactura
+    from facturas.modelos import Factura
+    from facturas.selectores import obtener_facturas_filtradas
+
+    try:
+        with transaction.atomic():
+            cliente = Cliente.objects.create(
+                rut="12.345.678-5",
+                razon_social="Benchmark",
+                email="bench@example.com",
+                linea_credito="1000000.00",
+                linea_disponible="1000000.00",
+                estado=EstadoCliente.ACTIVO,
+            )
+            Factura.objects.bulk_create(
+                Factura(
+                    cliente=cliente,
+                    numero_factura=f"B-{i}",
+                    rut_deudor="76.543.210-3",
+                    razon_social_deudor="Deudor",
+                    monto_total=f"{1000 + i}.50",
+                    fecha_emision="2026-02-01",
+                    fecha_vencimiento="2026-03-01",
+                )
+                for i in range(args.filas)
+            )
+            queryset = obtener_facturas_filtradas({"cliente_id": cliente.id})[: args.filas]
+            conv = convertidor(SerializadorFactura)
+
+            def drf():
+                # .all() clona el queryset: cada repetición vuelve a consultar
+                return SerializadorFactura(list(queryset.all()), many=True).data
+
+            def rapido():
+                return conv.convertir(list(valores(queryset, conv)))
+
+            assert JSONRenderer().render(drf()) == JSONRenderer().render(rapido())
+            ms_drf = _medir(drf, args.repeticiones)
+            ms_rapido = _medir(rapido, args.repeticiones)
+            raise _Revertir
+    except _Revertir:
+        pass
+
+    print(f"{args.filas} facturas, mediana de {args.repeticiones} repeticiones")
+    print(f"  ModelSerializer:     {ms_drf:8.2f} ms")
+    print(f"  .values()+Convertir: {ms_rapido:8.2f} ms  ({ms_drf / ms_rapido:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
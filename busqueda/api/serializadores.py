@@ -0,0 +1,36 @@
+from rest_framework import serializers
+
+from clientes.modelos import Cliente
+from facturas.modelos import Factura
+
+
+class SerializadorClienteEncontrado(serializers.ModelSerializer):
+    relevancia = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = Cliente
+        fields = ["id", "rut", "razon_social", "estado", "relevancia"]
+
+
+class SerializadorFacturaEncontrada(serializers.ModelSerializer):
+    relevancia = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = Factura
+        fields = [
+            "id",
+            "cliente",
+            "numero_factura",
+            "rut_deudor",
+            "razon_social_deudor",
+            "monto_total",
+            "estado",
+            "relevancia",
+        ]
+
+
+class SerializadorResultadoBusqueda(serializers.Serializer):
+    q = serializers.CharField()
+    modo = serializers.ChoiceField(choices=["rut", "texto"])
+    clientes = SerializadorClienteEncontrado(many=True)
+    facturas = SerializadorFacturaEncontrada(many=True)
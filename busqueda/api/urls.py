@@ -0,0 +1,8 @@
+from django.urls import re_path
+
+from busqueda.api.vistas import VistaBusqueda
+
+urlpatterns = [
+    # /api/buscar?q=... (con o sin barra final)
+    re_path(r"^buscar/?$", VistaBusqueda.as_view(), name="buscar"),
+]
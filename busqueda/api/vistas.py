@@ -0,0 +1,47 @@
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from busqueda.api.serializadores import SerializadorResultadoBusqueda
+from busqueda.selectores import LARGO_MINIMO_TEXTO, buscar
+from core.rut import rut_de_busqueda
+
+LIMITE_POR_DEFECTO = 10
+LIMITE_MAXIMO = 50
+
+
+def _limite(params, nombre: str) -> int:
+    valor = params.get(nombre)
+    if valor in (None, ""):
+        return LIMITE_POR_DEFECTO
+    try:
+        limite = int(valor)
+    except ValueError:
+        limite = -1
+    if not 0 <= limite <= LIMITE_MAXIMO:
+        raise ValidationError({nombre: f"Debe ser un entero entre 0 y {LIMITE_MAXIMO}."})
+    return limite
+
+
+class VistaBusqueda(APIView):
+    @extend_schema(
+        tags=["Búsqueda"],
+        parameters=[
+            OpenApiParameter("q", str, required=True, description="Texto o RUT a buscar"),
+            OpenApiParameter("limite_clientes", int, description=f"0 a {LIMITE_MAXIMO} (por defecto {LIMITE_POR_DEFECTO})"),
+            OpenApiParameter("limite_facturas", int, description=f"0 a {LIMITE_MAXIMO} (por defecto {LIMITE_POR_DEFECTO})"),
+        ],
+        responses=SerializadorResultadoBusqueda,
+    )
+    def get(self, request):
+        q = (request.query_params.get("q") or "").strip()
+        if rut_de_busqueda(q) is None and len(q) < LARGO_MINIMO_TEXTO:
+            raise ValidationError({"q": f"Debe tener al menos {LARGO_MINIMO_TEXTO} caracteres."})
+
+        resultado = buscar(
+            q,
+            limite_clientes=_limite(request.query_params, "limite_clientes"),
+            limite_facturas=_limite(request.query_params, "limite_facturas"),
+        )
+        return Response(SerializadorResultadoBusqueda({"q": q, **resultado}).data)
@@ -0,0 +1,113 @@
+from django.conf import settings
+from django.contrib.postgres.lookups import TrigramWordSimilar
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import Case, FloatField, IntegerField, Q, Value, When
+from django.db.models.functions import Greatest, Upper
+
+from clientes.modelos import Cliente
+from core.filtros_rut import q_rut
+from core.rut import es_rut_valido, numero_rut, rut_de_busqueda
+from facturas.modelos import Factura
+
+MODO_RUT = "rut"
+MODO_TEXTO = "texto"
+
+# Con menos de 3 caracteres no hay trigramas completos: pg_trgm no puede usar el índice
+LARGO_MINIMO_TEXTO = 3
+
+
+def _coincidencias(campos: tuple[str, ...], q: str) -> Q:
+    """
+    Subcadena (icontains, UPPER(col) LIKE ...) o palabra parecida (word_similarity
+    sobre el umbral pg_trgm.word_similarity_threshold, tolera errores de tipeo).
+    Ambas condiciones usan los índices GIN de trigramas sobre UPPER(col).
+    """
+    condicion = Q()
+    for campo in campos:
+        condicion |= Q(**{f"{campo}__icontains": q}) | Q(TrigramWordSimilar(Upper(campo), q))
+    return condicion
+
+
+def _en_algun_campo(campos: tuple[str, ...], lookup: str, q: str) -> Q:
+    condicion = Q()
+    for campo in campos:
+        condicion |= Q(**{f"{campo}__{lookup}": q})
+    return condicion
+
+
+def _candidatos(modelo, campos: tuple[str, ...], q: str):
+    """
+    Hasta BUSQUEDA_CANDIDATOS ids por nivel: iguales a q, que empiezan por q y
+    el resto de las coincidencias. Cada nivel tiene su propio LIMIT, así que las
+    coincidencias exactas y por prefijo (p.ej. un numero_factura completo) no
+    quedan fuera porque un término común llene el cupo con otras filas.
+    Los tres niveles usan los índices GIN de trigramas (=, LIKE 'Q%', %> / LIKE).
+    """
+    maximo = settings.BUSQUEDA_CANDIDATOS
+    ids = modelo.objects.order_by().values("pk")
+    exactas = ids.filter(_en_algun_campo(campos, "iexact", q))[:maximo]
+    prefijos = ids.filter(_en_algun_campo(campos, "istartswith", q))[:maximo]
+    parecidas = ids.filter(_coincidencias(campos, q))[:maximo]
+    return exactas.union(prefijos, parecidas)
+
+
+def _rankear(modelo, campos: tuple[str, ...], q: str, limite: int):
+    """
+    Los `limite` registros más parecidos a q. Primero por nivel (igual a q, luego
+    empieza por q, luego el resto) y dentro de cada nivel por word_similarity
+    (el máximo entre los campos): una coincidencia exacta empata en 1.0 con
+    cualquier fila que contenga q como palabra, y sin el nivel perdería contra
+    ellas. Se calcula solo sobre los candidatos de _candidatos(): un término muy
+    común (p.ej. el nombre de un deudor con millones de facturas) no obliga a
+    ordenar todo.
+    """
+    nivel = Case(
+        When(_en_algun_campo(campos, "iexact", q), then=Value(0)),
+        When(_en_algun_campo(campos, "istartswith", q), then=Value(1)),
+        default=Value(2),
+        output_field=IntegerField(),
+    )
+    relevancia = [TrigramWordSimilarity(q, Upper(campo)) for campo in campos]
+    return (
+        modelo.objects.filter(pk__in=_candidatos(modelo, campos, q))
+        .annotate(
+            nivel=nivel,
+            relevancia=Greatest(*relevancia) if len(relevancia) > 1 else relevancia[0],
+        )
+        .order_by("nivel", "-relevancia", "-id")[:limite]
+    )
+
+
+def buscar(q: str, *, limite_clientes: int, limite_facturas: int) -> dict:
+    """
+    Búsqueda unificada de clientes y facturas.
+
+    - q con forma de RUT: igualdad sobre el número del RUT (cliente.rut_numero
+      y factura.rut_deudor_numero, con respaldo sobre el texto mientras el
+      número no esté poblado; core.filtros_rut), con relevancia 1. Un RUT con
+      el dígito verificador incorrecto no encuentra nada.
+    - Texto: razón social y RUT del cliente; número de factura y razón social
+      del deudor, ordenados por relevancia (pg_trgm).
+
+    Retorna {"modo", "clientes", "facturas"} con querysets ya limitados.
+    """
+    rut = rut_de_busqueda(q)
+    if rut is not None:
+        exacta = Value(1.0, output_field=FloatField())
+        clientes, facturas = Cliente.objects.none(), Factura.objects.none()
+        if es_rut_valido(rut):
+            numero = numero_rut(rut)
+            clientes = Cliente.objects.filter(q_rut("rut_numero", "rut", numero))
+            facturas = Factura.objects.filter(q_rut("rut_deudor_numero", "rut_deudor", numero))
+        return {
+            "modo": MODO_RUT,
+            "clientes": clientes.annotate(relevancia=exacta)[:limite_clientes],
+            # (rut_deudor_numero, numero_factura) tiene índice: sin ordenar todas las facturas del deudor
+            "facturas": facturas.annotate(relevancia=exacta).order_by("numero_factura", "id")[:limite_facturas],
+        }
+
+    return {
+        "modo": MODO_TEXTO,
+        "clientes": _rankear(Cliente, ("razon_social", "rut"), q, limite_clientes),
+        "facturas": _rankear(Factura, ("numero_factura", "razon_social_deudor"), q, limite_facturas),
+    }
@@ -0,0 +1,126 @@
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from clientes.modelos import Cliente, EstadoCliente
+from facturas.modelos import EstadoFactura, Factura
+
+pytestmark = pytest.mark.django_db
+
+
+def _cliente(rut="12.345.678-5", razon_social="Empresa Demo SpA"):
+    return Cliente.objects.create(
+        rut=rut,
+        razon_social=razon_social,
+        email="demo@empresa.cl",
+        linea_credito="10000000.00",
+        linea_disponible="10000000.00",
+        estado=EstadoCliente.ACTIVO,
+    )
+
+
+def _factura(cliente, numero, rut_deudor="76.543.210-3", razon_social_deudor="Deudor SpA"):
+    hoy = timezone.localdate()
+    return Factura.objects.create(
+        cliente=cliente,
+        numero_factura=numero,
+        rut_deudor=rut_deudor,
+        razon_social_deudor=razon_social_deudor,
+        monto_total="1000.00",
+        fecha_emision=hoy,
+        fecha_vencimiento=hoy + timezone.timedelta(days=30),
+        estado=EstadoFactura.DISPONIBLE,
+    )
+
+
+def test_busqueda_por_texto_rankea_clientes_y_facturas():
+    api = APIClient()
+    constructora = _cliente(razon_social="Constructora Andes SpA")
+    _cliente(rut="11.111.111-1", razon_social="Comercial Pacífico Ltda")
+    _factura(constructora, "F-100", razon_social_deudor="Minera Andes SA")
+    _factura(constructora, "F-200", razon_social_deudor="Retail Sur SpA")
+
+    resp = api.get("/api/buscar", {"q": "andes"})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["q"] == "andes"
+    assert data["modo"] == "texto"
+    assert [c["razon_social"] for c in data["clientes"]] == ["Constructora Andes SpA"]
+    assert 0 < data["clientes"][0]["relevancia"] <= 1
+    assert [f["numero_factura"] for f in data["facturas"]] == ["F-100"]
+
+
+def test_busqueda_por_texto_tolera_errores_de_tipeo():
+    api = APIClient()
+    _cliente(razon_social="Constructora Andes SpA")
+
+    data = api.get("/api/buscar", {"q": "constructra"}).json()
+    assert [c["razon_social"] for c in data["clientes"]] == ["Constructora Andes SpA"]
+
+
+def test_busqueda_por_numero_de_factura_ordena_por_relevancia():
+    api = APIClient()
+    cliente = _cliente()
+    for numero in ("F-12345", "F-123", "OC-99"):
+        _factura(cliente, numero)
+
+    data = api.get("/api/buscar/", {"q": "F-12345"}).json()
+    assert data["facturas"][0]["numero_factura"] == "F-12345"
+    assert "OC-99" not in [f["numero_factura"] for f in data["facturas"]]
+    relevancias = [f["relevancia"] for f in data["facturas"]]
+    assert relevancias == sorted(relevancias, reverse=True)
+
+
+def test_coincidencia_exacta_entra_al_ranking_aunque_sobren_candidatos(settings):
+    settings.BUSQUEDA_CANDIDATOS = 2
+    api = APIClient()
+    cliente = _cliente()
+    _factura(cliente, "F-777")
+    for i in range(5):
+        _factura(cliente, f"OC-F-777-{i}")
+
+    data = api.get("/api/buscar/", {"q": "f-777"}).json()
+    assert data["facturas"][0]["numero_factura"] == "F-777"
+
+
+@pytest.mark.parametrize("q", ["12.345.678-5", "12345678-5", "12.345.678-5 "])
+def test_q_con_forma_de_rut_busca_exacto_por_rut_normalizado(q):
+    api = APIClient()
+    cliente = _cliente()
+    _cliente(rut="11.111.111-1", razon_social="Otra SpA")
+    _factura(cliente, "F-2", rut_deudor="12.345.678-5")
+    _factura(cliente, "F-1", rut_deudor="12.345.678-5")
+    _factura(cliente, "F-3")
+
+    data = api.get("/api/buscar", {"q": q}).json()
+    assert data["modo"] == "rut"
+    assert [c["id"] for c in data["clientes"]] == [cliente.id]
+    assert [f["numero_factura"] for f in data["facturas"]] == ["F-1", "F-2"]
+    assert {f["relevancia"] for f in data["facturas"]} == {1.0}
+
+
+def test_limites_por_tipo():
+    api = APIClient()
+    cliente = _cliente(razon_social="Factoring Norte SpA")
+    for i in range(5):
+        _factura(cliente, f"NORTE-{i}")
+
+    data = api.get("/api/buscar", {"q": "norte", "limite_facturas": 2, "limite_clientes": 0}).json()
+    assert data["clientes"] == []
+    assert len(data["facturas"]) == 2
+
+
+@pytest.mark.parametrize(
+    "params, campo",
+    [
+        ({}, "q"),
+        ({"q": "ab"}, "q"),
+        ({"q": "norte", "limite_facturas": "51"}, "limite_facturas"),
+        ({"q": "norte", "limite_clientes": "x"}, "limite_clientes"),
+    ],
+)
+def test_parametros_invalidos_responden_400(params, campo):
+    resp = APIClient().get("/api/buscar", params)
+    assert resp.status_code == 400
+    assert resp.json()["code"] == "VALIDATION_ERROR"
+    assert campo in resp.json()["errors"]
@@ -33,4 +33,12 @@ class SerializadorCliente(serializers.ModelSerializer):
         if self.instance is None:
             if attrs.get("linea_credito") is not None and attrs.get("linea_disponible") is None:
                 attrs["linea_disponible"] = attrs["linea_credito"]
+
+        # Mismas reglas que los CHECK de la tabla, para responder 400 y no 500
+        credito = attrs.get("linea_credito", self.instance.linea_credito if self.instance else None)
+        disponible = attrs.get("linea_disponible", self.instance.linea_disponible if self.instance else None)
+        if disponible is not None and disponible < 0:
+            raise serializers.ValidationError({"linea_disponible": "No puede ser negativa."})
+        if credito is not None and disponible is not None and disponible > credito:
+            raise serializers.ValidationError({"linea_disponible": "No puede superar la línea de crédito."})
         return attrs
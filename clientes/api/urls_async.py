@@ -0,0 +1,9 @@
+from django.urls import path
+
+from clientes.api import vistas_async
+
+urlpatterns = [
+    path("clientes/", vistas_async.listar_clientes),
+    path("clientes/<str:pk>/", vistas_async.detalle_cliente),
+    path("clientes/<str:pk>/linea-disponible/", vistas_async.linea_disponible),
+]
@@ -5,9 +5,30 @@ from rest_framework.response import Response
 from clientes.api.serializadores import SerializadorCliente
 from clientes.selectores import obtener_clientes_filtrados
 from clientes.servicios import activar_cliente, suspender_cliente
+from core import cache_lecturas
+from core.condicional import GetCondicional
+from core.exportacion import respuesta_exportacion
+from core.idempotencia import idempotente
 from drf_spectacular.utils import extend_schema, extend_schema_view
 
 
+CAMPOS_EXPORT = (
+    "id",
+    "rut",
+    "razon_social",
+    "giro",
+    "direccion",
+    "telefono",
+    "email",
+    "fecha_registro",
+    "linea_credito",
+    "linea_disponible",
+    "estado",
+    "creado_en",
+    "actualizado_en",
+)
+
+
 @extend_schema_view(
     list=extend_schema(tags=["Clientes"]),
     retrieve=extend_schema(tags=["Clientes"]),
@@ -15,23 +36,35 @@ from drf_spectacular.utils import extend_schema, extend_schema_view
     update=extend_schema(tags=["Clientes"]),
     partial_update=extend_schema(tags=["Clientes"]),
     destroy=extend_schema(tags=["Clientes"]),
+    export=extend_schema(tags=["Clientes"]),
     activar=extend_schema(tags=["Clientes"]),
     suspender=extend_schema(tags=["Clientes"]),
     linea_disponible=extend_schema(tags=["Clientes"]),
 )
-class VistaCliente(viewsets.ModelViewSet):
+class VistaCliente(GetCondicional, cache_lecturas.DetalleCacheado, viewsets.ModelViewSet):
     serializer_class = SerializadorCliente
+    recurso_cache = cache_lecturas.CLIENTE
 
     def get_queryset(self):
         return obtener_clientes_filtrados(self.request.query_params)
 
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request):
+        return respuesta_exportacion(self.get_queryset(), CAMPOS_EXPORT, "clientes", request.query_params)
+
+    @idempotente
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
     @action(detail=True, methods=["post"])
+    @idempotente
     def activar(self, request, pk=None):
         cliente = self.get_object()
         activar_cliente(cliente)
         return Response(self.get_serializer(cliente).data)
 
     @action(detail=True, methods=["post"])
+    @idempotente
     def suspender(self, request, pk=None):
         cliente = self.get_object()
         suspender_cliente(cliente)
@@ -39,11 +72,12 @@ class VistaCliente(viewsets.ModelViewSet):
 
     @action(detail=True, methods=["get"], url_path="linea-disponible")
     def linea_disponible(self, request, pk=None):
-        cliente = self.get_object()
+        # Sale del mismo detalle cacheado del cliente (el endpoint más consultado)
+        cliente = self.datos_detalle()
         return Response(
             {
-                "cliente_id": cliente.id,
-                "linea_credito": str(cliente.linea_credito),
-                "linea_disponible": str(cliente.linea_disponible),
+                "cliente_id": cliente["id"],
+                "linea_credito": cliente["linea_credito"],
+                "linea_disponible": cliente["linea_disponible"],
             }
         )
@@ -0,0 +1,26 @@
+from clientes.api.vistas import VistaCliente
+from clientes.selectores import obtener_clientes_filtrados
+from core.asincrono import datos_detalle, respuesta_detalle, respuesta_json, respuesta_listado, vista_lectura_async
+
+
+@vista_lectura_async
+async def listar_clientes(request):
+    return await respuesta_listado(request, VistaCliente, obtener_clientes_filtrados(request.query_params))
+
+
+@vista_lectura_async
+async def detalle_cliente(request, pk):
+    return await respuesta_detalle(request, VistaCliente, obtener_clientes_filtrados(request.query_params), pk)
+
+
+@vista_lectura_async
+async def linea_disponible(request, pk):
+    # Sale del mismo detalle cacheado del cliente, como en la API síncrona
+    cliente = await datos_detalle(request, VistaCliente, obtener_clientes_filtrados(request.query_params), pk)
+    return respuesta_json(
+        {
+            "cliente_id": cliente["id"],
+            "linea_credito": cliente["linea_credito"],
+            "linea_disponible": cliente["linea_disponible"],
+        }
+    )
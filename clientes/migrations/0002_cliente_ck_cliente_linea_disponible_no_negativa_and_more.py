@@ -0,0 +1,64 @@
+# Generated by Django 4.2.28 on 2026-10-17 10:38
+
+import logging
+
+from django.db import migrations, models
+
+logger = logging.getLogger(__name__)
+
+# Las CHECK se agregan NOT VALID (lock breve, sin recorrer la tabla) y se
+# validan en 0006_validar_ck_linea_disponible. Antes se acotan las filas que
+# ya las violarían, para que esa validación no falle.
+ACOTAR_LINEAS = """
+UPDATE clientes_cliente
+   SET linea_disponible = GREATEST(0, LEAST(linea_disponible, linea_credito))
+ WHERE linea_disponible < 0 OR linea_disponible > linea_credito
+RETURNING id, linea_disponible
+"""
+
+CHECKS = {
+    'ck_cliente_linea_disponible_no_negativa': 'linea_disponible >= 0',
+    'ck_cliente_linea_disponible_max_credito': 'linea_disponible <= linea_credito',
+}
+
+
+def acotar_lineas(apps, schema_editor):
+    with schema_editor.connection.cursor() as cur:
+        cur.execute(ACOTAR_LINEAS)
+        acotados = cur.fetchall()
+    if acotados:
+        logger.warning(
+            "Línea disponible acotada antes de agregar las CHECK",
+            extra={"clientes_ids": sorted(cid for cid, _ in acotados)},
+        )
+
+
+def _agregar_check(nombre, condicion):
+    return migrations.RunSQL(
+        f"ALTER TABLE clientes_cliente ADD CONSTRAINT {nombre} CHECK ({condicion}) NOT VALID",
+        f"ALTER TABLE clientes_cliente DROP CONSTRAINT {nombre}",
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clientes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(acotar_lineas, migrations.RunPython.noop),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[_agregar_check(nombre, condicion) for nombre, condicion in CHECKS.items()],
+            state_operations=[
+                migrations.AddConstraint(
+                    model_name='cliente',
+                    constraint=models.CheckConstraint(check=models.Q(('linea_disponible__gte', 0)), name='ck_cliente_linea_disponible_no_negativa'),
+                ),
+                migrations.AddConstraint(
+                    model_name='cliente',
+                    constraint=models.CheckConstraint(check=models.Q(('linea_disponible__lte', models.F('linea_credito'))), name='ck_cliente_linea_disponible_max_credito'),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.28 on 2026-10-17 10:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clientes', '0002_cliente_ck_cliente_linea_disponible_no_negativa_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(fields=['creado_en', 'id'], name='clientes_cl_creado__a7058b_idx'),
+        ),
+    ]
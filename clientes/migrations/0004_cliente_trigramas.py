@@ -0,0 +1,33 @@
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ('clientes', '0003_cliente_clientes_cl_creado__a7058b_idx'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name='cliente',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper('razon_social'), name='gin_trgm_ops'
+                ),
+                name='clientes_razon_social_trgm',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='cliente',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('rut'), name='gin_trgm_ops'),
+                name='clientes_rut_trgm',
+            ),
+        ),
+    ]
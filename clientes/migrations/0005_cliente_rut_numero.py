@@ -0,0 +1,53 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+# rut_numero(text): número del RUT sin DV ("12.345.678-5" -> 12345678). La usan
+# los triggers de clientes y facturas y el comando poblar_rut_numero; da lo
+# mismo que core.rut.numero_rut para cualquier RUT ya normalizado.
+CREAR_TRIGGER = """
+CREATE FUNCTION rut_numero(rut text) RETURNS integer
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE
+    AS $$ SELECT NULLIF(regexp_replace(split_part(rut, '-', 1), '[^0-9]', '', 'g'), '')::integer $$;
+
+CREATE FUNCTION clientes_cliente_rut_numero() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    NEW.rut_numero := rut_numero(NEW.rut);
+    RETURN NEW;
+END $$;
+
+CREATE TRIGGER clientes_cliente_rut_numero
+    BEFORE INSERT OR UPDATE OF rut, rut_numero ON clientes_cliente
+    FOR EACH ROW EXECUTE FUNCTION clientes_cliente_rut_numero();
+"""
+
+BORRAR_TRIGGER = """
+DROP TRIGGER clientes_cliente_rut_numero ON clientes_cliente;
+DROP FUNCTION clientes_cliente_rut_numero();
+DROP FUNCTION rut_numero(text);
+"""
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción. La
+    # columna nace NULL (sin reescribir la tabla); las filas existentes se
+    # completan con `manage.py poblar_rut_numero`, por lotes
+    atomic = False
+
+    dependencies = [
+        ('clientes', '0004_cliente_trigramas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cliente',
+            name='rut_numero',
+            field=models.IntegerField(editable=False, null=True),
+        ),
+        migrations.RunSQL(CREAR_TRIGGER, BORRAR_TRIGGER),
+        AddIndexConcurrently(
+            model_name='cliente',
+            index=models.Index(fields=['rut_numero'], name='clientes_rut_numero_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+from django.db import migrations
+
+# VALIDATE CONSTRAINT recorre la tabla con SHARE UPDATE EXCLUSIVE: no bloquea
+# lecturas ni escrituras. Va en su propia migración para no compartir
+# transacción (ni el ACCESS EXCLUSIVE) con el ADD CONSTRAINT de 0002.
+VALIDAR = """
+ALTER TABLE clientes_cliente VALIDATE CONSTRAINT ck_cliente_linea_disponible_no_negativa;
+ALTER TABLE clientes_cliente VALIDATE CONSTRAINT ck_cliente_linea_disponible_max_credito;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clientes', '0005_cliente_rut_numero'),
+    ]
+
+    operations = [
+        migrations.RunSQL(VALIDAR, migrations.RunSQL.noop),
+    ]
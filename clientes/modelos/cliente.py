@@ -1,4 +1,7 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models import F, Q
+from django.db.models.functions import Upper
 from django.utils import timezone
 
 
@@ -11,6 +14,9 @@ class EstadoCliente(models.TextChoices):
 
 class Cliente(models.Model):
     rut = models.CharField(max_length=12, unique=True)
+    # Número del RUT sin DV: lo mantiene un trigger de la BD al escribir `rut`
+    # (migración 0005); las búsquedas por RUT usan esta columna
+    rut_numero = models.IntegerField(null=True, editable=False)
     razon_social = models.CharField(max_length=255)
     giro = models.CharField(max_length=255, blank=True, default="")
     direccion = models.CharField(max_length=255, blank=True, default="")
@@ -32,9 +38,25 @@ class Cliente(models.Model):
     actualizado_en = models.DateTimeField(auto_now=True)
 
     class Meta:
+        constraints = [
+            models.CheckConstraint(
+                check=Q(linea_disponible__gte=0),
+                name="ck_cliente_linea_disponible_no_negativa",
+            ),
+            models.CheckConstraint(
+                check=Q(linea_disponible__lte=F("linea_credito")),
+                name="ck_cliente_linea_disponible_max_credito",
+            ),
+        ]
         indexes = [
             models.Index(fields=["estado"]),
             models.Index(fields=["linea_credito"]),
+            models.Index(fields=["creado_en", "id"]),
+            models.Index(fields=["rut_numero"], name="clientes_rut_numero_idx"),
+            # Trigramas sobre UPPER(col): la misma expresión que genera icontains,
+            # así q= del listado y /api/buscar usan el índice (pg_trgm)
+            GinIndex(OpClass(Upper("razon_social"), name="gin_trgm_ops"), name="clientes_razon_social_trgm"),
+            GinIndex(OpClass(Upper("rut"), name="gin_trgm_ops"), name="clientes_rut_trgm"),
         ]
 
     def __str__(self) -> str:
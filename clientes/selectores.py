@@ -3,6 +3,7 @@ from decimal import Decimal, InvalidOperation
 from rest_framework.exceptions import ValidationError
 
 from clientes.modelos import Cliente
+from core.filtros_rut import filtro_prefijo_rut, filtro_rut
 
 
 def _parse_decimal_param(name: str, value: str) -> Decimal:
@@ -19,7 +20,7 @@ def obtener_clientes_filtrados(params):
     """
     params: request.query_params (QueryDict)
     """
-    qs = Cliente.objects.all().order_by("-creado_en")
+    qs = Cliente.objects.all().order_by("-creado_en", "-id")
 
     # 1) estado
     estado = params.get("estado")
@@ -44,7 +45,16 @@ def obtener_clientes_filtrados(params):
     if dec_min is not None and dec_max is not None and dec_min > dec_max:
         raise ValidationError({"linea_credito": "linea_credito_min no puede ser mayor que linea_credito_max."})
 
-    # 3) búsqueda opcional
+    # 3) RUT exacto o por prefijo, en cualquier escritura (columna entera rut_numero)
+    rut = params.get("rut")
+    if rut:
+        qs = qs.filter(filtro_rut("rut_numero", "rut", "rut", rut))
+
+    rut_prefijo = params.get("rut_prefijo")
+    if rut_prefijo:
+        qs = qs.filter(filtro_prefijo_rut("rut_numero", "rut", "rut_prefijo", rut_prefijo))
+
+    # 4) búsqueda opcional
     q = params.get("q")
     if q:
         qs = qs.filter(razon_social__icontains=q) | qs.filter(rut__icontains=q)
@@ -1,13 +1,103 @@
+import logging
+from decimal import Decimal
+
+from django.db import connection
+from django.utils import timezone
+
 from clientes.modelos.cliente import Cliente, EstadoCliente
+from core import cache_lecturas
+
+logger = logging.getLogger(__name__)
 
 
 def activar_cliente(cliente: Cliente) -> Cliente:
     cliente.estado = EstadoCliente.ACTIVO
     cliente.save(update_fields=["estado", "actualizado_en"])
+    cache_lecturas.invalidar(cache_lecturas.CLIENTE, [cliente.id])
     return cliente
 
 
 def suspender_cliente(cliente: Cliente) -> Cliente:
     cliente.estado = EstadoCliente.SUSPENDIDO
     cliente.save(update_fields=["estado", "actualizado_en"])
+    cache_lecturas.invalidar(cache_lecturas.CLIENTE, [cliente.id])
     return cliente
+
+
+def consumir_linea(cliente_id: int, monto: Decimal) -> tuple[Decimal, Decimal] | None:
+    """
+    Descuenta `monto` de la línea disponible con un único UPDATE condicional,
+    sin lock previo sobre el cliente.
+
+    Retorna (linea_anterior, linea_nueva), o None si la línea no alcanza.
+    """
+    with connection.cursor() as cur:
+        cur.execute(
+            f"""
+            UPDATE {Cliente._meta.db_table}
+               SET linea_disponible = linea_disponible - %s, actualizado_en = %s
+             WHERE id = %s AND linea_disponible >= %s
+         RETURNING linea_disponible
+            """,
+            [monto, timezone.now(), cliente_id, monto],
+        )
+        fila = cur.fetchone()
+
+    if fila is None:
+        return None
+    cache_lecturas.invalidar(cache_lecturas.CLIENTE, [cliente_id])
+    nueva = fila[0]
+    return nueva + monto, nueva
+
+
+def liberar_linea(cliente_id: int, monto: Decimal) -> tuple[Decimal, Decimal]:
+    """
+    Restituye `monto` a la línea disponible en una sola sentencia, sin superar
+    la línea de crédito (por si ésta se redujo mientras la operación estaba vigente).
+    El monto que no cabe bajo el tope se descarta y queda registrado en un warning.
+
+    Retorna (linea_anterior, linea_nueva).
+    """
+    return liberar_lineas({cliente_id: monto})[cliente_id]
+
+
+def liberar_lineas(montos: dict[int, Decimal]) -> dict[int, tuple[Decimal, Decimal]]:
+    """
+    Variante por conjunto de liberar_linea: un único UPDATE para todos los
+    clientes (bloqueados en orden de id). Retorna {cliente_id: (anterior, nueva)}.
+    """
+    if not montos:
+        return {}
+
+    ids = sorted(montos)
+    tabla = Cliente._meta.db_table
+    with connection.cursor() as cur:
+        cur.execute(
+            f"""
+            WITH anterior AS (
+                SELECT id, linea_disponible FROM {tabla}
+                 WHERE id = ANY(%s) ORDER BY id FOR NO KEY UPDATE
+            ), montos AS (
+                SELECT * FROM unnest(%s::bigint[], %s::numeric[]) AS m(id, monto)
+            )
+            UPDATE {tabla} AS c
+               SET linea_disponible = LEAST(c.linea_disponible + montos.monto, c.linea_credito),
+                   actualizado_en = %s
+              FROM anterior JOIN montos ON montos.id = anterior.id
+             WHERE c.id = anterior.id
+         RETURNING c.id, anterior.linea_disponible, c.linea_disponible
+            """,
+            [ids, ids, [montos[i] for i in ids], timezone.now()],
+        )
+        lineas = {cid: (anterior, nueva) for cid, anterior, nueva in cur.fetchall()}
+
+    for cid, (anterior, nueva) in lineas.items():
+        excedente = anterior + montos[cid] - nueva
+        if excedente > 0:
+            logger.warning(
+                "Restitución de línea topada en la línea de crédito",
+                extra={"cliente_id": cid, "excedente": str(excedente)},
+            )
+
+    cache_lecturas.invalidar(cache_lecturas.CLIENTE, lineas)
+    return lineas
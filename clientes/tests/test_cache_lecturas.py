@@ -0,0 +1,174 @@
+import json
+import time
+
+import pytest
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from clientes.modelos import Cliente, EstadoCliente
+from core import cache_lecturas, metricas
+from facturas.modelos import EstadoFactura, Factura
+from operaciones.modelos import EstadoOperacion
+
+
+@pytest.fixture(autouse=True)
+def _cache_limpia():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _cliente():
+    return Cliente.objects.create(
+        rut="12.345.678-5",
+        razon_social="Empresa",
+        email="a@a.cl",
+        linea_credito="100000.00",
+        linea_disponible="100000.00",
+        estado=EstadoCliente.ACTIVO,
+    )
+
+
+def _factura(cliente, monto="1000.00"):
+    hoy = timezone.localdate()
+    return Factura.objects.create(
+        cliente=cliente,
+        numero_factura="F-1",
+        rut_deudor="76.543.210-3",
+        razon_social_deudor="Deudor",
+        monto_total=monto,
+        fecha_emision=hoy,
+        fecha_vencimiento=hoy + timezone.timedelta(days=30),
+        estado=EstadoFactura.DISPONIBLE,
+    )
+
+
+def _get_sin_consultas(api, url):
+    with CaptureQueriesContext(connection) as ctx:
+        resp = api.get(url)
+    assert resp.status_code == 200
+    return resp, len(ctx.captured_queries)
+
+
+@pytest.mark.django_db
+def test_detalle_se_cachea_y_se_invalida_al_suspender(django_capture_on_commit_callbacks):
+    api = APIClient()
+    c = _cliente()
+    hits = metricas.obtener("cache.cliente.hit")
+
+    assert api.get(f"/api/clientes/{c.id}/").json()["estado"] == EstadoCliente.ACTIVO
+    resp, consultas = _get_sin_consultas(api, f"/api/clientes/{c.id}/")
+    assert consultas == 0
+    assert resp.json()["estado"] == EstadoCliente.ACTIVO
+    assert metricas.obtener("cache.cliente.hit") == hits + 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        api.post(f"/api/clientes/{c.id}/suspender/", {}, format="json")
+
+    assert api.get(f"/api/clientes/{c.id}/").json()["estado"] == EstadoCliente.SUSPENDIDO
+
+
+@pytest.mark.django_db
+def test_linea_disponible_refleja_la_aprobacion(django_capture_on_commit_callbacks):
+    api = APIClient()
+    c = _cliente()
+    f = _factura(c, "30000.00")
+    url = f"/api/clientes/{c.id}/linea-disponible/"
+
+    assert api.get(url).json() == {"cliente_id": c.id, "linea_credito": "100000.00", "linea_disponible": "100000.00"}
+    assert _get_sin_consultas(api, url)[1] == 0
+
+    op = api.post("/api/operaciones/", {"cliente": c.id, "facturas_ids": [f.id]}, format="json").json()
+    assert api.get(f"/api/facturas/{f.id}/").json()["estado"] == EstadoFactura.DISPONIBLE
+    with django_capture_on_commit_callbacks(execute=True):
+        assert api.post(f"/api/operaciones/{op['id']}/aprobar/").status_code == 200
+
+    assert api.get(url).json()["linea_disponible"] == "70000.00"
+    assert api.get(f"/api/facturas/{f.id}/").json()["estado"] == EstadoFactura.CEDIDA
+    assert api.get(f"/api/operaciones/{op['id']}/").json()["estado"] == EstadoOperacion.APROBADA
+
+
+@pytest.mark.django_db
+def test_detalle_con_filtros_no_usa_el_cache():
+    api = APIClient()
+    c = _cliente()
+
+    api.get(f"/api/clientes/{c.id}/")
+    _, consultas = _get_sin_consultas(api, f"/api/clientes/{c.id}/?estado={EstadoCliente.ACTIVO}")
+    assert consultas > 0
+    assert api.get(f"/api/clientes/{c.id}/?estado={EstadoCliente.SUSPENDIDO}").status_code == 404
+
+
+@pytest.mark.django_db
+def test_invalidacion_se_descarta_si_la_transaccion_se_revierte(django_capture_on_commit_callbacks):
+    version = cache_lecturas._version(cache_lecturas.CLIENTE, 1)
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        try:
+            with transaction.atomic():
+                cache_lecturas.invalidar(cache_lecturas.CLIENTE, [1])
+                raise RuntimeError
+        except RuntimeError:
+            pass
+    assert callbacks == []
+    assert cache_lecturas._version(cache_lecturas.CLIENTE, 1) == version
+
+    with django_capture_on_commit_callbacks(execute=True):
+        cache_lecturas.invalidar(cache_lecturas.CLIENTE, [1])
+    assert cache_lecturas._version(cache_lecturas.CLIENTE, 1) == version + 1
+
+
+@pytest.mark.django_db
+def test_un_solo_notify_por_transaccion_y_despues_del_commit(settings, django_capture_on_commit_callbacks):
+    settings.CACHE_LECTURAS_NOTIFY = True
+    versiones = {
+        (recurso, pk): cache_lecturas._version(recurso, pk)
+        for recurso, pk in [(cache_lecturas.CLIENTE, 1), (cache_lecturas.CLIENTE, 4), (cache_lecturas.FACTURA, 2)]
+    }
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        with CaptureQueriesContext(connection) as ctx:
+            cache_lecturas.invalidar(cache_lecturas.CLIENTE, [1])
+            cache_lecturas.invalidar(cache_lecturas.FACTURA, [2])
+            cache_lecturas.invalidar(cache_lecturas.CLIENTE, [4])
+    # Nada se emite dentro de la transacción que escribe
+    assert not ctx.captured_queries
+    assert len(callbacks) == 1
+
+    with CaptureQueriesContext(connection) as ctx:
+        callbacks[0]()
+    assert len([q for q in ctx.captured_queries if "pg_notify" in q["sql"]]) == 1
+    for (recurso, pk), version in versiones.items():
+        assert cache_lecturas._version(recurso, pk) == version + 1
+
+
+def test_notificaciones_de_otros_procesos_avanzan_la_version():
+    version = cache_lecturas._version(cache_lecturas.FACTURA, 7)
+
+    cache_lecturas.aplicar_notificacion(json.dumps({"r": "factura", "ids": [7], "o": cache_lecturas._origen()}))
+    assert cache_lecturas._version(cache_lecturas.FACTURA, 7) == version
+
+    cache_lecturas.aplicar_notificacion(json.dumps({"r": "factura", "ids": [7], "o": "otro-host:1"}))
+    assert cache_lecturas._version(cache_lecturas.FACTURA, 7) == version + 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_escucha_recibe_el_notify_confirmado():
+    version = cache_lecturas._version(cache_lecturas.OPERACION, 9)
+    detener = cache_lecturas.iniciar_escucha()
+    try:
+        time.sleep(0.5)  # LISTEN activo antes del NOTIFY
+        with connection.cursor() as cur:
+            payload = json.dumps({"r": "operacion", "ids": [9], "o": "otro-host:1"})
+            cur.execute("SELECT pg_notify(%s, %s)", [cache_lecturas.CANAL, payload])
+
+        limite = time.monotonic() + 5
+        while cache_lecturas._version(cache_lecturas.OPERACION, 9) == version and time.monotonic() < limite:
+            time.sleep(0.05)
+        assert cache_lecturas._version(cache_lecturas.OPERACION, 9) == version + 1
+    finally:
+        detener.set()
+        cache_lecturas._escucha.join(timeout=5)
@@ -0,0 +1,23 @@
+import pytest
+from django.db import connection
+
+from core.calentamiento import calentar
+
+
+@pytest.mark.django_db
+def test_calentar_importa_modulos_resuelve_urls_y_conecta():
+    resumen = calentar()
+
+    assert resumen["modulos"] >= 12  # selectores, servicios, serializadores y vistas de cada app
+    assert resumen["vistas"] > 0
+    assert resumen["serializadores"] == 3
+    assert resumen["conexiones"] == ["default"]
+
+
+def test_calentar_sin_bd_no_abre_conexiones():
+    connection.close()
+
+    resumen = calentar(conectar_bd=False)
+
+    assert "conexiones" not in resumen
+    assert connection.connection is None
@@ -36,3 +36,19 @@ def test_filtro_linea_credito_invalido_devuelve_400():
     # Si tienes el handler estándar, esto también se puede afirmar:
     body = resp.json()
     assert body.get("code") in (None, "VALIDATION_ERROR")  # tolerante si aún no activas el handler
+
+
+def test_filtro_por_rut_exacto_y_prefijo():
+    Cliente.objects.create(rut="9.876.543-3", razon_social="A", email="a@a.cl", linea_credito="10", linea_disponible="10", estado=EstadoCliente.ACTIVO)
+    Cliente.objects.create(rut="12.345.678-5", razon_social="B", email="b@b.cl", linea_credito="10", linea_disponible="10", estado=EstadoCliente.ACTIVO)
+
+    client = APIClient()
+    for rut in ("9.876.543-3", "09876543-3", "9876543-3"):
+        data = client.get("/api/clientes/", {"rut": rut}).json()
+        assert [c["razon_social"] for c in data["results"]] == ["A"]
+
+    data = client.get("/api/clientes/", {"rut_prefijo": "12.3"}).json()
+    assert [c["razon_social"] for c in data["results"]] == ["B"]
+
+    resp = client.get("/api/clientes/?rut=12.345.678-0")
+    assert resp.status_code == 400
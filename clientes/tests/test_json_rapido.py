@@ -0,0 +1,111 @@
+import datetime
+import io
+import uuid
+from decimal import Decimal
+from zoneinfo import ZoneInfo
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from core.json_rapido import ParserJSON, RenderizadorJSON
+
+DATOS = {
+    "montos": [Decimal("1000.50"), Decimal("0.10"), Decimal("1E-7"), Decimal("123456789012345678.99"), Decimal("-0")],
+    "fechas": [
+        datetime.datetime(2026, 2, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+        datetime.datetime(2026, 2, 1, 9, 0, tzinfo=ZoneInfo("America/Santiago")),
+        datetime.datetime(2026, 2, 1, 9, 0),
+        datetime.date(2026, 3, 1),
+        datetime.time(10, 5, 1, 500),
+        datetime.timedelta(days=1, seconds=3),
+    ],
+    "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "textos": ["Ñandú «ok»", "a\x00\x1f\x7f\"\\\n\t", "línea párrafo ", gettext_lazy("Not found.")],
+    "error": {"rut": [ErrorDetail("RUT inválido.", code="invalid")]},
+    "numeros": [0, -1, 2**63 - 1, 1.5, 0.1, True, None],
+    "tupla": (1, "dos"),
+    "vacios": [{}, [], ""],
+}
+
+
+def _ambos(data, **kwargs):
+    return RenderizadorJSON().render(data, **kwargs), JSONRenderer().render(data, **kwargs)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        DATOS,
+        None,
+        [],
+        {"results": [{"monto_total": "1000.50", "estado": "disponible"}] * 3},
+        {1: "clave int", None: "clave None"},  # orjson no acepta claves no str: delega en DRF
+        {"grande": 2**80},
+    ],
+)
+def test_render_identico_a_drf(data):
+    rapido, drf = _ambos(data)
+    assert rapido == drf
+
+
+def test_render_con_indent_delega_en_drf():
+    rapido, drf = _ambos(DATOS, accepted_media_type="application/json; indent=4")
+    assert rapido == drf
+    assert b"\n    " in rapido
+
+
+def test_render_falla_igual_que_drf():
+    for data in ({"t": datetime.time(1, tzinfo=datetime.timezone.utc)}, {"x": Decimal("NaN")}):
+        with pytest.raises(ValueError):
+            JSONRenderer().render(data)
+        with pytest.raises(ValueError):
+            RenderizadorJSON().render(data)
+
+
+def _parsear(parser, contenido: bytes):
+    return parser.parse(io.BytesIO(contenido), "application/json", {"encoding": "utf-8"})
+
+
+@pytest.mark.parametrize(
+    "contenido",
+    [
+        b'{"cliente": 1, "facturas_ids": [1, 2], "tasa": 2.5, "texto": "\\u00d1and\\u00fa", "nada": null}',
+        b'{"grande": 123456789012345678901234567890}',
+        b'"\\ud800"',
+        "[\"é\"]".encode(),
+    ],
+)
+def test_parse_identico_a_drf(contenido):
+    assert _parsear(ParserJSON(), contenido) == _parsear(JSONParser(), contenido)
+
+
+@pytest.mark.parametrize("contenido", [b"", b"{", b'{"a": NaN}', b"[1,]"])
+def test_parse_error_identico_a_drf(contenido):
+    with pytest.raises(ParseError) as drf:
+        _parsear(JSONParser(), contenido)
+    with pytest.raises(ParseError) as rapido:
+        _parsear(ParserJSON(), contenido)
+    assert str(rapido.value.detail) == str(drf.value.detail)
+
+
+@pytest.mark.django_db
+def test_api_usa_orjson_incluidos_los_errores():
+    api = APIClient()
+
+    resp = api.get("/api/clientes/999999/")
+    assert isinstance(resp.accepted_renderer, RenderizadorJSON)
+    assert resp.content == JSONRenderer().render(resp.data)
+    assert resp.json()["code"] == "NOT_FOUND"
+
+    resp = api.post("/api/clientes/", b'{"rut": "1-1"', content_type="application/json")
+    assert resp.status_code == 400
+    assert resp.json()["code"] == "VALIDATION_ERROR"
+    assert resp.content == JSONRenderer().render(resp.data)
+
+    resp = api.post("/api/clientes/", {"rut": "no-es-rut", "razon_social": "Ñandú"}, format="json")
+    assert resp.status_code == 400
+    assert "rut" in resp.json()["errors"]
@@ -0,0 +1,70 @@
+import pytest
+from decimal import Decimal
+from django.db import IntegrityError, connection, transaction
+
+from clientes.modelos import Cliente, EstadoCliente
+from clientes.servicios import consumir_linea, liberar_linea
+
+pytestmark = pytest.mark.django_db
+
+
+def _cliente(credito="1000.00", disponible="1000.00"):
+    return Cliente.objects.create(
+        rut="12.345.678-5",
+        razon_social="Empresa",
+        email="a@a.cl",
+        linea_credito=credito,
+        linea_disponible=disponible,
+        estado=EstadoCliente.ACTIVO,
+    )
+
+
+def test_consumir_linea_descuenta_y_retorna_antes_y_despues():
+    c = _cliente()
+    assert consumir_linea(c.id, Decimal("400.00")) == (Decimal("1000.00"), Decimal("600.00"))
+    c.refresh_from_db()
+    assert c.linea_disponible == Decimal("600.00")
+
+
+def test_consumir_linea_insuficiente_no_modifica():
+    c = _cliente(disponible="300.00")
+    assert consumir_linea(c.id, Decimal("300.01")) is None
+    c.refresh_from_db()
+    assert c.linea_disponible == Decimal("300.00")
+
+
+def test_liberar_linea_no_supera_linea_credito(caplog):
+    c = _cliente(credito="1000.00", disponible="900.00")
+    with caplog.at_level("WARNING", logger="clientes.servicios"):
+        assert liberar_linea(c.id, Decimal("500.00")) == (Decimal("900.00"), Decimal("1000.00"))
+    registro = next(r for r in caplog.records if r.name == "clientes.servicios")
+    assert registro.cliente_id == c.id
+    assert Decimal(registro.excedente) == Decimal("400.00")
+
+
+def test_check_constraints_de_linea():
+    with pytest.raises(IntegrityError), transaction.atomic():
+        _cliente(credito="100.00", disponible="-1.00")
+    with pytest.raises(IntegrityError), transaction.atomic():
+        _cliente(credito="100.00", disponible="100.01")
+
+
+def test_check_constraints_quedan_validadas():
+    # 0002 las agrega NOT VALID y 0006 las valida
+    with connection.cursor() as cur:
+        cur.execute(
+            "SELECT conname, convalidated FROM pg_constraint WHERE conname LIKE 'ck_cliente_linea_disponible_%'"
+        )
+        assert dict(cur.fetchall()) == {
+            "ck_cliente_linea_disponible_no_negativa": True,
+            "ck_cliente_linea_disponible_max_credito": True,
+        }
+
+
+def test_api_no_permite_linea_disponible_mayor_a_credito():
+    from rest_framework.test import APIClient
+
+    c = _cliente()
+    resp = APIClient().patch(f"/api/clientes/{c.id}/", {"linea_disponible": "1000.01"}, format="json")
+    assert resp.status_code == 400
+    assert "linea_disponible" in resp.json()["errors"]
@@ -0,0 +1,97 @@
+import io
+
+import pytest
+from rest_framework.test import APIClient
+from django.core.management import call_command
+from django.db import connection
+
+from clientes.modelos import Cliente, EstadoCliente
+from facturas.conciliacion import conciliar_pagos
+from facturas.modelos import EstadoFactura, Factura
+
+pytestmark = pytest.mark.django_db
+
+
+def _sin_numero(tabla: str, columna: str):
+    # Simula filas anteriores a la migración: con el trigger activo la columna no queda en NULL
+    with connection.cursor() as cur:
+        cur.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        cur.execute(f"ALTER TABLE {tabla} DISABLE TRIGGER USER")
+        cur.execute(f"UPDATE {tabla} SET {columna} = NULL")
+        cur.execute(f"ALTER TABLE {tabla} ENABLE TRIGGER USER")
+
+
+def _clientes_con_facturas():
+    clientes = [
+        Cliente.objects.create(
+            rut=rut,
+            razon_social=f"Empresa {rut}",
+            email="demo@empresa.cl",
+            linea_credito="1000.00",
+            linea_disponible="1000.00",
+            estado=EstadoCliente.ACTIVO,
+        )
+        for rut in ("12.345.678-5", "11.111.111-1", "9.876.543-3")
+    ]
+    for i, cliente in enumerate(clientes):
+        Factura.objects.create(
+            cliente=cliente,
+            numero_factura=f"F-{i}",
+            rut_deudor="76.543.210-3",
+            razon_social_deudor="Deudor SpA",
+            monto_total="100.00",
+            fecha_emision="2026-02-01",
+            fecha_vencimiento="2026-03-01",
+            estado=EstadoFactura.DISPONIBLE,
+        )
+    return clientes
+
+
+def test_poblar_rut_numero_completa_por_lotes_las_filas_sin_numero():
+    _clientes_con_facturas()
+    _sin_numero("clientes_cliente", "rut_numero")
+    _sin_numero("facturas_factura", "rut_deudor_numero")
+    assert not Cliente.objects.filter(rut_numero__isnull=False).exists()
+
+    salida = io.StringIO()
+    call_command("poblar_rut_numero", "--lote", "2", stdout=salida)
+
+    assert sorted(Cliente.objects.values_list("rut_numero", flat=True)) == [9876543, 11111111, 12345678]
+    assert set(Factura.objects.values_list("rut_deudor_numero", flat=True)) == {76543210}
+    assert "3 filas completadas" in salida.getvalue()
+
+    # Idempotente: una segunda pasada no toca nada
+    salida = io.StringIO()
+    call_command("poblar_rut_numero", stdout=salida)
+    assert "0 filas completadas" in salida.getvalue()
+
+
+def test_lecturas_por_rut_encuentran_las_filas_aun_sin_numero():
+    clientes = _clientes_con_facturas()
+    _sin_numero("clientes_cliente", "rut_numero")
+    _sin_numero("facturas_factura", "rut_deudor_numero")
+    api = APIClient()
+
+    def ids(url, clave="results"):
+        resp = api.get(url)
+        assert resp.status_code == 200, resp.data
+        return sorted(fila["id"] for fila in resp.json()[clave])
+
+    assert ids("/api/clientes/?rut=12345678-5") == [clientes[0].id]
+    assert ids("/api/clientes/?rut_prefijo=9.876") == [clientes[2].id]
+    assert len(ids("/api/facturas/?rut_deudor=76.543.210-3")) == 3
+    assert len(ids("/api/facturas/?rut_deudor_prefijo=7654")) == 3
+    assert ids("/api/buscar/?q=12.345.678-5", "clientes") == [clientes[0].id]
+    assert len(ids("/api/buscar/?q=76543210-3", "facturas")) == 3
+
+    resumen = conciliar_pagos([(1, {"rut_deudor": "76543210-3", "numero_factura": "F-1", "monto": "100"})], pagar=len)
+    assert resumen["pagadas"] == 1
+
+
+def test_seeds_se_pueden_repetir_antes_del_backfill():
+    call_command("seed_clientes", stdout=io.StringIO())
+    _sin_numero("clientes_cliente", "rut_numero")
+
+    call_command("seed_clientes", stdout=io.StringIO())
+    call_command("seed_facturas", stdout=io.StringIO())
+    assert Factura.objects.exists()
@@ -0,0 +1,63 @@
+import pytest
+from django.db import connections
+from rest_framework.test import APIClient
+
+from core.db.postgresql_pool.base import DatabaseWrapper, cerrar_pools, estadisticas_pools
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def conexion_con_pool():
+    ajustes = {
+        **connections["default"].settings_dict,
+        "OPTIONS": {"server_side_binding": True, "prepare_threshold": 1},
+        "POOL": {"min_size": 1, "max_size": 2},
+    }
+    conexion = DatabaseWrapper(ajustes, alias="prueba_pool")
+    # Los receptores de connection_created (p.ej. los de django.contrib.postgres)
+    # resuelven la conexión por alias en `connections`
+    connections["prueba_pool"] = conexion
+    yield conexion
+    conexion.close()
+    del connections["prueba_pool"]
+    cerrar_pools(ajustes["NAME"])
+
+
+def _pid(conexion):
+    with conexion.cursor() as cur:
+        cur.execute("SELECT pg_backend_pid()")
+        return cur.fetchone()[0]
+
+
+def test_cerrar_devuelve_la_conexion_al_pool_y_se_reutiliza(conexion_con_pool):
+    pids = []
+    for _ in range(6):
+        pids.append(_pid(conexion_con_pool))
+        conexion_con_pool.close()
+        assert conexion_con_pool.connection is None
+
+    # Seis ciclos de abrir/cerrar reutilizan como máximo las max_size conexiones del pool
+    assert len(set(pids)) <= 2
+
+    stats = estadisticas_pools()[f"prueba_pool:{conexion_con_pool.settings_dict['NAME']}"]
+    assert stats["pool_max"] == 2
+    assert stats["requests_num"] == 6
+    assert stats["connections_num"] <= 2
+
+
+def test_consultas_repetidas_usan_sentencias_preparadas(conexion_con_pool):
+    for i in range(3):
+        with conexion_con_pool.cursor() as cur:
+            cur.execute("SELECT %s::int + 1", [i])
+            assert cur.fetchone()[0] == i + 1
+
+    with conexion_con_pool.cursor() as cur:
+        cur.execute("SELECT count(*) FROM pg_prepared_statements")
+        assert cur.fetchone()[0] >= 1
+
+
+def test_endpoint_de_metricas_expone_pools_y_contadores():
+    resp = APIClient().get("/metricas/")
+    assert resp.status_code == 200
+    assert set(resp.json()) == {"contadores", "pools"}
@@ -0,0 +1,92 @@
+import time
+
+import pytest
+from django.db import connections, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from clientes.modelos import Cliente, EstadoCliente
+from core.enrutador import alias_lectura, lecturas_en_replica
+
+pytestmark = pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+
+
+@pytest.fixture(autouse=True)
+def _replica(settings):
+    settings.DB_REPLICA_HABILITADA = True
+
+
+def _cliente(rut="12.345.678-5"):
+    return Cliente.objects.create(
+        rut=rut,
+        razon_social="Empresa",
+        email="a@a.cl",
+        linea_credito="1000.00",
+        linea_disponible="1000.00",
+        estado=EstadoCliente.ACTIVO,
+    )
+
+
+def _consultas(api_llamada):
+    with CaptureQueriesContext(connections["default"]) as primaria, CaptureQueriesContext(
+        connections["replica"]
+    ) as replica:
+        resp = api_llamada()
+    return resp, len(primaria), len(replica)
+
+
+def test_lecturas_van_a_la_replica_y_escrituras_a_la_primaria():
+    api = APIClient()
+    c = _cliente()
+
+    resp, primaria, replica = _consultas(lambda: api.get("/api/clientes/"))
+    assert resp.status_code == 200
+    assert primaria == 0 and replica > 0
+
+    # El detalle se cachea: se llena desde la primaria y luego no consulta la BD
+    resp, primaria, replica = _consultas(lambda: api.get(f"/api/clientes/{c.id}/linea-disponible/"))
+    assert resp.status_code == 200
+    assert primaria > 0 and replica == 0
+    resp, primaria, replica = _consultas(lambda: api.get(f"/api/clientes/{c.id}/linea-disponible/"))
+    assert resp.status_code == 200
+    assert primaria == 0 and replica == 0
+
+    resp, primaria, replica = _consultas(lambda: api.post(f"/api/clientes/{c.id}/suspender/", {}, format="json"))
+    assert resp.status_code == 200
+    assert primaria > 0 and replica == 0
+
+
+def test_ventana_read_your_writes_por_cookie_y_cabecera():
+    api = APIClient()
+    c = _cliente()
+
+    resp = api.post(f"/api/clientes/{c.id}/suspender/", {}, format="json")
+    hasta = float(resp["X-Leer-Primaria-Hasta"])
+    assert hasta > time.time()
+
+    # El APIClient conserva la cookie: la lectura siguiente va a la primaria
+    _, primaria, replica = _consultas(lambda: api.get("/api/clientes/"))
+    assert primaria > 0 and replica == 0
+
+    otro = APIClient()
+    _, primaria, replica = _consultas(
+        lambda: otro.get("/api/clientes/", HTTP_X_LEER_PRIMARIA_HASTA=str(hasta))
+    )
+    assert primaria > 0 and replica == 0
+
+    _, primaria, replica = _consultas(
+        lambda: otro.get("/api/clientes/", HTTP_X_LEER_PRIMARIA_HASTA=str(time.time() - 1))
+    )
+    assert primaria == 0 and replica > 0
+
+
+def test_transacciones_y_codigo_fuera_de_solicitudes_usan_la_primaria(settings):
+    assert alias_lectura() == "default"
+    with lecturas_en_replica():
+        assert alias_lectura() == "replica"
+        with transaction.atomic():
+            assert alias_lectura() == "default"
+
+    settings.DB_REPLICA_HABILITADA = False
+    with lecturas_en_replica():
+        assert alias_lectura() == "default"
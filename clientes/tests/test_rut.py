@@ -1,6 +1,6 @@
 import pytest
 
-from core.rut import es_rut_valido, normalizar_rut
+from core.rut import es_rut_valido, normalizar_rut, numero_rut, rangos_prefijo_rut, rut_de_busqueda
 
 
 @pytest.mark.parametrize(
@@ -43,3 +43,30 @@ def test_normalizar_rut_k_mayuscula():
 def test_normalizar_rut_formato_invalido_lanza_error():
     with pytest.raises(ValueError):
         normalizar_rut("rut-malo")
+
+
+@pytest.mark.parametrize(
+    "texto, esperado",
+    [
+        ("12.345.678-5", "12.345.678-5"),
+        ("12345678-5", "12.345.678-5"),
+        (" 7.654.321-k", "7.654.321-K"),
+        ("12345678", None),          # solo dígitos: puede ser un número de factura
+        ("F-12345", None),
+        ("constructora", None),
+    ],
+)
+def test_rut_de_busqueda(texto, esperado):
+    assert rut_de_busqueda(texto) == esperado
+
+
+@pytest.mark.parametrize("rut", ["9.876.543-3", "9876543-3", "09.876.543-3", " 9.876.543–3 "])
+def test_numero_rut_no_depende_de_la_escritura(rut):
+    assert numero_rut(rut) == 9876543
+
+
+def test_rangos_prefijo_rut():
+    assert rangos_prefijo_rut("12.345.6") == [(123456, 123457), (1234560, 1234570), (12345600, 12345700)]
+    assert rangos_prefijo_rut("12345678") == [(12345678, 12345679)]
+    with pytest.raises(ValueError):
+        rangos_prefijo_rut("12-3")
@@ -0,0 +1,121 @@
+from datetime import datetime, timezone as tz_utc
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from clientes.api.serializadores import SerializadorCliente
+from clientes.modelos import Cliente, EstadoCliente
+from core.serializacion_rapida import convertidor, valores
+from facturas.api.serializadores import SerializadorFactura
+from facturas.modelos import EstadoFactura, Factura
+from operaciones.api.serializadores import SerializadorOperacion
+from operaciones.modelos import EstadoOperacion, OperacionCesion
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _cache_limpia():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _datos():
+    clientes = [
+        Cliente.objects.create(
+            rut="12.345.678-5",
+            razon_social="Empresa Ñandú & Cía",
+            giro="Servicios \"financieros\"",
+            email="a@a.cl",
+            linea_credito="0.00",
+            linea_disponible="0.00",
+            estado=EstadoCliente.PENDIENTE,
+        ),
+        Cliente.objects.create(
+            rut="11.111.111-1",
+            razon_social="Otra",
+            email="b@b.cl",
+            linea_credito="9999999999999.99",
+            linea_disponible="0.10",
+            estado=EstadoCliente.ACTIVO,
+        ),
+    ]
+    for i, monto in enumerate(["0.01", "1000.50", "123456789.00"]):
+        Factura.objects.create(
+            cliente=clientes[1],
+            numero_factura=f"F-{i}",
+            rut_deudor="76.543.210-3",
+            razon_social_deudor="Deudor",
+            monto_total=monto,
+            fecha_emision="2026-02-01",
+            fecha_vencimiento="2026-03-01",
+            estado=EstadoFactura.DISPONIBLE if i else EstadoFactura.ANULADA,
+        )
+    OperacionCesion.objects.create(cliente=clientes[1], tasa_descuento="2.5")
+    OperacionCesion.objects.create(
+        cliente=clientes[1],
+        tasa_descuento="1.25",
+        monto_total_facturas="1000.50",
+        monto_descuento="12.51",
+        monto_a_desembolsar="987.99",
+        fecha_aprobacion=datetime(2026, 2, 1, 12, 30, 15, 123456, tzinfo=tz_utc.utc),
+        fecha_desembolso=datetime(2026, 2, 2, tzinfo=tz_utc.utc),
+        estado=EstadoOperacion.RECHAZADA,
+        motivo_rechazo="Sin respaldo",
+    )
+
+
+SERIALIZADORES = [SerializadorCliente, SerializadorFactura, SerializadorOperacion]
+
+
+def _bytes(datos) -> bytes:
+    return JSONRenderer().render(datos)
+
+
+@pytest.mark.parametrize("serializador", SERIALIZADORES)
+@pytest.mark.parametrize("zona", ["UTC", "America/Santiago"])
+def test_convertidor_produce_el_mismo_json_que_el_serializador(serializador, zona):
+    _datos()
+    queryset = serializador.Meta.model.objects.order_by("id")
+    conv = convertidor(serializador)
+
+    with timezone.override(zona):
+        esperado = _bytes(serializador(queryset, many=True).data)
+        obtenido = _bytes(conv.convertir(valores(queryset, conv)))
+    assert obtenido == esperado
+
+
+@pytest.mark.parametrize("recurso", ["clientes", "facturas", "operaciones"])
+def test_api_responde_lo_mismo_que_el_serializador(recurso):
+    _datos()
+    api = APIClient()
+    serializador = {"clientes": SerializadorCliente, "facturas": SerializadorFactura, "operaciones": SerializadorOperacion}[
+        recurso
+    ]
+    modelo = serializador.Meta.model
+
+    resp = api.get(f"/api/{recurso}/?limite=50&paginacion=cursor")
+    filas = modelo.objects.filter(pk__in=[fila["id"] for fila in resp.json()["results"]])
+    orden = {fila.pk: fila for fila in filas}
+    esperado = [serializador(orden[fila["id"]]).data for fila in resp.json()["results"]]
+    assert _bytes(resp.json()["results"]) == _bytes(esperado)
+
+    pk = modelo.objects.order_by("id").last().pk
+    assert api.get(f"/api/{recurso}/{pk}/").content == _bytes(serializador(modelo.objects.get(pk=pk)).data)
+    assert api.get(f"/api/{recurso}/999999/").status_code == 404
+    assert api.get(f"/api/{recurso}/abc/").status_code == 404
+
+
+def test_escrituras_siguen_usando_el_serializador():
+    _datos()
+    api = APIClient()
+    cliente = Cliente.objects.get(rut="11.111.111-1")
+
+    resp = api.patch(f"/api/clientes/{cliente.id}/", {"giro": "Nuevo"}, format="json")
+    assert resp.status_code == 200
+    cliente.refresh_from_db()
+    assert resp.content == _bytes(SerializadorCliente(cliente).data)
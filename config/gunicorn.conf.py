@@ -0,0 +1,78 @@
+"""
+Configuración de gunicorn para producción.
+
+    gunicorn -c config/gunicorn.conf.py config.wsgi:application
+    GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker gunicorn -c config/gunicorn.conf.py config.asgi:application
+
+Workers e hilos salen de los CPUs disponibles (respetando el límite del
+contenedor) y se pueden fijar con GUNICORN_WORKERS / GUNICORN_THREADS. La app
+se precarga en el maestro: Django, las apps y el calentamiento sin BD se hacen
+una vez, y gc.freeze() antes del fork deja esos objetos fuera del recolector
+para que los workers compartan las páginas copy-on-write en vez de copiarlas.
+Cada worker abre su conexión a la BD antes de recibir tráfico.
+"""
+import gc
+import os
+
+
+def _env_bool(nombre: str, defecto: bool) -> bool:
+    return os.getenv(nombre, str(defecto)).lower() == "true"
+
+
+def _cpus() -> int:
+    """CPUs utilizables: afinidad del proceso acotada por la cuota de cgroup v2 (cpu.max)."""
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            cuota, periodo = f.read().split()
+        if cuota != "max":
+            cpus = min(cpus, max(1, int(cuota) // int(periodo)))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+CPUS = _cpus()
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+workers = int(os.getenv("GUNICORN_WORKERS", 2 * CPUS + 1))
+threads = int(os.getenv("GUNICORN_THREADS", min(2 * CPUS, 8)))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "0"))
+accesslog = os.getenv("GUNICORN_ACCESSLOG", "-") or None  # vacío: sin access log
+
+preload_app = _env_bool("GUNICORN_PRELOAD", True)
+GC_FREEZE = _env_bool("GUNICORN_GC_FREEZE", True)
+CALENTAR = _env_bool("GUNICORN_CALENTAR", True)
+
+
+def when_ready(server):
+    # Maestro, con la app ya precargada y antes de crear los workers
+    if preload_app and CALENTAR:
+        from core.calentamiento import calentar
+
+        calentar(conectar_bd=False)
+    if preload_app and GC_FREEZE:
+        gc.collect()
+        gc.freeze()
+        server.log.info("gc.freeze(): %s objetos fuera del recolector", gc.get_freeze_count())
+
+
+def post_worker_init(worker):
+    # Worker, con la app cargada y antes de aceptar conexiones
+    from core.cache_lecturas import iniciar_escucha
+
+    iniciar_escucha()  # invalidaciones del cache de lecturas emitidas por otros workers
+
+    if not CALENTAR:
+        return
+    from core.calentamiento import calentar, conectar
+
+    if preload_app:
+        worker.log.info("Worker %s conectado a %s", worker.pid, conectar())
+    else:
+        calentar()
@@ -34,23 +34,39 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     "rest_framework",
     "drf_spectacular",
     "core",
     "clientes",
     "facturas",
     "operaciones",
+    "busqueda",
 ]
 
+# JSON_RAPIDO=true renderiza y parsea JSON con orjson (core/json_rapido.py), con
+# la misma salida que el JSONRenderer de DRF; false vuelve a los de DRF
+JSON_RAPIDO = os.getenv("JSON_RAPIDO", "true").lower() == "true"
+
 REST_FRAMEWORK = {
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "core.paginacion.PaginacionCursorOpcional",
     "PAGE_SIZE": 20,
     "EXCEPTION_HANDLER": "core.errores.manejador_excepciones",
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.json_rapido.RenderizadorJSON" if JSON_RAPIDO else "rest_framework.renderers.JSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "core.json_rapido.ParserJSON" if JSON_RAPIDO else "rest_framework.parsers.JSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
 MIDDLEWARE = [
     "core.middlewares.RequestIdMiddleware",
+    "core.middlewares.ReplicaLecturaMiddleware",
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -84,17 +100,50 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# DB_POOL=true usa el backend con pool de psycopg_pool (core/db/postgresql_pool):
+# cada solicitud toma y devuelve una conexión en vez de abrir una nueva.
+DB_POOL = os.getenv("DB_POOL", "false").lower() == "true"
+
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        "ENGINE": "core.db.postgresql_pool" if DB_POOL else "django.db.backends.postgresql",
         "NAME": os.getenv("POSTGRES_DB", "factoring"),
         "USER": os.getenv("POSTGRES_USER", "factoring"),
         "PASSWORD": os.getenv("POSTGRES_PASSWORD", "factoring"),
         "HOST": os.getenv("POSTGRES_HOST", "db"),
         "PORT": os.getenv("POSTGRES_PORT", "5432"),
+        "OPTIONS": {
+            # Binding en el servidor + prepare_threshold: psycopg prepara las
+            # consultas repetidas (p.ej. las de operaciones.servicios) y, con
+            # pool, la sentencia preparada se reutiliza entre solicitudes
+            "server_side_binding": os.getenv("DB_SERVER_SIDE_BINDING", str(DB_POOL)).lower() == "true",
+            "prepare_threshold": int(os.getenv("DB_PREPARE_THRESHOLD", "5")),
+        },
+        "POOL": {
+            "min_size": int(os.getenv("DB_POOL_MIN", "2")),
+            "max_size": int(os.getenv("DB_POOL_MAX", "10")),
+            "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", "600")),
+            "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", "3600")),
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+            "check": os.getenv("DB_POOL_CHECK", "true").lower() == "true",
+        },
     }
 }
 
+# Réplica de lectura. Sin POSTGRES_REPLICA_* apunta a la misma BD, útil en local;
+# las lecturas solo se enrutan a ella con DB_REPLICA_HABILITADA=true (core/enrutador.py)
+DATABASES["replica"] = {
+    **DATABASES["default"],
+    "NAME": os.getenv("POSTGRES_REPLICA_DB", DATABASES["default"]["NAME"]),
+    "HOST": os.getenv("POSTGRES_REPLICA_HOST", DATABASES["default"]["HOST"]),
+    "PORT": os.getenv("POSTGRES_REPLICA_PORT", DATABASES["default"]["PORT"]),
+    "TEST": {"MIRROR": "default"},
+}
+DATABASE_ROUTERS = ["core.enrutador.EnrutadorReplica"]
+DB_REPLICA_HABILITADA = os.getenv("DB_REPLICA_HABILITADA", "false").lower() == "true"
+# Segundos que un cliente lee de la primaria después de escribir
+REPLICA_STICKY_SEGUNDOS = int(os.getenv("REPLICA_STICKY_SEGUNDOS", "10"))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -170,4 +219,48 @@ SPECTACULAR_SETTINGS = {
     "SERVE_INCLUDE_SCHEMA": False,
 }
 
-DEFAULT_TASA_DESCUENTO = Decimal(os.getenv("DEFAULT_TASA_DESCUENTO", "2.00"))
\ No newline at end of file
+DEFAULT_TASA_DESCUENTO = Decimal(os.getenv("DEFAULT_TASA_DESCUENTO", "2.00"))
+
+# Máximo de solicitudes aceptadas por POST /api/operaciones/lote/
+OPERACIONES_LOTE_MAX = int(os.getenv("OPERACIONES_LOTE_MAX", "500"))
+
+# Reintentos ante deadlock / serialization failure en servicios transaccionales
+DB_REINTENTOS_MAX = int(os.getenv("DB_REINTENTOS_MAX", "3"))
+DB_REINTENTOS_BASE_MS = int(os.getenv("DB_REINTENTOS_BASE_MS", "50"))
+DB_REINTENTOS_TOPE_MS = int(os.getenv("DB_REINTENTOS_TOPE_MS", "1000"))
+
+# Vigencia de las respuestas almacenadas por Idempotency-Key
+IDEMPOTENCIA_TTL_HORAS = int(os.getenv("IDEMPOTENCIA_TTL_HORAS", "24"))
+
+# Máximo de incidencias devueltas por POST /api/facturas/conciliar/
+CONCILIACION_MAX_INCIDENCIAS = int(os.getenv("CONCILIACION_MAX_INCIDENCIAS", "1000"))
+
+# Outbox de eventos de operaciones: destino de publicación y archivo del sink JSONL local
+OUTBOX_SINK = os.getenv("OUTBOX_SINK", "operaciones.outbox.SinkArchivoJsonl")
+OUTBOX_ARCHIVO = os.getenv("OUTBOX_ARCHIVO", str(BASE_DIR / "outbox.jsonl"))
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    }
+}
+
+# Conteos de listados: sobre este umbral (estimado por el planner) se informa
+# el estimado en vez de ejecutar COUNT(*); los exactos por filtros comunes se cachean
+CONTEO_ESTIMADO_UMBRAL = int(os.getenv("CONTEO_ESTIMADO_UMBRAL", "10000"))
+CONTEO_CACHE_TTL_SEGUNDOS = int(os.getenv("CONTEO_CACHE_TTL_SEGUNDOS", "30"))
+
+# Cache de detalle de clientes, facturas y operaciones (core/cache_lecturas.py).
+# Se invalida por versión al confirmar cada escritura; el TTL es la red de
+# seguridad. Con NOTIFY, cada proceso avisa a los demás por Postgres: solo hace
+# falta con un cache por proceso (LocMem, file) y varios workers, así que por
+# defecto se activa únicamente con esos backends
+CACHE_LECTURAS_TTL_SEGUNDOS = int(os.getenv("CACHE_LECTURAS_TTL_SEGUNDOS", "300"))
+CACHE_POR_PROCESO = CACHES["default"]["BACKEND"].rsplit(".", 1)[-1] in ("LocMemCache", "FileBasedCache")
+CACHE_LECTURAS_NOTIFY = os.getenv("CACHE_LECTURAS_NOTIFY", str(CACHE_POR_PROCESO)).lower() == "true"
+
+# Búsqueda unificada (/api/buscar): máximo de coincidencias por tipo y nivel
+# (exacta, prefijo, resto) que se rankean por similitud; acota el costo de
+# términos muy comunes
+BUSQUEDA_CANDIDATOS = int(os.getenv("BUSQUEDA_CANDIDATOS", "500"))
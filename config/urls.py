@@ -18,6 +18,8 @@ from django.contrib import admin
 from django.urls import include, path
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
+from core import metricas as contadores
+from core.db.postgresql_pool.base import estadisticas_pools
 from drf_spectacular.views import (
     SpectacularAPIView,
     SpectacularSwaggerView,
@@ -37,13 +39,23 @@ def root(request):
 def health(request):
     return Response({"status": "ok"})
 
+@api_view(["GET"])
+def metricas(request):
+    return Response({"contadores": contadores.snapshot(), "pools": estadisticas_pools()})
+
 urlpatterns = [
     path("", root),
     path("admin/", admin.site.urls),
     path("health/", health),
+    path("metricas/", metricas),
     path("api/", include("clientes.api.urls")),
     path("api/", include("facturas.api.urls")),
     path("api/", include("operaciones.api.urls")),
+    path("api/", include("busqueda.api.urls")),
+    # Lecturas async-nativas (ASGI): mismas respuestas que /api/, con el ORM async
+    path("api/async/", include("clientes.api.urls_async")),
+    path("api/async/", include("facturas.api.urls_async")),
+    path("api/async/", include("operaciones.api.urls_async")),
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path("api/docs/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
     path("api/redoc/", SpectacularRedocView.as_view(url_name="schema"), name="redoc"),
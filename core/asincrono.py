@@ -0,0 +1,100 @@
+"""
+Camino de lectura async-nativo (ASGI) para /api/async/.
+
+DRF no tiene vistas async, así que estas son vistas `async def` de Django que
+usan el ORM async y reutilizan los selectores, los serializadores (compilados
+en core.serializacion_rapida), la paginación y el formato de errores de la
+API síncrona: las respuestas son las mismas.
+
+Las vistas reciben el ViewSet síncrono del recurso y toman de él el
+serializador, recurso_cache y estados_inmutables: el detalle sale del mismo
+cache (core.cache_lecturas.leer_detalle) y las respuestas llevan las mismas
+cabeceras ETag / Last-Modified / Cache-Control y el mismo 304 (core.condicional).
+Las escrituras (servicios con transacciones y bloqueos) siguen siendo síncronas.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+
+from django.http import Http404, HttpResponse
+from rest_framework.exceptions import APIException, MethodNotAllowed
+from rest_framework.generics import get_object_or_404
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from core import cache_lecturas, condicional
+from core.errores import manejador_excepciones
+from core.serializacion_rapida import convertidor, valores
+
+METODOS_LECTURA = ("GET", "HEAD")
+
+
+def respuesta_json(data, status: int = 200) -> HttpResponse:
+    """JSON con el mismo renderer (y codificación de Decimal/fechas) que las vistas de DRF."""
+    contenido = api_settings.DEFAULT_RENDERER_CLASSES[0]().render(data)
+    return HttpResponse(contenido, status=status, content_type="application/json")
+
+
+def vista_lectura_async(vista):
+    """
+    Decorador de las vistas async: acepta solo GET/HEAD, entrega a la vista un
+    Request de DRF (query_params, build_absolute_uri) y traduce las excepciones
+    de la API con core.errores.manejador_excepciones.
+    """
+
+    @wraps(vista)
+    async def envoltura(request, *args, **kwargs):
+        try:
+            if request.method not in METODOS_LECTURA:
+                raise MethodNotAllowed(request.method)
+            return await vista(Request(request), *args, **kwargs)
+        except (APIException, Http404) as exc:
+            error = manejador_excepciones(exc, {})
+            respuesta = respuesta_json(error.data, status=error.status_code)
+            if isinstance(exc, MethodNotAllowed):
+                respuesta["Allow"] = ", ".join(METODOS_LECTURA)
+            return respuesta
+
+    return envoltura
+
+
+async def datos_detalle(request, vista, queryset, pk) -> dict:
+    """Detalle convertido, del cache de lecturas igual que DetalleCacheado.datos_detalle."""
+    conv = convertidor(vista.serializer_class)
+
+    def calcular():
+        return conv.uno(get_object_or_404(valores(queryset, conv), pk=pk))
+
+    return await sync_to_async(cache_lecturas.leer_detalle)(vista.recurso_cache, pk, request.query_params, calcular)
+
+
+async def respuesta_listado(request, vista, queryset) -> HttpResponse:
+    """Equivalente a GetCondicional.list."""
+    conv = convertidor(vista.serializer_class)
+    paginacion = api_settings.DEFAULT_PAGINATION_CLASS()
+
+    etag = ultimo = None
+    if paginacion.cuenta_exacta(request):
+        marca = await queryset.order_by().aaggregate(**condicional.MARCA_LISTADO)
+        etag, ultimo = condicional.marca_listado(vista.recurso_cache, request, marca)
+        if respuesta := condicional.no_modificada(request._request, etag, ultimo):
+            return condicional.marcar(respuesta, etag, ultimo, condicional.CACHE_REVALIDAR)
+        paginacion.conteo_conocido = marca["total"]
+
+    filas = await paginacion.apaginate_queryset(valores(queryset, conv), request)
+
+    if etag is None:
+        etag, ultimo = condicional.marca_pagina(vista.recurso_cache, request, filas, paginacion)
+        if respuesta := condicional.no_modificada(request._request, etag, ultimo):
+            return condicional.marcar(respuesta, etag, ultimo, condicional.CACHE_REVALIDAR)
+
+    respuesta = respuesta_json(paginacion.get_paginated_response(conv.convertir(filas)).data)
+    return condicional.marcar(respuesta, etag, ultimo, condicional.CACHE_REVALIDAR)
+
+
+async def respuesta_detalle(request, vista, queryset, pk) -> HttpResponse:
+    """Equivalente a GetCondicional.retrieve."""
+    datos = await datos_detalle(request, vista, queryset, pk)
+    etag, ultimo, cache_control = condicional.marca_detalle(vista.recurso_cache, datos, vista.estados_inmutables)
+    respuesta = condicional.no_modificada(request._request, etag, ultimo) or respuesta_json(datos)
+    return condicional.marcar(respuesta, etag, ultimo, cache_control)
@@ -0,0 +1,238 @@
+"""
+Cache de lecturas de detalle (cliente, factura, operación) con invalidación
+por versión.
+
+Cada recurso tiene un contador de versión en el cache; la entrada se guarda
+bajo (recurso, id, versión), así que invalidar es solo avanzar el contador y
+las entradas viejas expiran solas. La versión avanza al confirmar la
+transacción que escribió (transaction.on_commit), nunca antes: una lectura
+concurrente no puede volver a cachear el dato anterior con la versión nueva.
+
+Con un cache por proceso (LocMem, el de por defecto) cada worker tiene sus
+propias versiones: al confirmar, la transacción emite un solo NOTIFY de
+Postgres con todo lo que invalidó y el hilo de iniciar_escucha() de cada
+worker avanza sus versiones al recibirlo. El NOTIFY va después del commit y
+fuera de la transacción que escribió: Postgres serializa los commits que
+notifican con un lock global, y dentro de cada escritura eso las pondría en fila.
+"""
+import json
+import logging
+import os
+import socket
+import threading
+import time
+
+import psycopg
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connection, connections, transaction
+from rest_framework.response import Response
+
+from core import metricas
+from core.enrutador import lecturas_en_replica
+from core.serializacion_rapida import LecturaRapida
+
+logger = logging.getLogger(__name__)
+
+CLIENTE = "cliente"
+FACTURA = "factura"
+OPERACION = "operacion"
+
+CANAL = "lecturas_cache"
+# NOTIFY admite payloads de hasta 8000 bytes: los lotes grandes se parten
+IDS_POR_NOTIFY = 500
+
+_escucha: threading.Thread | None = None
+# Invalidaciones de la transacción en curso de cada hilo (cada uno tiene su conexión)
+_local = threading.local()
+
+
+def _origen() -> str:
+    """Identifica al proceso (se evalúa en cada llamada: los workers nacen por fork)."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _clave_version(recurso: str, pk) -> str:
+    return f"lecturas:v:{recurso}:{pk}"
+
+
+def _version(recurso: str, pk) -> int:
+    clave = _clave_version(recurso, pk)
+    version = cache.get(clave)
+    if version is None:
+        # Un valor nuevo (no 0) para no reencontrar entradas de un contador que el cache descartó
+        cache.add(clave, time.time_ns(), None)
+        version = cache.get(clave)
+    return version
+
+
+def _avanzar_versiones(recurso: str, ids) -> None:
+    for pk in ids:
+        try:
+            cache.incr(_clave_version(recurso, pk))
+        except ValueError:
+            cache.add(_clave_version(recurso, pk), time.time_ns(), None)
+
+
+def leer(recurso: str, pk, calcular):
+    """
+    Retorna el dato cacheado de (recurso, pk) o lo calcula con calcular() y lo
+    guarda CACHE_LECTURAS_TTL_SEGUNDOS. Cuenta aciertos y fallos en core.metricas.
+
+    El cálculo lee de la primaria: una réplica atrasada podría dejar guardado
+    el dato anterior a una escritura bajo la versión nueva.
+    """
+    clave = f"lecturas:{recurso}:{pk}:{_version(recurso, pk)}"
+    dato = cache.get(clave)
+    if dato is not None:
+        metricas.incrementar(f"cache.{recurso}.hit")
+        return dato
+
+    metricas.incrementar(f"cache.{recurso}.miss")
+    with lecturas_en_replica(False):
+        dato = calcular()
+    cache.set(clave, dato, settings.CACHE_LECTURAS_TTL_SEGUNDOS)
+    return dato
+
+
+def _notificar(pendientes: dict[str, set[int]]) -> None:
+    payloads = []
+    for recurso, ids in pendientes.items():
+        ids = sorted(ids)
+        for i in range(0, len(ids), IDS_POR_NOTIFY):
+            payloads.append(json.dumps({"r": recurso, "ids": ids[i : i + IDS_POR_NOTIFY], "o": _origen()}))
+    try:
+        with connection.cursor() as cur:
+            cur.execute("SELECT pg_notify(%s, p) FROM unnest(%s::text[]) AS p", [CANAL, payloads])
+    except DatabaseError:
+        # Los demás procesos no se enteran de esta escritura; el TTL acota cuánto
+        # puede durar el dato viejo en ellos.
+        logger.exception("No se pudo notificar la invalidación de cache")
+        metricas.incrementar("cache.notificaciones.errores")
+
+
+class _Aviso:
+    """
+    Invalidaciones pendientes de una transacción. Se registra una sola vez con
+    on_commit: al confirmar avanza las versiones y emite un único NOTIFY.
+    """
+
+    def __init__(self, recurso: str, ids: set[int]):
+        self.pendientes = {recurso: ids}
+        self.ejecutado = False
+
+    def vigente(self) -> bool:
+        """Sigue registrado en la transacción en curso (no corrió ni se descartó con un rollback)."""
+        return not self.ejecutado and any(entrada[1] is self for entrada in connection.run_on_commit)
+
+    def __call__(self):
+        self.ejecutado = True
+        for recurso, ids in self.pendientes.items():
+            _avanzar_versiones(recurso, ids)
+        if settings.CACHE_LECTURAS_NOTIFY:
+            _notificar(self.pendientes)
+
+
+def invalidar(recurso: str, ids) -> None:
+    """
+    Invalida las lecturas cacheadas de los ids del recurso al confirmar la
+    transacción en curso (o de inmediato si no hay una). Llamar desde los
+    servicios después de escribir.
+    """
+    ids = {int(pk) for pk in ids}
+    if not ids:
+        return
+
+    aviso = getattr(_local, "aviso", None)
+    if aviso is not None and aviso.vigente():
+        aviso.pendientes.setdefault(recurso, set()).update(ids)
+        return
+    _local.aviso = _Aviso(recurso, ids)
+    transaction.on_commit(_local.aviso)
+
+
+def aplicar_notificacion(payload: str) -> None:
+    """Avanza las versiones que otro proceso invalidó (las propias ya se avanzaron en on_commit)."""
+    try:
+        datos = json.loads(payload)
+    except ValueError:
+        logger.warning("Notificación de cache inválida", extra={"payload": payload})
+        return
+    if datos.get("o") == _origen():
+        return
+    _avanzar_versiones(datos["r"], datos["ids"])
+    metricas.incrementar("cache.notificaciones")
+
+
+def _escuchar(parametros: dict, detener: threading.Event) -> None:
+    espera = 1.0
+    while not detener.is_set():
+        try:
+            with psycopg.connect(**parametros, autocommit=True) as conn:
+                conn.execute(f"LISTEN {CANAL}")
+                espera = 1.0
+                while not detener.is_set():
+                    for notificacion in conn.notifies(timeout=1.0):
+                        aplicar_notificacion(notificacion.payload)
+        except psycopg.Error:
+            # Mientras no haya conexión no llegan invalidaciones de otros
+            # procesos; el TTL acota cuánto puede durar un dato viejo.
+            logger.exception("Escucha de invalidaciones de cache caída; reintentando")
+            metricas.incrementar("cache.escucha.errores")
+            detener.wait(espera)
+            espera = min(espera * 2, 30.0)
+
+
+def iniciar_escucha() -> threading.Event | None:
+    """
+    Inicia (una vez por proceso) el hilo que escucha el canal de invalidación
+    con su propia conexión. Retorna el Event que lo detiene. Pensado para
+    cada worker de gunicorn (post_worker_init); no hace falta con un solo proceso.
+    """
+    global _escucha
+    if not settings.CACHE_LECTURAS_NOTIFY or (_escucha is not None and _escucha.is_alive()):
+        return None
+
+    parametros = connections["default"].get_connection_params()
+    detener = threading.Event()
+    _escucha = threading.Thread(target=_escuchar, args=(parametros, detener), name="cache-lecturas", daemon=True)
+    _escucha.start()
+    return detener
+
+
+def leer_detalle(recurso: str, pk, parametros, calcular) -> dict:
+    """
+    Detalle de la URL: del cache si no trae parámetros (con filtros, p.ej.
+    ?estado=..., el resultado depende de ellos y se consulta siempre).
+    """
+    try:
+        pk = int(pk)
+    except (TypeError, ValueError):
+        return calcular()
+    if parametros:
+        return calcular()
+    return leer(recurso, pk, calcular)
+
+
+class DetalleCacheado(LecturaRapida):
+    """
+    Mixin de ViewSet: el detalle se sirve con leer_detalle. Las ediciones por
+    CRUD invalidan el recurso.
+    """
+
+    recurso_cache: str
+
+    def datos_detalle(self) -> dict:
+        pk = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        return leer_detalle(self.recurso_cache, pk, self.request.query_params, self.leer_detalle)
+
+    def retrieve(self, request, *args, **kwargs):
+        return Response(self.datos_detalle())
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        invalidar(self.recurso_cache, [serializer.instance.pk])
+
+    def perform_destroy(self, instance):
+        invalidar(self.recurso_cache, [instance.pk])
+        super().perform_destroy(instance)
@@ -0,0 +1,97 @@
+"""
+Calentamiento del proceso antes de atender la primera solicitud.
+
+Con gunicorn y preload_app, la parte sin BD (importar módulos, resolver el
+URLconf, construir los serializadores) corre en el proceso maestro antes del
+fork, y los workers heredan ese trabajo ya hecho. La conexión a la BD se abre
+en cada worker (config/gunicorn.conf.py), porque una conexión no sobrevive al
+fork.
+"""
+import logging
+import time
+from importlib import import_module
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections
+from django.urls import get_resolver
+
+logger = logging.getLogger(__name__)
+
+# Módulos de cada app que la primera solicitud importaría de forma perezosa
+MODULOS_APP = ("selectores", "servicios", "api.serializadores", "api.vistas", "api.vistas_async")
+
+
+def _importar_modulos() -> int:
+    importados = 0
+    propias = [c for c in apps.get_app_configs() if c.path.startswith(str(settings.BASE_DIR))]
+    for config in propias:
+        for modulo in MODULOS_APP:
+            nombre = f"{config.name}.{modulo}"
+            try:
+                import_module(nombre)
+            except ModuleNotFoundError as exc:
+                # La app no tiene ese módulo; un import roto dentro de él sí es error
+                if nombre != exc.name and not nombre.startswith(f"{exc.name}."):
+                    raise
+                continue
+            importados += 1
+    return importados
+
+
+def _vistas(patrones):
+    for patron in patrones:
+        if hasattr(patron, "url_patterns"):
+            yield from _vistas(patron.url_patterns)
+        else:
+            yield patron.callback
+
+
+def _resolver_urls() -> list:
+    resolver = get_resolver()
+    resolver.reverse_dict  # fuerza _populate(): compila los patrones y el índice de reverse()
+    return list(_vistas(resolver.url_patterns))
+
+
+def _construir_serializadores(vistas) -> int:
+    construidos = 0
+    clases = {getattr(getattr(vista, "cls", None), "serializer_class", None) for vista in vistas}
+    for clase in filter(None, clases):
+        clase().fields  # ModelSerializer arma sus campos desde el _meta del modelo
+        construidos += 1
+    return construidos
+
+
+def calentar(*, conectar_bd: bool = True) -> dict:
+    """
+    Calienta el proceso y retorna lo hecho, con la duración en milisegundos.
+    Con conectar_bd=False no toca la BD (para usar en el maestro antes del fork).
+    """
+    inicio = time.perf_counter()
+    resumen = {"modulos": _importar_modulos()}
+    vistas = _resolver_urls()
+    resumen["vistas"] = len(vistas)
+    resumen["serializadores"] = _construir_serializadores(vistas)
+
+    if conectar_bd:
+        resumen["conexiones"] = conectar()
+
+    resumen["ms"] = round((time.perf_counter() - inicio) * 1000, 1)
+    logger.info("Calentamiento listo: %s", resumen)
+    return resumen
+
+
+def conectar() -> list[str]:
+    """
+    Abre (y devuelve) una conexión por alias en uso. Valida credenciales y red
+    antes de recibir tráfico; con DB_POOL=true deja el pool creado con sus
+    DB_POOL_MIN conexiones.
+    """
+    alias = ["default"]
+    if settings.DB_REPLICA_HABILITADA:
+        alias.append("replica")
+    for nombre in alias:
+        conexion = connections[nombre]
+        conexion.ensure_connection()
+        conexion.close()
+    return alias
@@ -0,0 +1,128 @@
+"""
+GET condicional (ETag / Last-Modified) para los ViewSets de la API.
+
+- Detalle: la marca sale de id + actualizado_en del detalle (cacheado por
+  core.cache_lecturas.DetalleCacheado), así que un 304 no consulta la BD ni
+  serializa cuando el detalle está en cache.
+- Listado en modo página: un solo aggregate calcula max(actualizado_en) y el
+  total del queryset filtrado; el total se reutiliza en la paginación, y un
+  304 evita la consulta de la página y la serialización.
+- Listado por cursor o con ?total=estimado: la marca sale de las filas de la
+  página (no se recorre el queryset completo); un 304 evita la serialización.
+
+La página se lee como filas de .values() (core.serializacion_rapida) y se
+convierte recién después de decidir que no es un 304.
+
+Los recursos en un estado terminal se sirven con Cache-Control inmutable; el
+resto con no-cache, para que el cliente siempre revalide.
+
+Las marcas se calculan con funciones de módulo para que las vistas async de
+core.asincrono respondan con las mismas cabeceras.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+CACHE_INMUTABLE = {"private": True, "max_age": 365 * 24 * 3600, "immutable": True}
+CACHE_REVALIDAR = {"private": True, "no_cache": True}
+
+# Aggregate del listado en modo página: marca de tiempo y total en una consulta
+MARCA_LISTADO = {"ultimo": Max("actualizado_en"), "total": Count("pk")}
+
+
+def marcar(respuesta, etag: str | None, ultimo, cache_control: dict):
+    if etag:
+        respuesta["ETag"] = etag
+    if ultimo is not None:
+        respuesta["Last-Modified"] = http_date(ultimo.timestamp())
+    patch_cache_control(respuesta, **cache_control)
+    return respuesta
+
+
+def no_modificada(request, etag: str | None, ultimo):
+    """HttpResponseNotModified si el request (de Django) ya tiene esa versión, o None."""
+    return get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(ultimo.timestamp()) if ultimo is not None else None,
+    )
+
+
+def _etag(*partes) -> str:
+    return '"' + hashlib.sha1("|".join(map(str, partes)).encode()).hexdigest()[:32] + '"'
+
+
+def marca_detalle(recurso: str, datos: dict, estados_inmutables) -> tuple[str, object, dict]:
+    """(etag, last_modified, cache_control) de un detalle ya convertido."""
+    ultimo = parse_datetime(datos["actualizado_en"])
+    etag = _etag(recurso, datos["id"], datos["actualizado_en"])
+    cache_control = CACHE_INMUTABLE if datos.get("estado") in estados_inmutables else CACHE_REVALIDAR
+    return etag, ultimo, cache_control
+
+
+def marca_listado(recurso: str, request, marca: dict) -> tuple[str, object]:
+    """(etag, last_modified) del listado en modo página, a partir del aggregate MARCA_LISTADO."""
+    return _etag(recurso, request.get_full_path(), marca["ultimo"], marca["total"]), marca["ultimo"]
+
+
+def marca_pagina(recurso: str, request, pagina, paginador) -> tuple[str, object]:
+    """(etag, last_modified) del listado por cursor o con ?total=estimado: sale de las filas de la página."""
+    filas = [(fila["id"], fila["actualizado_en"]) for fila in pagina]
+    ultimo = max((actualizado for _, actualizado in filas), default=None)
+    siguiente = getattr(getattr(paginador, "keyset", None), "siguiente", None)
+    return _etag(recurso, request.get_full_path(), filas, siguiente), ultimo
+
+
+class GetCondicional:
+    """
+    Mixin de ViewSet para retrieve/list con ETag y Last-Modified. Va antes de
+    core.cache_lecturas.DetalleCacheado en la MRO: toma el detalle de
+    datos_detalle() y las filas del listado de filas_listado(). estados_inmutables son los estados que ya no cambian.
+    Como se sirven con Cache-Control inmutable, el CRUD no los edita ni los elimina.
+    """
+
+    estados_inmutables: tuple = ()
+
+    def _validar_mutable(self, instancia):
+        if getattr(instancia, "estado", None) in self.estados_inmutables:
+            raise ValidationError({"estado": f"Un recurso en estado {instancia.estado} ya no se puede modificar."})
+
+    def perform_update(self, serializer):
+        self._validar_mutable(serializer.instance)
+        super().perform_update(serializer)
+
+    def perform_destroy(self, instance):
+        self._validar_mutable(instance)
+        super().perform_destroy(instance)
+
+    def retrieve(self, request, *args, **kwargs):
+        datos = self.datos_detalle()
+        etag, ultimo, cache_control = marca_detalle(self.recurso_cache, datos, self.estados_inmutables)
+        respuesta = no_modificada(request._request, etag, ultimo) or Response(datos)
+        return marcar(respuesta, etag, ultimo, cache_control)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        etag = ultimo = None
+        if self.paginator.cuenta_exacta(request):
+            marca = queryset.order_by().aggregate(**MARCA_LISTADO)
+            etag, ultimo = marca_listado(self.recurso_cache, request, marca)
+            if respuesta := no_modificada(request._request, etag, ultimo):
+                return marcar(respuesta, etag, ultimo, CACHE_REVALIDAR)
+            self.paginator.conteo_conocido = marca["total"]
+
+        pagina = self.filas_listado(queryset)
+
+        if etag is None:
+            etag, ultimo = marca_pagina(self.recurso_cache, request, pagina, self.paginator)
+            if respuesta := no_modificada(request._request, etag, ultimo):
+                return marcar(respuesta, etag, ultimo, CACHE_REVALIDAR)
+
+        respuesta = self.get_paginated_response(self.convertidor.convertir(pagina))
+        return marcar(respuesta, etag, ultimo, CACHE_REVALIDAR)
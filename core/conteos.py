@@ -0,0 +1,60 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+# Filtros de listado cuyo conteo exacto se cachea (el resto se cuenta siempre)
+FILTROS_CACHEABLES = {"estado", "cliente_id"}
+
+
+def estimar_filas(queryset) -> int | None:
+    """
+    Estimación del planner de Postgres: pg_class.reltuples si el queryset no
+    tiene filtros, o las filas estimadas por EXPLAIN en caso contrario.
+    Retorna None si no hay estimación disponible (tabla nunca analizada).
+    """
+    conexion = connections[queryset.db]
+    with conexion.cursor() as cur:
+        if not queryset.query.where:
+            cur.execute("SELECT reltuples FROM pg_class WHERE oid = %s::regclass", [queryset.model._meta.db_table])
+            fila = cur.fetchone()
+            if fila and fila[0] >= 0:
+                return int(fila[0])
+
+        sql, params = queryset.order_by().query.sql_with_params()
+        cur.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cur.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _clave_cache(queryset, filtros: dict) -> str:
+    crudo = json.dumps([queryset.model._meta.label, sorted(filtros.items())])
+    return "conteo:" + hashlib.sha256(crudo.encode()).hexdigest()
+
+
+def contar(queryset, filtros: dict) -> tuple[int, bool]:
+    """
+    Total de un listado: (total, exacto).
+
+    Si el planner estima al menos CONTEO_ESTIMADO_UMBRAL filas se devuelve la
+    estimación sin ejecutar COUNT(*). Por debajo se cuenta exacto y, cuando los
+    filtros aplicados son solo estado/cliente_id, el resultado se cachea
+    CONTEO_CACHE_TTL_SEGUNDOS.
+    """
+    estimado = estimar_filas(queryset)
+    if estimado is not None and estimado >= settings.CONTEO_ESTIMADO_UMBRAL:
+        return estimado, False
+
+    if not set(filtros) <= FILTROS_CACHEABLES:
+        return queryset.count(), True
+
+    clave = _clave_cache(queryset, filtros)
+    total = cache.get(clave)
+    if total is None:
+        total = queryset.count()
+        cache.set(clave, total, settings.CONTEO_CACHE_TTL_SEGUNDOS)
+    return total, True
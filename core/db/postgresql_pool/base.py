@@ -0,0 +1,86 @@
+"""
+Backend PostgreSQL (psycopg 3) con pool de conexiones de psycopg_pool.
+
+Django 4.2 abre y cierra una conexión por solicitud con CONN_MAX_AGE=0; con
+este backend "abrir" toma una conexión del pool y "cerrar" la devuelve. Se
+configura con DATABASES[...]["POOL"] (ver config/settings.py).
+"""
+import threading
+
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.creation import DatabaseCreation as CreacionPostgres
+from psycopg.pq import TransactionStatus
+from psycopg_pool import ConnectionPool
+
+_pools: dict[tuple, ConnectionPool] = {}
+_lock = threading.Lock()
+
+
+def _clave(settings_dict, alias) -> tuple:
+    return (alias, settings_dict["NAME"], settings_dict["HOST"], settings_dict["PORT"], settings_dict["USER"])
+
+
+def estadisticas_pools() -> dict[str, dict]:
+    """Estadísticas de cada pool abierto (tamaño, disponibles, esperas, errores...)."""
+    with _lock:
+        return {pool.name: pool.get_stats() for pool in _pools.values()}
+
+
+def cerrar_pools(nombre_bd: str | None = None) -> None:
+    with _lock:
+        for clave in [c for c in _pools if nombre_bd is None or c[1] == nombre_bd]:
+            _pools.pop(clave).close()
+
+
+class DatabaseCreation(CreacionPostgres):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Las conexiones ociosas del pool impedirían el DROP DATABASE
+        cerrar_pools(test_database_name)
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    def _obtener_pool(self, conn_params) -> ConnectionPool:
+        clave = _clave(self.settings_dict, self.alias)
+        with _lock:
+            pool = _pools.get(clave)
+            if pool is None:
+                opciones = self.settings_dict.get("POOL", {})
+                pool = ConnectionPool(
+                    kwargs=conn_params,
+                    min_size=opciones.get("min_size", 2),
+                    max_size=opciones.get("max_size", 10),
+                    max_idle=opciones.get("max_idle", 600),
+                    max_lifetime=opciones.get("max_lifetime", 3600),
+                    timeout=opciones.get("timeout", 10),
+                    check=ConnectionPool.check_connection if opciones.get("check", True) else None,
+                    name=f"{self.alias}:{self.settings_dict['NAME']}",
+                    open=True,
+                )
+                _pools[clave] = pool
+        return pool
+
+    def _usa_pool(self) -> bool:
+        # Las conexiones sin BD (creación de la BD de tests) y las que fijan
+        # isolation_level por conexión no pasan por el pool
+        return self.alias != NO_DB_ALIAS and "isolation_level" not in self.settings_dict["OPTIONS"]
+
+    def get_new_connection(self, conn_params):
+        if not self._usa_pool():
+            return super().get_new_connection(conn_params)
+        self.isolation_level = base.IsolationLevel.READ_COMMITTED
+        return self._obtener_pool(conn_params).getconn()
+
+    def _close(self):
+        if self.connection is None:
+            return
+        pool = _pools.get(_clave(self.settings_dict, self.alias)) if self._usa_pool() else None
+        if pool is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            if self.connection.info.transaction_status != TransactionStatus.IDLE:
+                self.connection.rollback()
+            pool.putconn(self.connection)
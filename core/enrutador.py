@@ -0,0 +1,50 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+PRIMARIA = "default"
+REPLICA = "replica"
+
+# True mientras el código en curso puede leer de la réplica (lo activa el middleware)
+_replica_permitida: ContextVar[bool] = ContextVar("replica_permitida", default=False)
+
+
+def alias_lectura() -> str:
+    """
+    Alias para una lectura en este momento: la réplica solo si está habilitada,
+    el contexto lo permite (solicitud de lectura sin ventana "read your writes")
+    y no hay una transacción abierta en la primaria.
+    """
+    if not settings.DB_REPLICA_HABILITADA or REPLICA not in settings.DATABASES:
+        return PRIMARIA
+    if not _replica_permitida.get() or connections[PRIMARIA].in_atomic_block:
+        return PRIMARIA
+    return REPLICA
+
+
+@contextmanager
+def lecturas_en_replica(permitir: bool = True):
+    """Permite (o prohíbe) leer de la réplica dentro del bloque; útil en reportes y comandos."""
+    token = _replica_permitida.set(permitir)
+    try:
+        yield
+    finally:
+        _replica_permitida.reset(token)
+
+
+class EnrutadorReplica:
+    """Escrituras y migraciones en la primaria; lecturas según alias_lectura()."""
+
+    def db_for_read(self, model, **hints):
+        return alias_lectura()
+
+    def db_for_write(self, model, **hints):
+        return PRIMARIA
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARIA
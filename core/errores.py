@@ -1,6 +1,13 @@
 from rest_framework.views import exception_handler
 from rest_framework.response import Response
 from rest_framework import status as http_status
+from rest_framework.exceptions import APIException
+
+
+class Conflicto(APIException):
+    status_code = http_status.HTTP_409_CONFLICT
+    default_detail = "La solicitud entra en conflicto con el estado actual del recurso."
+    default_code = "conflict"
 
 
 def manejador_excepciones(exc, context):
@@ -51,6 +58,16 @@ def manejador_excepciones(exc, context):
             status=resp.status_code,
         )
 
+    if resp.status_code == 409:
+        return Response(
+            {
+                "status": "error",
+                "code": "CONFLICT",
+                "message": data.get("detail", "Conflicto") if isinstance(data, dict) else "Conflicto",
+            },
+            status=resp.status_code,
+        )
+
     # fallback genérico
     return Response(
         {
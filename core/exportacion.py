@@ -0,0 +1,99 @@
+import csv
+import io
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import ValidationError
+
+from core.enrutador import alias_lectura
+
+FORMATOS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+# Filas que el cursor de servidor trae por viaje y filas por bloque escrito
+CHUNK_CURSOR = 2000
+FILAS_POR_BLOQUE = 1000
+
+_codificador = DjangoJSONEncoder()
+
+
+def _a_texto(valor) -> str:
+    if valor is None:
+        return ""
+    if isinstance(valor, (str, int)):
+        return str(valor)
+    # Decimal, date y datetime con el mismo formato que la salida JSON
+    return _codificador.default(valor)
+
+
+def _bloques(filas, tamano: int = FILAS_POR_BLOQUE):
+    bloque = []
+    for fila in filas:
+        bloque.append(fila)
+        if len(bloque) == tamano:
+            yield bloque
+            bloque = []
+    if bloque:
+        yield bloque
+
+
+def _csv(encabezados, filas):
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    escritor.writerow(encabezados)
+    for bloque in _bloques(filas):
+        escritor.writerows([_a_texto(v) for v in fila] for fila in bloque)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def _ndjson(encabezados, filas):
+    for bloque in _bloques(filas):
+        yield "".join(
+            json.dumps(dict(zip(encabezados, fila)), cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+            for fila in bloque
+        ).encode()
+
+
+def _gzip(bloques):
+    compresor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for bloque in bloques:
+        salida = compresor.compress(bloque)
+        if salida:
+            yield salida
+    yield compresor.flush()
+
+
+def respuesta_exportacion(queryset, campos, nombre: str, params) -> StreamingHttpResponse:
+    """
+    Exporta el queryset completo en streaming (CSV o NDJSON, opcionalmente gzip).
+
+    Lee con un cursor de servidor vía values_list().iterator() y escribe las
+    filas directamente, sin serializadores de DRF, así la memoria no depende
+    del tamaño de la exportación. campos: nombres como en la API; las FK se
+    exportan por id.
+    """
+    formato = params.get("formato", "csv")
+    if formato not in FORMATOS:
+        raise ValidationError({"formato": f"Formato no soportado. Opciones: {list(FORMATOS)}."})
+    comprimir = (params.get("gzip") or "").lower() in {"1", "true"}
+
+    columnas = [queryset.model._meta.get_field(c).attname for c in campos]
+    # El alias se fija ahora: el stream se consume después de salir del middleware
+    filas = queryset.using(alias_lectura()).values_list(*columnas).iterator(chunk_size=CHUNK_CURSOR)
+
+    contenido = _csv(campos, filas) if formato == "csv" else _ndjson(campos, filas)
+    archivo = f"{nombre}.{formato}"
+    if comprimir:
+        contenido = _gzip(contenido)
+        archivo += ".gz"
+
+    respuesta = StreamingHttpResponse(contenido, content_type="application/gzip" if comprimir else FORMATOS[formato])
+    respuesta["Content-Disposition"] = f'attachment; filename="{archivo}"'
+    return respuesta
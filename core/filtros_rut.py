@@ -0,0 +1,58 @@
+"""
+Filtros por RUT sobre las columnas enteras (Cliente.rut_numero,
+Factura.rut_deudor_numero): aceptan cualquier escritura del RUT y responden
+400 con el nombre del parámetro si no es válido.
+
+Mientras `manage.py poblar_rut_numero` no complete las filas anteriores al
+trigger, su número es NULL: esas filas se comparan con el número que calcula
+la función SQL rut_numero() sobre la columna de texto (la misma del trigger).
+El `IS NULL` se resuelve con el índice de la columna entera, así que después
+del backfill la rama de respaldo no lee ninguna fila.
+"""
+from django.db.models import F, Func, IntegerField, Q
+from django.db.models.lookups import Exact, GreaterThanOrEqual, LessThan
+from rest_framework.exceptions import ValidationError
+
+from core.rut import es_rut_valido, numero_rut, rangos_prefijo_rut
+
+
+def _numero_de_texto(campo_texto: str) -> Func:
+    return Func(F(campo_texto), function="rut_numero", output_field=IntegerField())
+
+
+def q_rut(campo_numero: str, campo_texto: str, numero: int) -> Q:
+    """Filas cuyo RUT tiene ese número, con respaldo sobre el texto si el número es NULL."""
+    sin_numero = Q(**{f"{campo_numero}__isnull": True}) & Q(Exact(_numero_de_texto(campo_texto), numero))
+    return Q(**{campo_numero: numero}) | sin_numero
+
+
+def q_rangos_rut(campo_numero: str, campo_texto: str, rangos: list[tuple[int, int]]) -> Q:
+    """Filas cuyo número de RUT cae en alguno de los rangos [desde, hasta), con el mismo respaldo."""
+    numero_texto = _numero_de_texto(campo_texto)
+    en_columna = Q()
+    en_texto = Q()
+    for desde, hasta in rangos:
+        en_columna |= Q(**{f"{campo_numero}__gte": desde, f"{campo_numero}__lt": hasta})
+        en_texto |= Q(GreaterThanOrEqual(numero_texto, desde)) & Q(LessThan(numero_texto, hasta))
+    return en_columna | (Q(**{f"{campo_numero}__isnull": True}) & en_texto)
+
+
+def rut_de_parametro(nombre: str, valor: str) -> int:
+    """"76.543.210-3", "76543210-3" o " 76543210-3" -> 76543210."""
+    if not es_rut_valido(valor):
+        raise ValidationError({nombre: "RUT inválido (formato o dígito verificador)."})
+    return numero_rut(valor)
+
+
+def filtro_rut(campo_numero: str, campo_texto: str, nombre: str, valor: str) -> Q:
+    """RUT igual a `valor` en cualquier escritura."""
+    return q_rut(campo_numero, campo_texto, rut_de_parametro(nombre, valor))
+
+
+def filtro_prefijo_rut(campo_numero: str, campo_texto: str, nombre: str, valor: str) -> Q:
+    """RUT que empiezan con los dígitos de `valor` ("76.5" o "765")."""
+    try:
+        rangos = rangos_prefijo_rut(valor)
+    except ValueError:
+        raise ValidationError({nombre: f"Formato inválido para {nombre}. Use los primeros dígitos del RUT."})
+    return q_rangos_rut(campo_numero, campo_texto, rangos)
@@ -0,0 +1,108 @@
+import functools
+import hashlib
+import json
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from core.errores import Conflicto
+from core.modelos import SolicitudIdempotente
+
+logger = logging.getLogger(__name__)
+
+CABECERA = "Idempotency-Key"
+CABECERA_REPETIDA = "Idempotent-Replayed"
+
+
+def _id_bloqueo(clave: str) -> int:
+    digest = hashlib.blake2b(clave.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def _huella(request) -> str:
+    cuerpo = json.dumps(request.data, sort_keys=True, default=str)
+    huella = hashlib.sha256(f"{request.method} {request.path}\n{cuerpo}".encode())
+    # En multipart request.data solo aporta el nombre del archivo; el contenido
+    # también tiene que distinguir una solicitud de otra.
+    for campo, archivo in sorted(request.FILES.items()):
+        huella.update(f"\n{campo}:".encode())
+        for trozo in archivo.chunks():
+            huella.update(trozo)
+        archivo.seek(0)
+    return huella.hexdigest()
+
+
+class _bloqueo_clave:
+    """
+    Advisory lock de sesión por clave: solicitudes concurrentes con la misma
+    clave esperan a que termine la primera en vez de ejecutarse dos veces.
+    """
+
+    def __init__(self, clave: str):
+        self.id = _id_bloqueo(clave)
+
+    def __enter__(self):
+        with connection.cursor() as cur:
+            cur.execute("SELECT pg_advisory_lock(%s)", [self.id])
+
+    def __exit__(self, *exc):
+        with connection.cursor() as cur:
+            cur.execute("SELECT pg_advisory_unlock(%s)", [self.id])
+
+
+def idempotente(metodo):
+    """
+    Decorador para acciones POST de un ViewSet. Si la solicitud trae
+    ``Idempotency-Key``, la primera respuesta (< 500) se almacena y las
+    repeticiones la reciben tal cual sin volver a ejecutar la acción.
+    """
+
+    @functools.wraps(metodo)
+    def envoltura(self, request, *args, **kwargs):
+        clave = request.headers.get(CABECERA)
+        if not clave:
+            return metodo(self, request, *args, **kwargs)
+        if len(clave) > 255:
+            raise ValidationError({CABECERA: "No puede superar 255 caracteres."})
+
+        huella = _huella(request)
+        with _bloqueo_clave(clave):
+            previa = (
+                SolicitudIdempotente.objects.filter(clave=clave, expira_en__gt=timezone.now())
+                .only("huella", "status_code", "respuesta")
+                .first()
+            )
+            if previa is not None:
+                if previa.huella != huella:
+                    raise Conflicto(f"{CABECERA} ya fue usada con una solicitud distinta.")
+                return Response(
+                    previa.respuesta,
+                    status=previa.status_code,
+                    headers={CABECERA_REPETIDA: "true"},
+                )
+
+            try:
+                response = metodo(self, request, *args, **kwargs)
+            except Exception as exc:
+                response = self.handle_exception(exc)
+
+            if response.status_code < 500:
+                SolicitudIdempotente.objects.update_or_create(
+                    clave=clave,
+                    defaults={
+                        "metodo": request.method,
+                        "ruta": request.path[:255],
+                        "huella": huella,
+                        "status_code": response.status_code,
+                        "respuesta": response.data,
+                        "expira_en": timezone.now() + timedelta(hours=settings.IDEMPOTENCIA_TTL_HORAS),
+                    },
+                )
+            return response
+
+    return envoltura
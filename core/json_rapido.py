@@ -0,0 +1,113 @@
+"""
+Renderer y parser JSON de DRF sobre orjson.
+
+Producen los mismos bytes y los mismos datos que JSONRenderer/JSONParser de
+DRF con la configuración por defecto (UNICODE_JSON, COMPACT_JSON y
+STRICT_JSON en True):
+
+- Decimal, fechas, horas, timedelta, lazy strings, QuerySets, etc. se
+  convierten con el mismo JSONEncoder de DRF (orjson recibe los datetime sin
+  formatear gracias a OPT_PASSTHROUGH_DATETIME). Un Decimal crudo sale con el
+  repr de float de la stdlib, no con el de orjson.
+- UUID y str salen iguales de forma nativa; U+2028/U+2029 se escapan igual
+  que en DRF.
+- Todo lo que orjson no acepta o no lee igual (claves no str, enteros de más
+  de 64 bits, ?indent=..., otra configuración de DRF, otra codificación en el
+  request, JSON inválido) se delega a la implementación de DRF, con su salida
+  y sus mensajes de error.
+
+Única diferencia conocida: un float NaN/Infinity nativo (no Decimal) se
+renderiza como null en vez de fallar. Los floats de la stdlib y de orjson se
+escriben igual salvo exponentes chicos (1e-05 vs 0.00001), con el mismo valor.
+"""
+import datetime
+import io
+import json
+import math
+from decimal import Decimal
+
+import orjson
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_OPCIONES = orjson.OPT_PASSTHROUGH_DATETIME
+_CODIFICACIONES_UTF8 = {"utf-8", "utf8"}
+# orjson lee los enteros de más de 64 bits como float; json los deja exactos.
+# Dígitos -> "1" y el resto -> "0": 19 unos seguidos marcan un entero largo
+# (más barato que una regex sobre todo el cuerpo).
+_DIGITOS = bytes(0x31 if 0x30 <= c <= 0x39 else 0x30 for c in range(256))
+_ENTERO_LARGO = b"1" * 19
+
+
+class _Codificador(JSONEncoder):
+    def default(self, obj):
+        valor = super().default(obj)
+        if isinstance(valor, float):
+            # Un Decimal crudo: mismo texto que json.dumps(float(obj))
+            return orjson.Fragment(json.dumps(valor, allow_nan=False))
+        return valor
+
+
+_default_drf = _Codificador().default
+
+
+def _default(obj):
+    # Atajos para los tipos más comunes, con la misma salida que el JSONEncoder de DRF
+    tipo = type(obj)
+    if tipo is Decimal:
+        valor = float(obj)
+        if math.isfinite(valor):
+            return orjson.Fragment(float.__repr__(valor))
+    elif tipo is datetime.datetime:
+        texto = obj.isoformat()
+        return texto[:-6] + "Z" if texto.endswith("+00:00") else texto
+    elif tipo is datetime.date:
+        return obj.isoformat()
+    return _default_drf(obj)
+
+
+class RenderizadorJSON(JSONRenderer):
+    """JSONRenderer de DRF sobre orjson (misma salida, byte a byte)."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        if (
+            self.ensure_ascii
+            or not self.compact
+            or not self.strict
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            contenido = orjson.dumps(data, default=_default, option=_OPCIONES)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if b"\xe2\x80\xa8" in contenido or b"\xe2\x80\xa9" in contenido:
+            contenido = contenido.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return contenido
+
+
+class ParserJSON(JSONParser):
+    """JSONParser de DRF sobre orjson; los cuerpos que orjson rechaza pasan por el de DRF."""
+
+    renderer_class = RenderizadorJSON
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        codificacion = parser_context.get("encoding") or "utf-8"
+        if not self.strict or codificacion.lower() not in _CODIFICACIONES_UTF8:
+            return super().parse(stream, media_type, parser_context)
+
+        contenido = stream.read()
+        if _ENTERO_LARGO not in contenido.translate(_DIGITOS):
+            try:
+                return orjson.loads(contenido)
+            except orjson.JSONDecodeError:
+                pass
+        # Mismo resultado o mismo ParseError que DRF
+        return super().parse(io.BytesIO(contenido), media_type, parser_context)
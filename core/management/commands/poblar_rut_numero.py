@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F, Func, IntegerField, Max
+
+from clientes.modelos import Cliente
+from facturas.modelos import Factura
+
+# (modelo, columna entera, columna con el RUT formateado)
+COLUMNAS = (
+    (Cliente, "rut_numero", "rut"),
+    (Factura, "rut_deudor_numero", "rut_deudor"),
+)
+
+
+class Command(BaseCommand):
+    help = "Completa Cliente.rut_numero y Factura.rut_deudor_numero en las filas anteriores al trigger"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lote", type=int, default=5000, help="Rango de ids actualizado por transacción")
+
+    def handle(self, *args, **options):
+        lote = options["lote"]
+
+        for modelo, columna, origen in COLUMNAS:
+            self.stdout.write(f"🔢 {modelo._meta.db_table}.{columna}...")
+            ultimo_id = modelo.objects.aggregate(m=Max("id"))["m"] or 0
+            total = 0
+
+            # Recorre la PK por rangos: cada lote cuesta lo mismo, sin importar
+            # cuántas filas queden por completar, y bloquea solo esas filas
+            for desde in range(1, ultimo_id + 1, lote):
+                total += modelo.objects.filter(
+                    id__gte=desde, id__lt=desde + lote, **{f"{columna}__isnull": True}
+                ).update(**{columna: Func(F(origen), function="rut_numero", output_field=IntegerField())})
+
+            self.stdout.write(f"  {total} filas completadas")
+
+        self.stdout.write(self.style.SUCCESS("✔ Números de RUT completos"))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.modelos import SolicitudIdempotente
+
+
+class Command(BaseCommand):
+    help = "Elimina las respuestas idempotentes expiradas"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lote", type=int, default=5000, help="Filas eliminadas por iteración")
+
+    def handle(self, *args, **options):
+        lote = options["lote"]
+        ahora = timezone.now()
+        total = 0
+
+        while True:
+            ids = list(
+                SolicitudIdempotente.objects.filter(expira_en__lte=ahora)
+                .order_by("expira_en")
+                .values_list("id", flat=True)[:lote]
+            )
+            if not ids:
+                break
+            eliminadas, _ = SolicitudIdempotente.objects.filter(id__in=ids).delete()
+            total += eliminadas
+
+        self.stdout.write(self.style.SUCCESS(f"✔ Respuestas idempotentes eliminadas: {total}"))
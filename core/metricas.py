@@ -0,0 +1,20 @@
+import threading
+from collections import Counter
+
+_contadores: Counter = Counter()
+_lock = threading.Lock()
+
+
+def incrementar(nombre: str, cantidad: int = 1) -> None:
+    with _lock:
+        _contadores[nombre] += cantidad
+
+
+def obtener(nombre: str) -> int:
+    with _lock:
+        return _contadores[nombre]
+
+
+def snapshot() -> dict[str, int]:
+    with _lock:
+        return dict(_contadores)
@@ -1,16 +1,89 @@
+import time
 import uuid
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from core.enrutador import lecturas_en_replica
 from core.request_context import request_id_ctx
 
-class RequestIdMiddleware:
+class _MiddlewareSyncAsync:
+    """
+    Base de los middlewares propios: sirven en WSGI y ASGI. Bajo ASGI corren
+    como corutina, sin que Django tenga que pasar la solicitud a un hilo.
+    """
+
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
 
-    def __call__(self, request):
+
+class RequestIdMiddleware(_MiddlewareSyncAsync):
+    def _iniciar(self, request) -> str:
         request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
 
         request.request_id = request_id
         request_id_ctx.set(request_id)
+        return request_id
 
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        request_id = self._iniciar(request)
         response = self.get_response(request)
         response["X-Request-ID"] = request_id
         return response
+
+    async def __acall__(self, request):
+        request_id = self._iniciar(request)
+        response = await self.get_response(request)
+        response["X-Request-ID"] = request_id
+        return response
+
+
+class ReplicaLecturaMiddleware(_MiddlewareSyncAsync):
+    """
+    Habilita la réplica para las solicitudes de lectura y aplica "read your
+    writes": tras una escritura exitosa el cliente recibe una cookie (y la
+    cabecera X-Leer-Primaria-Hasta, para clientes sin cookies) que lo mantiene
+    leyendo de la primaria durante REPLICA_STICKY_SEGUNDOS.
+    """
+
+    METODOS_LECTURA = {"GET", "HEAD", "OPTIONS"}
+    COOKIE = "leer_primaria_hasta"
+    CABECERA = "X-Leer-Primaria-Hasta"
+
+    def _fijada_a_primaria(self, request) -> bool:
+        valor = request.COOKIES.get(self.COOKIE) or request.headers.get(self.CABECERA)
+        try:
+            return float(valor) > time.time()
+        except (TypeError, ValueError):
+            return False
+
+    def _permite_replica(self, request) -> bool:
+        return request.method in self.METODOS_LECTURA and not self._fijada_a_primaria(request)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with lecturas_en_replica(self._permite_replica(request)):
+            response = self.get_response(request)
+        return self._fijar_primaria(request, response)
+
+    async def __acall__(self, request):
+        with lecturas_en_replica(self._permite_replica(request)):
+            response = await self.get_response(request)
+        return self._fijar_primaria(request, response)
+
+    def _fijar_primaria(self, request, response):
+        if request.method not in self.METODOS_LECTURA and response.status_code < 400:
+            hasta = f"{time.time() + settings.REPLICA_STICKY_SEGUNDOS:.3f}"
+            response.set_cookie(
+                self.COOKIE, hasta, max_age=settings.REPLICA_STICKY_SEGUNDOS, httponly=True, samesite="Lax"
+            )
+            response[self.CABECERA] = hasta
+        return response
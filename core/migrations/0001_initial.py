@@ -0,0 +1,32 @@
+# Generated by Django 4.2.28 on 2026-10-17 10:37
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SolicitudIdempotente',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('clave', models.CharField(max_length=255, unique=True)),
+                ('metodo', models.CharField(max_length=10)),
+                ('ruta', models.CharField(max_length=255)),
+                ('huella', models.CharField(max_length=64)),
+                ('status_code', models.PositiveSmallIntegerField()),
+                ('respuesta', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True)),
+                ('creado_en', models.DateTimeField(auto_now_add=True)),
+                ('expira_en', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['expira_en'], name='core_solici_expira__027821_idx')],
+            },
+        ),
+    ]
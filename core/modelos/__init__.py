@@ -0,0 +1 @@
+from .idempotencia import SolicitudIdempotente
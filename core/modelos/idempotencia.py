@@ -0,0 +1,25 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class SolicitudIdempotente(models.Model):
+    """Respuesta almacenada para una solicitud con cabecera Idempotency-Key."""
+
+    clave = models.CharField(max_length=255, unique=True)
+    metodo = models.CharField(max_length=10)
+    ruta = models.CharField(max_length=255)
+    huella = models.CharField(max_length=64)
+
+    status_code = models.PositiveSmallIntegerField()
+    respuesta = models.JSONField(encoder=DjangoJSONEncoder, null=True, blank=True)
+
+    creado_en = models.DateTimeField(auto_now_add=True)
+    expira_en = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["expira_en"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.metodo} {self.ruta} ({self.clave})"
@@ -0,0 +1,314 @@
+import base64
+import json
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ImproperlyConfigured
+from django.core.paginator import InvalidPage, Page, Paginator
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+from core.conteos import contar
+
+_VERDADEROS = {"1", "true", "si", "sí"}
+TOTAL_ESTIMADO = "estimado"
+
+# Parámetros de paginación que no forman parte de los filtros del listado
+_PARAMS_PAGINACION = {"page", "cursor", "limite", "paginacion", "total", "format"}
+
+
+def _es_verdadero(valor) -> bool:
+    return (valor or "").strip().lower() in _VERDADEROS
+
+
+def _contar_estimado(queryset, request) -> tuple[int, bool]:
+    filtros = {k: v for k, v in request.query_params.items() if k not in _PARAMS_PAGINACION}
+    return contar(queryset, filtros)
+
+
+class _PaginadorConConteo(Paginator):
+    """Paginator de Django con el total exacto ya calculado."""
+
+    def __init__(self, object_list, per_page, *, conteo, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count = conteo
+
+
+class _PaginaSinConteo(Page):
+    """
+    Página leída con tamaño + 1 filas: la fila extra decide si hay siguiente.
+    paginator.count solo informa el total estimado; no se usa para navegar.
+    """
+
+    def __init__(self, object_list, number, paginator, *, hay_siguiente: bool):
+        super().__init__(object_list, number, paginator)
+        self.hay_siguiente = hay_siguiente
+
+    def has_next(self):
+        return self.hay_siguiente
+
+    def next_page_number(self):
+        return self.number + 1
+
+    def previous_page_number(self):
+        return self.number - 1
+
+
+class PaginacionKeyset(BasePagination):
+    """
+    Paginación por cursor sobre el orden del queryset, que debe ser
+    (campo, id) en la misma dirección, p.ej. ("-creado_en", "-id").
+
+    Cada página se obtiene con un WHERE (campo, id) < / > cursor y LIMIT, sin
+    OFFSET ni COUNT. Los cursores next/previous son opacos. El total solo se
+    calcula si el cliente lo pide: ?total=true (exacto) o ?total=estimado.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "limite"
+    total_query_param = "total"
+    page_size = api_settings.PAGE_SIZE
+    max_page_size = 500
+
+    # -- cursor -------------------------------------------------------------
+
+    def _codificar(self, fila, reverso: bool) -> str:
+        # La fila puede ser una instancia o un dict de .values() (core.serializacion_rapida)
+        if isinstance(fila, dict):
+            valor, pk = fila[self.campo], fila["id"]
+        else:
+            valor, pk = getattr(fila, self.campo), fila.pk
+        if hasattr(valor, "isoformat"):
+            valor = valor.isoformat()
+        crudo = json.dumps({"v": valor, "i": pk, "r": reverso})
+        return base64.urlsafe_b64encode(crudo.encode()).decode().rstrip("=")
+
+    def _decodificar(self, cursor: str, modelo):
+        try:
+            datos = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            valor = modelo._meta.get_field(self.campo).to_python(datos["v"])
+            return valor, int(datos["i"]), bool(datos["r"])
+        except (ValueError, TypeError, KeyError, AttributeError) as exc:
+            raise ValidationError({self.cursor_query_param: "Cursor inválido."}) from exc
+
+    # -- orden --------------------------------------------------------------
+
+    def _leer_orden(self, queryset):
+        orden = list(queryset.query.order_by)
+        if len(orden) != 2 or orden[1].lstrip("-") != "id" or orden[0].startswith("-") != orden[1].startswith("-"):
+            raise ImproperlyConfigured(
+                f"PaginacionKeyset requiere ordenar por (campo, id) en la misma dirección; recibido {orden}."
+            )
+        self.descendente = orden[0].startswith("-")
+        self.campo = orden[0].lstrip("-")
+
+    def _despues_de(self, valor, pk, hacia_adelante: bool) -> Q:
+        # Hacia adelante en orden descendente significa "menor que"
+        op = "lt" if self.descendente == hacia_adelante else "gt"
+        return Q(**{f"{self.campo}__{op}": valor}) | Q(**{self.campo: valor, f"pk__{op}": pk})
+
+    # -- API de DRF ---------------------------------------------------------
+
+    def get_page_size(self, request) -> int:
+        valor = request.query_params.get(self.page_size_query_param)
+        if valor is None:
+            return self.page_size
+        try:
+            limite = int(valor)
+        except ValueError:
+            limite = 0
+        if not 1 <= limite <= self.max_page_size:
+            raise ValidationError(
+                {self.page_size_query_param: f"Debe ser un entero entre 1 y {self.max_page_size}."}
+            )
+        return limite
+
+    def _preparar(self, queryset, request):
+        """Valida los parámetros y retorna la consulta de la página (limite + 1 filas)."""
+        self.request = request
+        self._leer_orden(queryset)
+        self.limite = self.get_page_size(request)
+
+        self.cursor = request.query_params.get(self.cursor_query_param)
+        self.reverso = False
+        if self.cursor:
+            valor, pk, self.reverso = self._decodificar(self.cursor, queryset.model)
+            queryset = queryset.filter(self._despues_de(valor, pk, hacia_adelante=not self.reverso))
+        if self.reverso:
+            queryset = queryset.reverse()
+        return queryset[: self.limite + 1]
+
+    def _armar_pagina(self, filas):
+        hay_mas = len(filas) > self.limite
+        filas = filas[: self.limite]
+        if self.reverso:
+            filas.reverse()
+
+        self.siguiente = self.anterior = None
+        if filas:
+            if hay_mas or self.reverso:
+                self.siguiente = self._codificar(filas[-1], reverso=False)
+            if (hay_mas and self.reverso) or (self.cursor and not self.reverso):
+                self.anterior = self._codificar(filas[0], reverso=True)
+        return filas
+
+    def paginate_queryset(self, queryset, request, view=None):
+        pagina = self._preparar(queryset, request)
+
+        self.total = self.total_exacto = None
+        modo_total = request.query_params.get(self.total_query_param)
+        if modo_total == TOTAL_ESTIMADO:
+            self.total, self.total_exacto = _contar_estimado(queryset, request)
+        elif _es_verdadero(modo_total):
+            self.total = queryset.count()
+
+        return self._armar_pagina(list(pagina))
+
+    async def apaginate_queryset(self, queryset, request):
+        """Igual que paginate_queryset, con el ORM async (vistas de core.asincrono)."""
+        pagina = self._preparar(queryset, request)
+
+        self.total = self.total_exacto = None
+        modo_total = request.query_params.get(self.total_query_param)
+        if modo_total == TOTAL_ESTIMADO:
+            self.total, self.total_exacto = await sync_to_async(_contar_estimado)(queryset, request)
+        elif _es_verdadero(modo_total):
+            self.total = await queryset.acount()
+
+        return self._armar_pagina([fila async for fila in pagina])
+
+    def _enlace(self, cursor):
+        if cursor is None:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        cuerpo = {"next": self._enlace(self.siguiente), "previous": self._enlace(self.anterior)}
+        if self.total is not None:
+            cuerpo["count"] = self.total
+        if self.total_exacto is not None:
+            cuerpo["count_exacto"] = self.total_exacto
+        cuerpo["results"] = data
+        return Response(cuerpo)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "count": {"type": "integer", "description": "Solo con ?total=true o ?total=estimado"},
+                "count_exacto": {"type": "boolean", "description": "Solo con ?total=estimado"},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class PaginacionCursorOpcional(PageNumberPagination):
+    """
+    Paginación por número de página (comportamiento por defecto) que cambia a
+    PaginacionKeyset cuando la solicitud trae ?paginacion=cursor o ?cursor=...
+
+    Con ?total=estimado el count informado sale de core.conteos.contar y la
+    respuesta agrega count_exacto. La estimación no sirve para navegar (puede
+    quedar corta o larga), así que en ese caso la página se lee con OFFSET y
+    tamaño + 1 filas, y next depende de la fila extra y no del total.
+    """
+
+    modo_query_param = "paginacion"
+    # Total ya calculado por la vista (p.ej. core.condicional) para no repetir el COUNT
+    conteo_conocido: int | None = None
+
+    def _usa_cursor(self, request) -> bool:
+        return (
+            request.query_params.get(self.modo_query_param) == "cursor"
+            or PaginacionKeyset.cursor_query_param in request.query_params
+        )
+
+    def cuenta_exacta(self, request) -> bool:
+        """True si la página se arma sobre el COUNT exacto del queryset (modo página sin ?total=estimado)."""
+        return not self._usa_cursor(request) and (
+            request.query_params.get(PaginacionKeyset.total_query_param) != TOTAL_ESTIMADO
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = PaginacionKeyset() if self._usa_cursor(request) else None
+        if self.keyset is not None:
+            return self.keyset.paginate_queryset(queryset, request, view)
+
+        self.total_exacto = None
+        if request.query_params.get(PaginacionKeyset.total_query_param) == TOTAL_ESTIMADO:
+            conteo, self.total_exacto = _contar_estimado(queryset, request)
+            numero, rebanada = self._rebanada_sin_conteo(queryset, request)
+            return self._armar_pagina_sin_conteo(queryset, list(rebanada), numero, conteo)
+        if self.conteo_conocido is not None:
+            self.django_paginator_class = partial(_PaginadorConConteo, conteo=self.conteo_conocido)
+        return super().paginate_queryset(queryset, request, view)
+
+    def _rebanada_sin_conteo(self, queryset, request):
+        """Valida ?page y retorna (numero, consulta de tamaño + 1 filas desde su OFFSET)."""
+        self.request = request
+        crudo = request.query_params.get(self.page_query_param) or 1
+        try:
+            numero = int(crudo)
+        except (TypeError, ValueError):
+            numero = 0
+        if numero < 1:
+            raise NotFound(
+                self.invalid_page_message.format(page_number=crudo, message="Número de página inválido.")
+            )
+        tamano = self.get_page_size(request)
+        inicio = (numero - 1) * tamano
+        return numero, queryset[inicio : inicio + tamano + 1]
+
+    def _armar_pagina_sin_conteo(self, queryset, filas, numero: int, conteo: int):
+        if not filas and numero > 1:
+            raise NotFound(
+                self.invalid_page_message.format(page_number=numero, message="La página no tiene resultados.")
+            )
+        tamano = self.get_page_size(self.request)
+        paginador = _PaginadorConConteo(queryset, tamano, conteo=conteo)
+        self.page = _PaginaSinConteo(filas[:tamano], numero, paginador, hay_siguiente=len(filas) > tamano)
+        # Los controles HTML del browsable API navegan por num_pages, que aquí es estimado
+        self.display_page_controls = False
+        return list(self.page)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        respuesta = super().get_paginated_response(data)
+        if self.total_exacto is not None:
+            respuesta.data["count_exacto"] = self.total_exacto
+        return respuesta
+
+    async def apaginate_queryset(self, queryset, request):
+        """
+        Versión async de paginate_queryset. El total es conteo_conocido o sale de
+        acount(), y la página se arma sobre ese total sin un segundo COUNT; con ?total=estimado
+        se lee tamaño + 1 filas como en la versión sync.
+        """
+        self.keyset = PaginacionKeyset() if self._usa_cursor(request) else None
+        if self.keyset is not None:
+            return await self.keyset.apaginate_queryset(queryset, request)
+
+        self.request = request
+        self.total_exacto = None
+        if request.query_params.get(PaginacionKeyset.total_query_param) == TOTAL_ESTIMADO:
+            conteo, self.total_exacto = await sync_to_async(_contar_estimado)(queryset, request)
+            numero, rebanada = self._rebanada_sin_conteo(queryset, request)
+            return self._armar_pagina_sin_conteo(queryset, [fila async for fila in rebanada], numero, conteo)
+
+        conteo = self.conteo_conocido if self.conteo_conocido is not None else await queryset.acount()
+
+        paginador = _PaginadorConConteo(queryset, self.get_page_size(request), conteo=conteo)
+        numero = self.get_page_number(request, paginador)
+        try:
+            self.page = paginador.page(numero)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=numero, message=str(exc)))
+        return [fila async for fila in self.page.object_list]
@@ -0,0 +1,61 @@
+import functools
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.db import OperationalError, transaction
+
+from core import metricas
+
+logger = logging.getLogger(__name__)
+
+# SQLSTATE reintentables: deadlock_detected, serialization_failure
+SQLSTATES_REINTENTABLES = {
+    "40P01": "deadlock",
+    "40001": "serializacion",
+}
+
+
+def _sqlstate(exc: Exception) -> str | None:
+    causa = exc.__cause__
+    return getattr(causa, "sqlstate", None) or getattr(causa, "pgcode", None)
+
+
+def con_reintentos(func=None, *, intentos: int | None = None):
+    """
+    Reintenta la función ante deadlocks y fallas de serialización de Postgres,
+    con backoff exponencial acotado y jitter completo.
+
+    Debe envolver a ``transaction.atomic`` (no al revés): si ya hay una
+    transacción abierta al llamar, no se puede reintentar y el error se propaga.
+    """
+    if func is None:
+        return functools.partial(con_reintentos, intentos=intentos)
+
+    @functools.wraps(func)
+    def envoltura(*args, **kwargs):
+        if transaction.get_connection().in_atomic_block:
+            return func(*args, **kwargs)
+
+        max_intentos = intentos or settings.DB_REINTENTOS_MAX
+        base = settings.DB_REINTENTOS_BASE_MS / 1000
+        tope = settings.DB_REINTENTOS_TOPE_MS / 1000
+
+        for intento in range(1, max_intentos + 1):
+            try:
+                return func(*args, **kwargs)
+            except OperationalError as exc:
+                tipo = SQLSTATES_REINTENTABLES.get(_sqlstate(exc))
+                if tipo is None or intento == max_intentos:
+                    raise
+                metricas.incrementar("db.reintentos")
+                metricas.incrementar(f"db.reintentos.{tipo}")
+                espera = random.uniform(0, min(tope, base * 2 ** (intento - 1)))
+                logger.warning(
+                    "Reintentando %s tras %s (intento %s/%s, espera %.3fs)",
+                    func.__name__, tipo, intento, max_intentos, espera,
+                )
+                time.sleep(espera)
+
+    return envoltura
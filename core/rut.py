@@ -43,3 +43,53 @@ def es_rut_valido(rut: str) -> bool:
     sin_puntos = formateado.replace(".", "")
     numero, dv = sin_puntos.split("-")
     return _dv_rut(numero) == dv.upper()
+
+
+def numero_rut(rut: str) -> int:
+    """
+    Número del RUT sin dígito verificador, para las columnas enteras
+    (Cliente.rut_numero, Factura.rut_deudor_numero): 12345678 tanto para
+    "12.345.678-5" como para "12345678-5". ValueError si el formato es inválido.
+    """
+    return int(normalizar_rut(rut).split("-")[0].replace(".", ""))
+
+
+# Los RUT tienen a lo más 8 dígitos (sin el verificador)
+_DIGITOS_RUT = 8
+
+
+def rangos_prefijo_rut(prefijo: str) -> list[tuple[int, int]]:
+    """
+    Rangos [desde, hasta) de los números de RUT cuyos dígitos empiezan con
+    `prefijo` ("12.34" o "1234"), uno por cada largo posible: cada rango es un
+    recorrido del índice sobre la columna entera. ValueError si no son dígitos.
+    """
+    digitos = prefijo.strip().replace(".", "")
+    if not digitos.isdigit() or len(digitos) > _DIGITOS_RUT:
+        raise ValueError("Prefijo de RUT inválido")
+    if digitos.startswith("0"):
+        # Ningún número de RUT empieza con 0 ("09.876.543-3" es 9876543)
+        digitos = digitos.lstrip("0")
+        if not digitos:
+            return [(1, 10**_DIGITOS_RUT)]
+    base = int(digitos)
+    return [(base * 10**k, (base + 1) * 10**k) for k in range(_DIGITOS_RUT - len(digitos) + 1)]
+
+
+_RUT_BUSQUEDA_RE = re.compile(r"^(\d{1,2}\.?\d{3}\.?\d{3})-?([\dkK])$")
+
+
+def rut_de_busqueda(texto: str) -> str | None:
+    """
+    Si el texto tiene forma de RUT (con puntos y/o guion: 12.345.678-5,
+    12345678-5, 12.345.6785) lo retorna normalizado; si no, None. No valida el
+    dígito verificador: la búsqueda es por igualdad y un RUT inválido no encuentra nada.
+    """
+    texto = texto.strip().replace(" ", "")
+    if "-" not in texto and "." not in texto:
+        # Solo dígitos puede ser un número de factura
+        return None
+    m = _RUT_BUSQUEDA_RE.match(texto)
+    if not m:
+        return None
+    return normalizar_rut(f"{m.group(1).replace('.', '')}-{m.group(2)}")
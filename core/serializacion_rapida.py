@@ -0,0 +1,172 @@
+"""
+Serialización rápida de lecturas (listado y detalle) a partir de .values().
+
+Un ModelSerializer arma cada respuesta instancia por instancia: crea el
+modelo, recorre sus campos, llama get_attribute y to_representation por
+campo. Para las lecturas eso es casi todo el costo del request. Aquí el
+serializador se "compila" una vez por clase en un Convertidor: la lista de
+columnas a pedir con .values() y una función generada que arma el dict de
+cada fila con, por campo, la conversión que produce el mismo valor que el
+campo de DRF. El JSON resultante es idéntico byte a byte
+(lo verifica clientes/tests/test_serializacion_rapida.py).
+
+Los campos sin equivalente directo (cualquier tipo no listado en _elegir o
+con opciones de formato) se convierten con el to_representation del propio
+campo: más lento, pero con la misma salida. Los campos write_only no se leen.
+Las escrituras siguen pasando por el serializador de DRF.
+"""
+from datetime import date
+from functools import cache, partial
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import models
+from django.utils import timezone
+from rest_framework import fields as drf
+from rest_framework.generics import get_object_or_404
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.settings import ISO_8601
+
+
+def _decimal(valor, *, campo, decimales: int):
+    # Las columnas numeric(x, decimales) ya vienen con esa escala: no hace falta quantize
+    if valor.as_tuple().exponent == -decimales:
+        return f"{valor:f}"
+    return campo.to_representation(valor)
+
+
+def _fecha_hora(valor, *, zona):
+    texto = valor.astimezone(zona).isoformat()
+    return texto[:-6] + "Z" if texto.endswith("+00:00") else texto
+
+
+# Marcadores de _elegir: el valor de la BD ya es la representación, o es un
+# datetime que se formatea en la zona horaria del request
+_IDENTIDAD = object()
+_FECHA_HORA = object()
+
+
+def _elegir(campo: drf.Field, campo_modelo):
+    """Conversión del campo de DRF para el valor que entrega la columna del modelo."""
+    tipo = type(campo)
+    if tipo is drf.IntegerField:
+        return _IDENTIDAD if isinstance(campo_modelo, models.IntegerField) else int
+    if tipo in (drf.CharField, drf.EmailField, drf.SlugField, drf.URLField):
+        return _IDENTIDAD if isinstance(campo_modelo, (models.CharField, models.TextField)) else str
+    if tipo is drf.ChoiceField:
+        mapa = campo.choice_strings_to_values
+        if isinstance(campo_modelo, models.CharField) and all(clave == valor for clave, valor in mapa.items()):
+            return _IDENTIDAD
+        return lambda valor: mapa.get(str(valor), valor)
+    if tipo is PrimaryKeyRelatedField and campo.pk_field is None:
+        return _IDENTIDAD
+    if tipo is drf.DateField and getattr(campo, "format", drf.api_settings.DATE_FORMAT).lower() == ISO_8601:
+        return date.isoformat
+    if (
+        tipo is drf.DecimalField
+        and campo.decimal_places is not None
+        and getattr(campo, "coerce_to_string", drf.api_settings.COERCE_DECIMAL_TO_STRING)
+        and not campo.localize
+        and not campo.normalize_output
+    ):
+        return partial(_decimal, campo=campo, decimales=campo.decimal_places)
+    if (
+        tipo is drf.DateTimeField
+        and getattr(campo, "format", drf.api_settings.DATETIME_FORMAT).lower() == ISO_8601
+        and not hasattr(campo, "timezone")
+        and settings.USE_TZ
+    ):
+        return _FECHA_HORA
+    return campo.to_representation
+
+
+class Convertidor:
+    """
+    Conversión precompilada de filas de .values() al dict de un ModelSerializer.
+
+    Genera (una vez por serializador) una función con un literal de dict por
+    fila: las columnas que ya vienen en su representación final se copian sin
+    llamadas, y el chequeo de None solo se emite para columnas nulables.
+    """
+
+    def __init__(self, clase_serializador):
+        serializador = clase_serializador()
+        modelo = serializador.Meta.model
+        nombre_clase = clase_serializador.__name__
+
+        entradas, funciones, columnas = [], {}, []
+        for i, campo in enumerate(serializador._readable_fields):
+            if len(campo.source_attrs) != 1:
+                raise ImproperlyConfigured(f"{nombre_clase}.{campo.field_name}: source anidado no soportado.")
+            try:
+                campo_modelo = modelo._meta.get_field(campo.source_attrs[0])
+            except FieldDoesNotExist as exc:
+                raise ImproperlyConfigured(f"{nombre_clase}.{campo.field_name}: no es una columna del modelo.") from exc
+            if not getattr(campo_modelo, "concrete", False) or campo_modelo.many_to_many:
+                raise ImproperlyConfigured(f"{nombre_clase}.{campo.field_name}: no es una columna del modelo.")
+
+            columnas.append(campo_modelo.attname)
+            valor = f"fila[{campo_modelo.attname!r}]"
+            conversion = _elegir(campo, campo_modelo)
+            if conversion is _IDENTIDAD:
+                expresion = valor
+            else:
+                funcion = "fecha_hora" if conversion is _FECHA_HORA else f"f{i}"
+                funciones[funcion] = conversion
+                if campo_modelo.null:
+                    expresion = f"None if (v := {valor}) is None else {funcion}(v)"
+                else:
+                    expresion = f"{funcion}({valor})"
+            entradas.append(f"{campo.field_name!r}: {expresion}")
+
+        funciones.pop("fecha_hora", None)
+        codigo = f"def convertir(filas, fecha_hora):\n    return [{{{', '.join(entradas)}}} for fila in filas]\n"
+        espacio = dict(funciones)
+        exec(compile(codigo, f"<convertidor {nombre_clase}>", "exec"), espacio)
+
+        self.nombre = nombre_clase
+        self.codigo = codigo
+        self.columnas = tuple(dict.fromkeys(columnas))
+        self._convertir = espacio["convertir"]
+
+    def convertir(self, filas) -> list[dict]:
+        # La zona se resuelve por llamada, como hace DateTimeField.enforce_timezone
+        return self._convertir(filas, partial(_fecha_hora, zona=timezone.get_current_timezone()))
+
+    def uno(self, fila) -> dict:
+        return self.convertir([fila])[0]
+
+
+@cache
+def convertidor(clase_serializador) -> Convertidor:
+    return Convertidor(clase_serializador)
+
+
+def valores(queryset, conv: Convertidor):
+    """queryset.values() con las columnas del convertidor y las del ORDER BY (las usa la paginación por cursor)."""
+    orden = [campo.lstrip("-") for campo in queryset.query.order_by if isinstance(campo, str)]
+    return queryset.values(*conv.columnas, *(c for c in orden if c not in conv.columnas and c != "pk"))
+
+
+class LecturaRapida:
+    """
+    Mixin de ViewSet: listado y detalle leídos con .values() y convertidos con
+    el Convertidor del serializer_class. Las acciones de escritura no cambian.
+    """
+
+    @property
+    def convertidor(self) -> Convertidor:
+        return convertidor(self.get_serializer_class())
+
+    def leer_detalle(self) -> dict:
+        """Equivalente a get_serializer(get_object()).data (404 igual que get_object)."""
+        conv = self.convertidor
+        queryset = valores(self.filter_queryset(self.get_queryset()), conv)
+        lookup = self.lookup_url_kwarg or self.lookup_field
+        fila = get_object_or_404(queryset, **{self.lookup_field: self.kwargs[lookup]})
+        return conv.uno(fila)
+
+    def filas_listado(self, queryset) -> list[dict]:
+        """Filas de .values() de la página (o de todo el queryset si no hay paginación), sin convertir."""
+        filas = self.paginate_queryset(valores(queryset, self.convertidor))
+        return list(valores(queryset, self.convertidor)) if filas is None else filas
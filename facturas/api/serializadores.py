@@ -2,7 +2,7 @@ from decimal import Decimal
 
 from rest_framework import serializers
 
-from core.rut import es_rut_valido, normalizar_rut
+from core.rut import es_rut_valido, normalizar_rut, numero_rut
 from facturas.modelos import Factura, EstadoFactura
 from decimal import Decimal
 from rest_framework import serializers
@@ -55,7 +55,7 @@ class SerializadorFactura(serializers.ModelSerializer):
         cliente = attrs.get("cliente") or (self.instance.cliente if self.instance else None)
         rut_deudor = attrs.get("rut_deudor") or (self.instance.rut_deudor if self.instance else None)
 
-        if cliente and rut_deudor and normalizar_rut(cliente.rut) == normalizar_rut(rut_deudor):
+        if cliente and rut_deudor and numero_rut(cliente.rut) == numero_rut(rut_deudor):
             raise serializers.ValidationError({"rut_deudor": "Debe ser diferente al RUT del cliente."})
 
         # No permitir crear/editar facturas en estado final a través del CRUD (solo vía acciones)
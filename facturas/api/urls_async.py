@@ -0,0 +1,8 @@
+from django.urls import path
+
+from facturas.api import vistas_async
+
+urlpatterns = [
+    path("facturas/", vistas_async.listar_facturas),
+    path("facturas/<str:pk>/", vistas_async.detalle_factura),
+]
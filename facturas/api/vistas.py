@@ -1,13 +1,36 @@
+from django.conf import settings
 from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
 from facturas.api.serializadores import SerializadorFactura
-from facturas.modelos import Factura
+from facturas.conciliacion import conciliar_pagos, leer_pagos
+from facturas.modelos import EstadoFactura, Factura
 from facturas.selectores import obtener_facturas_filtradas
-from facturas.servicios import marcar_pagada, marcar_anulada
+from facturas.servicios import marcar_anulada
+from core import cache_lecturas
+from core.condicional import GetCondicional
+from core.exportacion import respuesta_exportacion
+from core.idempotencia import idempotente
+from operaciones.servicios import registrar_pago_factura, registrar_pago_facturas
 from drf_spectacular.utils import extend_schema, extend_schema_view
 
+CAMPOS_EXPORT = (
+    "id",
+    "cliente",
+    "numero_factura",
+    "rut_deudor",
+    "razon_social_deudor",
+    "monto_total",
+    "fecha_emision",
+    "fecha_vencimiento",
+    "estado",
+    "creado_en",
+    "actualizado_en",
+)
+
+
 @extend_schema_view(
     list=extend_schema(tags=["Facturas"]),
     retrieve=extend_schema(tags=["Facturas"]),
@@ -15,23 +38,67 @@ from drf_spectacular.utils import extend_schema, extend_schema_view
     update=extend_schema(tags=["Facturas"]),
     partial_update=extend_schema(tags=["Facturas"]),
     destroy=extend_schema(tags=["Facturas"]),
+    export=extend_schema(tags=["Facturas"]),
     pagar=extend_schema(tags=["Facturas"]),
     anular=extend_schema(tags=["Facturas"]),
+    conciliar=extend_schema(tags=["Facturas"]),
 )
-class VistaFactura(viewsets.ModelViewSet):
+class VistaFactura(GetCondicional, cache_lecturas.DetalleCacheado, viewsets.ModelViewSet):
     serializer_class = SerializadorFactura
+    recurso_cache = cache_lecturas.FACTURA
+    estados_inmutables = (EstadoFactura.ANULADA,)
 
     def get_queryset(self):
         return obtener_facturas_filtradas(self.request.query_params)
 
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request):
+        return respuesta_exportacion(self.get_queryset(), CAMPOS_EXPORT, "facturas", request.query_params)
+
+    @idempotente
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
     @action(detail=True, methods=["post"])
+    @idempotente
     def pagar(self, request, pk=None):
         factura = self.get_object()
-        marcar_pagada(factura)
+        registrar_pago_factura(factura)
         return Response(self.get_serializer(factura).data)
 
     @action(detail=True, methods=["post"])
+    @idempotente
     def anular(self, request, pk=None):
         factura = self.get_object()
         marcar_anulada(factura)
         return Response(self.get_serializer(factura).data)
+
+    @action(detail=False, methods=["post"], url_path="conciliar")
+    @idempotente
+    def conciliar(self, request):
+        archivo = request.FILES.get("archivo")
+        if archivo is None:
+            raise ValidationError({"archivo": "Debe adjuntar el archivo de pagos."})
+
+        formato = request.data.get("formato") or archivo.name.rsplit(".", 1)[-1].lower()
+        if formato not in ("csv", "jsonl"):
+            raise ValidationError({"formato": "Formato no soportado. Use csv o jsonl."})
+
+        maximo = settings.CONCILIACION_MAX_INCIDENCIAS
+        incidencias = []
+        truncadas = False
+
+        def reportar(incidencia):
+            nonlocal truncadas
+            if len(incidencias) < maximo:
+                incidencias.append(incidencia)
+            else:
+                truncadas = True
+
+        resumen = conciliar_pagos(
+            leer_pagos(archivo.file, formato),
+            pagar=registrar_pago_facturas,
+            al_reportar=reportar,
+        )
+        return Response({**resumen, "incidencias": incidencias, "incidencias_truncadas": truncadas})
+
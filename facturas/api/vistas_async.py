@@ -0,0 +1,13 @@
+from core.asincrono import respuesta_detalle, respuesta_listado, vista_lectura_async
+from facturas.api.vistas import VistaFactura
+from facturas.selectores import obtener_facturas_filtradas
+
+
+@vista_lectura_async
+async def listar_facturas(request):
+    return await respuesta_listado(request, VistaFactura, obtener_facturas_filtradas(request.query_params))
+
+
+@vista_lectura_async
+async def detalle_factura(request, pk):
+    return await respuesta_detalle(request, VistaFactura, obtener_facturas_filtradas(request.query_params), pk)
@@ -0,0 +1,165 @@
+"""
+Conciliación de pagos de deudores contra facturas.
+
+Lee archivos CSV/JSONL de pagos en streaming, los procesa en lotes y marca como
+pagadas las facturas que calzan exactamente por (rut_deudor, numero_factura,
+monto_total). Las líneas que no calzan se informan como incidencias.
+"""
+import csv
+import io
+import json
+from collections import Counter
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.db import connection
+
+from core.rut import normalizar_rut, numero_rut
+from facturas.modelos import Factura, EstadoFactura
+from facturas.servicios import ESTADOS_PAGABLES
+
+TAMANO_LOTE = 2000
+
+SIN_COINCIDENCIA = "sin_coincidencia"
+MONTO_DISTINTO = "monto_distinto"
+AMBIGUA = "ambigua"
+YA_PAGADA = "ya_pagada"
+NO_PAGABLE = "no_pagable"
+INVALIDA = "invalida"
+
+
+def leer_pagos(archivo, formato: str):
+    """
+    Itera (numero_linea, dict) desde un archivo binario o de texto sin cargarlo
+    completo en memoria. Columnas/campos: rut_deudor, numero_factura, monto.
+    """
+    texto = archivo if isinstance(archivo, io.TextIOBase) else io.TextIOWrapper(archivo, encoding="utf-8-sig")
+
+    if formato == "csv":
+        for n, fila in enumerate(csv.DictReader(texto), start=2):
+            yield n, fila
+    elif formato == "jsonl":
+        for n, linea in enumerate(texto, start=1):
+            if not linea.strip():
+                continue
+            try:
+                yield n, json.loads(linea)
+            except ValueError:
+                yield n, None
+    else:
+        raise ValueError(f"Formato no soportado: {formato}")
+
+
+def _parsear(fila) -> tuple[str, str, Decimal]:
+    if not isinstance(fila, dict):
+        raise ValueError("Línea ilegible")
+    try:
+        rut = normalizar_rut(str(fila.get("rut_deudor") or ""))
+        numero = str(fila.get("numero_factura") or "").strip()
+        monto = Decimal(str(fila.get("monto") or "")).quantize(Decimal("0.01"))
+    except (ValueError, InvalidOperation):
+        raise ValueError("rut_deudor, numero_factura o monto inválido")
+    if not numero or monto <= 0:
+        raise ValueError("rut_deudor, numero_factura o monto inválido")
+    return rut, numero, monto
+
+
+def _buscar_facturas(claves: set[tuple[int, str]]) -> dict[tuple[int, str], list[tuple]]:
+    """
+    Una consulta por lote, resuelta con el índice (rut_deudor_numero, numero_factura).
+    Las facturas que poblar_rut_numero aún no completa (número NULL) se comparan
+    con rut_numero(rut_deudor), como en core.filtros_rut.
+    """
+    ruts, numeros = zip(*claves)
+    with connection.cursor() as cur:
+        cur.execute(
+            f"""
+            WITH p(rut, numero) AS (SELECT * FROM unnest(%s::integer[], %s::text[]))
+            SELECT f.id, p.rut, f.numero_factura, f.monto_total, f.estado
+              FROM {Factura._meta.db_table} f
+              JOIN p ON f.rut_deudor_numero = p.rut AND f.numero_factura = p.numero
+            UNION ALL
+            SELECT f.id, p.rut, f.numero_factura, f.monto_total, f.estado
+              FROM {Factura._meta.db_table} f
+              JOIN p ON f.rut_deudor_numero IS NULL
+                    AND rut_numero(f.rut_deudor) = p.rut
+                    AND f.numero_factura = p.numero
+            """,
+            [list(ruts), list(numeros)],
+        )
+        encontradas: dict[tuple[int, str], list[tuple]] = {}
+        for fid, rut, numero, monto, estado in cur.fetchall():
+            encontradas.setdefault((rut, numero), []).append((fid, monto, estado))
+    return encontradas
+
+
+def conciliar_pagos(pagos, *, pagar, al_reportar=None, tamano_lote: int = TAMANO_LOTE) -> dict:
+    """
+    pagos: iterable de (numero_linea, dict), p.ej. leer_pagos(...).
+    pagar: callable(facturas_ids) -> int que registra el pago de cada lote
+        (operaciones.servicios.registrar_pago_facturas, que además finaliza
+        las operaciones que quedan pagadas).
+    al_reportar: callable(dict) invocado por cada línea no conciliada.
+    Retorna un resumen con contadores por resultado.
+    """
+    resumen = Counter()
+    reportar = al_reportar or (lambda incidencia: None)
+    pagos = iter(pagos)
+
+    while True:
+        lote = list(islice(pagos, tamano_lote))
+        if not lote:
+            break
+
+        validas = []
+        for n, fila in lote:
+            resumen["procesadas"] += 1
+            try:
+                validas.append((n, *_parsear(fila)))
+            except ValueError as exc:
+                resumen[INVALIDA] += 1
+                reportar({"linea": n, "resultado": INVALIDA, "detalle": str(exc)})
+
+        if not validas:
+            continue
+
+        encontradas = _buscar_facturas({(numero_rut(rut), numero) for _, rut, numero, _ in validas})
+
+        a_pagar = []
+        vistas = set()
+        for n, rut, numero, monto in validas:
+            candidatas = encontradas.get((numero_rut(rut), numero), [])
+            coincidentes = [c for c in candidatas if c[1] == monto]
+
+            if not candidatas:
+                resultado = SIN_COINCIDENCIA
+            elif not coincidentes:
+                resultado = MONTO_DISTINTO
+            elif len(coincidentes) > 1:
+                resultado = AMBIGUA
+            else:
+                fid, _, estado = coincidentes[0]
+                if estado == EstadoFactura.PAGADA or fid in vistas:
+                    resultado = YA_PAGADA
+                elif estado not in ESTADOS_PAGABLES:
+                    resultado = NO_PAGABLE
+                else:
+                    vistas.add(fid)
+                    a_pagar.append(fid)
+                    continue
+
+            resumen[resultado] += 1
+            reportar(
+                {
+                    "linea": n,
+                    "resultado": resultado,
+                    "rut_deudor": rut,
+                    "numero_factura": numero,
+                    "monto": str(monto),
+                    "facturas_ids": [c[0] for c in (coincidentes or candidatas)],
+                }
+            )
+
+        resumen["pagadas"] += pagar(a_pagar)
+
+    return dict(resumen)
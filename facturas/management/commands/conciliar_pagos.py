@@ -0,0 +1,50 @@
+import csv
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from facturas.conciliacion import TAMANO_LOTE, conciliar_pagos, leer_pagos
+from operaciones.servicios import registrar_pago_facturas
+
+COLUMNAS_REPORTE = ["linea", "resultado", "rut_deudor", "numero_factura", "monto", "facturas_ids", "detalle"]
+
+
+class Command(BaseCommand):
+    help = "Concilia un archivo de pagos (CSV/JSONL) y marca como pagadas las facturas que calzan"
+
+    def add_arguments(self, parser):
+        parser.add_argument("archivo", help="Ruta del archivo de pagos")
+        parser.add_argument("--formato", choices=["csv", "jsonl"], help="Por defecto se infiere de la extensión")
+        parser.add_argument("--reporte", help="CSV donde escribir las líneas no conciliadas")
+        parser.add_argument("--lote", type=int, default=TAMANO_LOTE, help="Líneas procesadas por lote")
+
+    def handle(self, *args, **options):
+        ruta = Path(options["archivo"])
+        if not ruta.exists():
+            raise CommandError(f"No existe el archivo: {ruta}")
+        formato = options["formato"] or ruta.suffix.lstrip(".").lower()
+        if formato not in ("csv", "jsonl"):
+            raise CommandError("No se pudo inferir el formato; use --formato csv|jsonl")
+
+        self.stdout.write(f"💳 Conciliando pagos desde {ruta}...")
+
+        reporte = open(options["reporte"], "w", newline="", encoding="utf-8") if options["reporte"] else None
+        try:
+            writer = csv.DictWriter(reporte, fieldnames=COLUMNAS_REPORTE) if reporte else None
+            if writer:
+                writer.writeheader()
+
+            with ruta.open("rb") as archivo:
+                resumen = conciliar_pagos(
+                    leer_pagos(archivo, formato),
+                    pagar=registrar_pago_facturas,
+                    al_reportar=writer.writerow if writer else None,
+                    tamano_lote=options["lote"],
+                )
+        finally:
+            if reporte:
+                reporte.close()
+
+        for clave, valor in sorted(resumen.items()):
+            self.stdout.write(f"  {clave}: {valor}")
+        self.stdout.write(self.style.SUCCESS("✔ Conciliación finalizada"))
@@ -0,0 +1,29 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from facturas.servicios import marcar_facturas_vencidas
+
+
+class Command(BaseCommand):
+    help = "Marca como VENCIDA toda factura disponible cuya fecha de vencimiento ya pasó"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lote", type=int, default=5000, help="Facturas actualizadas por transacción")
+        parser.add_argument("--fecha", help="Fecha de corte YYYY-MM-DD (por defecto, hoy)")
+
+    def handle(self, *args, **options):
+        hoy = None
+        if options["fecha"]:
+            try:
+                hoy = date.fromisoformat(options["fecha"])
+            except ValueError:
+                raise CommandError("Formato inválido para --fecha. Use YYYY-MM-DD.")
+
+        self.stdout.write("🗓️  Barrido de facturas vencidas...")
+
+        def informar(numero_lote, movidas):
+            self.stdout.write(f"  lote {numero_lote}: {movidas} facturas")
+
+        total = marcar_facturas_vencidas(hoy, tamano_lote=options["lote"], al_procesar_lote=informar)
+        self.stdout.write(self.style.SUCCESS(f"✔ Facturas marcadas como vencidas: {total}"))
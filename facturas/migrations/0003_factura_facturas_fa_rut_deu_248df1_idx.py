@@ -0,0 +1,17 @@
+# Generated by Django 4.2.28 on 2026-10-17 10:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('facturas', '0002_alter_factura_monto_total'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='factura',
+            index=models.Index(fields=['rut_deudor', 'numero_factura'], name='facturas_fa_rut_deu_248df1_idx'),
+        ),
+    ]
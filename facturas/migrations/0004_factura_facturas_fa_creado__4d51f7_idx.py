@@ -0,0 +1,17 @@
+# Generated by Django 4.2.28 on 2026-10-17 10:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('facturas', '0003_factura_facturas_fa_rut_deu_248df1_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='factura',
+            index=models.Index(fields=['creado_en', 'id'], name='facturas_fa_creado__4d51f7_idx'),
+        ),
+    ]
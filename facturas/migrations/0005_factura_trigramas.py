@@ -0,0 +1,35 @@
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ('clientes', '0004_cliente_trigramas'),  # crea la extensión pg_trgm
+        ('facturas', '0004_factura_facturas_fa_creado__4d51f7_idx'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='factura',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper('numero_factura'), name='gin_trgm_ops'
+                ),
+                name='facturas_numero_trgm',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='factura',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper('razon_social_deudor'), name='gin_trgm_ops'
+                ),
+                name='facturas_razon_deudor_trgm',
+            ),
+        ),
+    ]
@@ -0,0 +1,45 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+CREAR_TRIGGER = """
+CREATE FUNCTION facturas_factura_rut_deudor_numero() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    NEW.rut_deudor_numero := rut_numero(NEW.rut_deudor);
+    RETURN NEW;
+END $$;
+
+CREATE TRIGGER facturas_factura_rut_deudor_numero
+    BEFORE INSERT OR UPDATE OF rut_deudor, rut_deudor_numero ON facturas_factura
+    FOR EACH ROW EXECUTE FUNCTION facturas_factura_rut_deudor_numero();
+"""
+
+BORRAR_TRIGGER = """
+DROP TRIGGER facturas_factura_rut_deudor_numero ON facturas_factura;
+DROP FUNCTION facturas_factura_rut_deudor_numero();
+"""
+
+
+class Migration(migrations.Migration):
+    # Igual que clientes 0005: columna NULL, trigger, índice concurrente y
+    # backfill aparte con `manage.py poblar_rut_numero`
+    atomic = False
+
+    dependencies = [
+        ('clientes', '0005_cliente_rut_numero'),
+        ('facturas', '0005_factura_trigramas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='factura',
+            name='rut_deudor_numero',
+            field=models.IntegerField(editable=False, null=True),
+        ),
+        migrations.RunSQL(CREAR_TRIGGER, BORRAR_TRIGGER),
+        AddIndexConcurrently(
+            model_name='factura',
+            index=models.Index(fields=['rut_deudor_numero', 'numero_factura'], name='facturas_rut_deudor_num_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.contrib.postgres.operations import RemoveIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # Las búsquedas por RUT usan (rut_deudor_numero, numero_factura); las filas
+    # aún sin número se encuentran por `rut_deudor_numero IS NULL` sobre ese
+    # mismo índice (core.filtros_rut), así que los de texto ya no se leen
+    atomic = False
+
+    dependencies = [
+        ('facturas', '0006_factura_rut_deudor_numero'),
+    ]
+
+    operations = [
+        RemoveIndexConcurrently(
+            model_name='factura',
+            name='facturas_fa_rut_deu_20aa5a_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='factura',
+            name='facturas_fa_rut_deu_248df1_idx',
+        ),
+    ]
@@ -1,4 +1,6 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils import timezone
 
 from clientes.modelos import Cliente
@@ -20,6 +22,8 @@ class Factura(models.Model):
 
     numero_factura = models.CharField(max_length=50)
     rut_deudor = models.CharField(max_length=12)
+    # Número del RUT deudor sin DV, mantenido por trigger como Cliente.rut_numero
+    rut_deudor_numero = models.IntegerField(null=True, editable=False)
     razon_social_deudor = models.CharField(max_length=255)
 
     monto_total = models.DecimalField(
@@ -48,9 +52,13 @@ class Factura(models.Model):
         ]
         indexes = [
             models.Index(fields=["estado"]),
-            models.Index(fields=["rut_deudor"]),
             models.Index(fields=["fecha_emision"]),
             models.Index(fields=["fecha_vencimiento"]),
+            models.Index(fields=["creado_en", "id"]),
+            models.Index(fields=["rut_deudor_numero", "numero_factura"], name="facturas_rut_deudor_num_idx"),
+            # Trigramas sobre UPPER(col), como en Cliente (pg_trgm)
+            GinIndex(OpClass(Upper("numero_factura"), name="gin_trgm_ops"), name="facturas_numero_trgm"),
+            GinIndex(OpClass(Upper("razon_social_deudor"), name="gin_trgm_ops"), name="facturas_razon_deudor_trgm"),
         ]
 
     def __str__(self) -> str:
@@ -2,6 +2,7 @@ from datetime import date
 
 from rest_framework.exceptions import ValidationError
 
+from core.filtros_rut import filtro_prefijo_rut, filtro_rut
 from facturas.modelos import Factura
 
 
@@ -13,7 +14,7 @@ def _parse_date_param(name: str, value: str) -> date:
 
 
 def obtener_facturas_filtradas(params):
-    qs = Factura.objects.select_related("cliente").all().order_by("-creado_en")
+    qs = Factura.objects.select_related("cliente").all().order_by("-creado_en", "-id")
 
     cliente_id = params.get("cliente_id")
     if cliente_id:
@@ -25,7 +26,13 @@ def obtener_facturas_filtradas(params):
 
     rut_deudor = params.get("rut_deudor")
     if rut_deudor:
-        qs = qs.filter(rut_deudor=rut_deudor)
+        qs = qs.filter(filtro_rut("rut_deudor_numero", "rut_deudor", "rut_deudor", rut_deudor))
+
+    rut_deudor_prefijo = params.get("rut_deudor_prefijo")
+    if rut_deudor_prefijo:
+        qs = qs.filter(
+            filtro_prefijo_rut("rut_deudor_numero", "rut_deudor", "rut_deudor_prefijo", rut_deudor_prefijo)
+        )
 
     fecha_desde = params.get("fecha_desde")
     if fecha_desde:
@@ -1,15 +1,113 @@
+import logging
+from datetime import date
+
+from django.db import connection, transaction
 from django.utils import timezone
+from rest_framework.exceptions import ValidationError
 
+from core import cache_lecturas
 from facturas.modelos import Factura, EstadoFactura
 
+logger = logging.getLogger(__name__)
+
+ESTADOS_PAGABLES = (
+    EstadoFactura.DISPONIBLE,
+    EstadoFactura.EN_PROCESO,
+    EstadoFactura.CEDIDA,
+    EstadoFactura.VENCIDA,
+)
+
+
+def _validar_no_anulada(factura: Factura) -> None:
+    # ANULADA es final: la API la sirve con Cache-Control inmutable (core.condicional)
+    if factura.estado == EstadoFactura.ANULADA:
+        raise ValidationError({"estado": "La factura está anulada."})
+
 
 def marcar_pagada(factura: Factura) -> Factura:
+    """
+    Solo cambia la factura. Las operaciones que la contienen reaccionan al pago
+    en operaciones.servicios.registrar_pago_factura, que es lo que usa la API.
+    """
+    _validar_no_anulada(factura)
     factura.estado = EstadoFactura.PAGADA
     factura.save(update_fields=["estado", "actualizado_en"])
+    cache_lecturas.invalidar(cache_lecturas.FACTURA, [factura.id])
     return factura
 
 
+def marcar_pagadas_lote(facturas_ids: list[int]) -> int:
+    """
+    Variante por conjunto de marcar_pagada para cargas masivas: un UPDATE de las
+    facturas pagables. Retorna la cantidad de facturas que pasaron a PAGADA.
+    """
+    if not facturas_ids:
+        return 0
+
+    pagadas = Factura.objects.filter(id__in=facturas_ids, estado__in=ESTADOS_PAGABLES).update(
+        estado=EstadoFactura.PAGADA,
+        actualizado_en=timezone.now(),
+    )
+    cache_lecturas.invalidar(cache_lecturas.FACTURA, facturas_ids)
+    return pagadas
+
+
 def marcar_anulada(factura: Factura) -> Factura:
+    _validar_no_anulada(factura)
     factura.estado = EstadoFactura.ANULADA
     factura.save(update_fields=["estado", "actualizado_en"])
+    cache_lecturas.invalidar(cache_lecturas.FACTURA, [factura.id])
     return factura
+
+
+def marcar_facturas_vencidas(hoy: date | None = None, *, tamano_lote: int = 5000, al_procesar_lote=None) -> int:
+    """
+    Pasa a VENCIDA toda factura DISPONIBLE con fecha_vencimiento anterior a `hoy`.
+
+    Trabaja en lotes, cada uno en su propia transacción corta, recorriendo el
+    índice de fecha_vencimiento. FOR UPDATE SKIP LOCKED permite ejecutar varias
+    instancias a la vez y no espera por facturas que otra transacción tenga
+    tomadas (p.ej. una aprobación en curso); quedan para la siguiente pasada.
+
+    al_procesar_lote: callable(numero_lote, movidas) para informar avance.
+    Retorna el total de facturas marcadas.
+    """
+    hoy = hoy or timezone.localdate()
+    tabla = Factura._meta.db_table
+    total = 0
+    numero_lote = 0
+
+    while True:
+        with transaction.atomic():
+            with connection.cursor() as cur:
+                cur.execute(
+                    f"""
+                    UPDATE {tabla}
+                       SET estado = %s, actualizado_en = %s
+                     WHERE id IN (
+                           SELECT id FROM {tabla}
+                            WHERE estado = %s AND fecha_vencimiento < %s
+                            ORDER BY fecha_vencimiento
+                            LIMIT %s
+                              FOR UPDATE SKIP LOCKED
+                     )
+                    RETURNING id
+                    """,
+                    [EstadoFactura.VENCIDA, timezone.now(), EstadoFactura.DISPONIBLE, hoy, tamano_lote],
+                )
+                vencidas = [fila[0] for fila in cur.fetchall()]
+            cache_lecturas.invalidar(cache_lecturas.FACTURA, vencidas)
+            movidas = len(vencidas)
+
+        if movidas == 0:
+            break
+        numero_lote += 1
+        total += movidas
+        if al_procesar_lote:
+            al_procesar_lote(numero_lote, movidas)
+        if movidas < tamano_lote:
+            break
+
+    logger.info("Facturas marcadas como vencidas", extra={"total": total, "lotes": numero_lote})
+    return total
+
@@ -0,0 +1,148 @@
+import json
+
+import pytest
+from decimal import Decimal
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from clientes.modelos import Cliente, EstadoCliente
+from facturas.modelos import Factura, EstadoFactura
+from operaciones.modelos import EstadoOperacion, OperacionCesion
+
+pytestmark = pytest.mark.django_db
+
+
+def _cliente(rut="12.345.678-5"):
+    return Cliente.objects.create(
+        rut=rut,
+        razon_social="Empresa",
+        email="a@a.cl",
+        linea_credito="10000000.00",
+        linea_disponible="10000000.00",
+        estado=EstadoCliente.ACTIVO,
+    )
+
+
+def _factura(cliente, numero, monto="1000.00", rut_deudor="76.543.210-3", estado=EstadoFactura.DISPONIBLE):
+    hoy = timezone.localdate()
+    return Factura.objects.create(
+        cliente=cliente,
+        numero_factura=numero,
+        rut_deudor=rut_deudor,
+        razon_social_deudor="Deudor",
+        monto_total=Decimal(monto),
+        fecha_emision=hoy,
+        fecha_vencimiento=hoy + timezone.timedelta(days=30),
+        estado=estado,
+    )
+
+
+def test_conciliar_csv_por_endpoint():
+    api = APIClient()
+    c1 = _cliente()
+    c2 = _cliente("11.111.111-1")
+
+    f_ok = _factura(c1, "F-1", "1000.00")
+    f_pagada = _factura(c1, "F-2", "500.00", estado=EstadoFactura.PAGADA)
+    # mismo deudor, número y monto en dos clientes => ambigua
+    _factura(c1, "F-9", "700.00")
+    _factura(c2, "F-9", "700.00")
+
+    contenido = "\n".join(
+        [
+            "rut_deudor,numero_factura,monto",
+            "76543210-3,F-1,1000",          # calza (RUT sin puntos)
+            "76.543.210-3,F-2,500.00",      # ya pagada
+            "76.543.210-3,F-9,700.00",      # ambigua
+            "76.543.210-3,F-1,999.00",      # monto distinto
+            "77.777.777-7,F-1,1000.00",     # sin coincidencia
+            "rut-malo,F-1,1000.00",         # inválida
+        ]
+    ).encode()
+
+    resp = api.post(
+        "/api/facturas/conciliar/",
+        {"archivo": SimpleUploadedFile("pagos.csv", contenido)},
+        format="multipart",
+    )
+    assert resp.status_code == 200, resp.data
+    body = resp.json()
+
+    assert body["procesadas"] == 6
+    assert body["pagadas"] == 1
+    assert body["ya_pagada"] == 1
+    assert body["ambigua"] == 1
+    assert body["monto_distinto"] == 1
+    assert body["sin_coincidencia"] == 1
+    assert body["invalida"] == 1
+    assert [i["linea"] for i in body["incidencias"]] == [7, 3, 4, 5, 6]
+
+    f_ok.refresh_from_db()
+    f_pagada.refresh_from_db()
+    assert f_ok.estado == EstadoFactura.PAGADA
+
+
+def test_conciliar_repetido_con_misma_clave_no_vuelve_a_pagar():
+    api = APIClient()
+    factura = _factura(_cliente(), "F-1", "1000.00")
+    contenido = b"rut_deudor,numero_factura,monto\n76.543.210-3,F-1,1000.00\n"
+
+    def subir(datos, clave="conc-1"):
+        return api.post(
+            "/api/facturas/conciliar/",
+            {"archivo": SimpleUploadedFile("pagos.csv", datos)},
+            format="multipart",
+            HTTP_IDEMPOTENCY_KEY=clave,
+        )
+
+    r1 = subir(contenido)
+    assert r1.status_code == 200, r1.data
+    assert r1.json()["pagadas"] == 1
+
+    # Sin idempotencia la repetición informaría la factura como ya_pagada
+    r2 = subir(contenido)
+    assert r2.status_code == 200
+    assert r2["Idempotent-Replayed"] == "true"
+    assert r2.json() == r1.json()
+
+    factura.refresh_from_db()
+    assert factura.estado == EstadoFactura.PAGADA
+
+    # Mismo nombre de archivo con otro contenido no es la misma solicitud
+    r3 = subir(contenido + b"76.543.210-3,F-2,10.00\n")
+    assert r3.status_code == 409
+    assert r3.json()["code"] == "CONFLICT"
+
+
+def test_conciliar_jsonl_por_comando_finaliza_operaciones(tmp_path):
+    api = APIClient()
+    c = _cliente()
+    facturas = [_factura(c, f"F-{i}", "100.00") for i in range(5)]
+
+    op_id = api.post(
+        "/api/operaciones/", {"cliente": c.id, "facturas_ids": [f.id for f in facturas]}, format="json"
+    ).json()["id"]
+    assert api.post(f"/api/operaciones/{op_id}/aprobar/").status_code == 200
+
+    archivo = tmp_path / "pagos.jsonl"
+    archivo.write_text(
+        "\n".join(
+            json.dumps({"rut_deudor": f.rut_deudor, "numero_factura": f.numero_factura, "monto": "100.00"})
+            for f in facturas
+        )
+        + "\n{no es json\n"
+    )
+    reporte = tmp_path / "reporte.csv"
+
+    call_command("conciliar_pagos", str(archivo), "--lote", "2", "--reporte", str(reporte))
+
+    assert Factura.objects.filter(estado=EstadoFactura.PAGADA).count() == 5
+    assert OperacionCesion.objects.get(id=op_id).estado == EstadoOperacion.FINALIZADA
+    c.refresh_from_db()
+    assert c.linea_disponible == Decimal("10000000.00")
+
+    lineas = reporte.read_text().strip().splitlines()
+    assert len(lineas) == 2
+    assert ",invalida," in lineas[1]
@@ -0,0 +1,125 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from clientes.modelos import Cliente, EstadoCliente
+from facturas.modelos import Factura, EstadoFactura
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _cache_limpia():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _cliente():
+    return Cliente.objects.create(
+        rut="12.345.678-5",
+        razon_social="Empresa",
+        email="a@a.cl",
+        linea_credito="10000000.00",
+        linea_disponible="10000000.00",
+        estado=EstadoCliente.ACTIVO,
+    )
+
+
+def _factura(cliente, numero, estado=EstadoFactura.DISPONIBLE):
+    return Factura.objects.create(
+        cliente=cliente,
+        numero_factura=numero,
+        rut_deudor="76.543.210-3",
+        razon_social_deudor="Deudor",
+        monto_total="1000.00",
+        fecha_emision="2026-02-01",
+        fecha_vencimiento="2026-03-01",
+        estado=estado,
+    )
+
+
+def _counts(ctx):
+    return [q for q in ctx.captured_queries if "COUNT(" in q["sql"]]
+
+
+def test_sobre_el_umbral_se_informa_el_estimado_sin_count(settings):
+    settings.CONTEO_ESTIMADO_UMBRAL = 1
+    api = APIClient()
+    c = _cliente()
+    for i in range(3):
+        _factura(c, f"F-{i}")
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = api.get("/api/facturas/?total=estimado&rut_deudor=76.543.210-3")
+    body = resp.json()
+    assert resp.status_code == 200
+    assert body["count_exacto"] is False
+    assert body["count"] >= 1
+    assert not _counts(ctx)
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = api.get("/api/facturas/?paginacion=cursor&total=estimado")
+    assert resp.json()["count_exacto"] is False
+    assert not _counts(ctx)
+
+
+def test_bajo_el_umbral_cuenta_exacto_y_cachea_filtros_comunes(settings):
+    settings.CONTEO_ESTIMADO_UMBRAL = 1_000_000
+    api = APIClient()
+    c = _cliente()
+    _factura(c, "F-1")
+    _factura(c, "F-2")
+    _factura(c, "F-3", estado=EstadoFactura.PAGADA)
+
+    url = f"/api/facturas/?total=estimado&estado=disponible&cliente_id={c.id}"
+    body = api.get(url).json()
+    assert body["count"] == 2
+    assert body["count_exacto"] is True
+
+    # Dentro del TTL el conteo viene de la caché
+    _factura(c, "F-4")
+    with CaptureQueriesContext(connection) as ctx:
+        body = api.get(url + "&page=1").json()
+    assert body["count"] == 2
+    assert not _counts(ctx)
+
+    # Filtros no comunes se cuentan siempre
+    body = api.get("/api/facturas/?total=estimado&rut_deudor=76.543.210-3").json()
+    assert body["count"] == 4
+    assert body["count_exacto"] is True
+
+    # Sin ?total=estimado la respuesta no cambia
+    assert "count_exacto" not in api.get("/api/facturas/").json()
+
+
+@pytest.mark.parametrize("estimado", [1, 1_000])
+def test_con_total_estimado_la_navegacion_no_depende_de_la_estimacion(monkeypatch, estimado):
+    from core import paginacion
+
+    monkeypatch.setattr(paginacion.PaginacionCursorOpcional, "page_size", 2)
+    monkeypatch.setattr(paginacion, "contar", lambda queryset, filtros: (estimado, False))
+    api = APIClient()
+    c = _cliente()
+    for i in range(5):
+        _factura(c, f"F-{i}")
+
+    for prefijo in ("/api/facturas/", "/api/async/facturas/"):
+        vistos = []
+        url = f"{prefijo}?total=estimado"
+        while url:
+            body = api.get(url).json()
+            assert body["count"] == estimado
+            assert body["count_exacto"] is False
+            vistos += [f["id"] for f in body["results"]]
+            url = body["next"]
+        assert sorted(vistos) == sorted(Factura.objects.values_list("id", flat=True))
+
+        body = api.get(f"{prefijo}?total=estimado&page=3").json()
+        assert len(body["results"]) == 1
+        assert body["next"] is None
+        assert body["previous"] is not None
+        assert api.get(f"{prefijo}?total=estimado&page=4").status_code == 404
+        assert api.get(f"{prefijo}?total=estimado&page=0").status_code == 404
@@ -0,0 +1,78 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from rest_framework.test import APIClient
+
+from clientes.modelos import Cliente, EstadoCliente
+from facturas.modelos import Factura, EstadoFactura
+
+pytestmark = pytest.mark.django_db
+
+
+def _datos():
+    cliente = Cliente.objects.create(
+        rut="12.345.678-5",
+        razon_social="Empresa, S.A.",
+        email="a@a.cl",
+        linea_credito="10000000.00",
+        linea_disponible="10000000.00",
+        estado=EstadoCliente.ACTIVO,
+    )
+    for i in range(5):
+        Factura.objects.create(
+            cliente=cliente,
+            numero_factura=f"F-{i}",
+            rut_deudor="76.543.210-3",
+            razon_social_deudor='Deudor "Uno"',
+            monto_total="1000.50",
+            fecha_emision="2026-02-01",
+            fecha_vencimiento="2026-03-01",
+            estado=EstadoFactura.PAGADA if i == 4 else EstadoFactura.DISPONIBLE,
+        )
+    return cliente
+
+
+def _contenido(resp) -> bytes:
+    return b"".join(resp.streaming_content)
+
+
+def test_export_csv_reutiliza_filtros_y_escapa_valores():
+    api = APIClient()
+    cliente = _datos()
+
+    resp = api.get("/api/facturas/export/?estado=disponible")
+    assert resp.status_code == 200
+    assert resp["Content-Type"].startswith("text/csv")
+    assert resp["Content-Disposition"] == 'attachment; filename="facturas.csv"'
+
+    filas = list(csv.DictReader(io.StringIO(_contenido(resp).decode())))
+    assert len(filas) == 4
+    assert filas[0]["cliente"] == str(cliente.id)
+    assert filas[0]["razon_social_deudor"] == 'Deudor "Uno"'
+    assert filas[0]["monto_total"] == "1000.50"
+    assert filas[0]["fecha_emision"] == "2026-02-01"
+    assert {f["estado"] for f in filas} == {"disponible"}
+
+    resp = api.get("/api/clientes/export/")
+    filas = list(csv.DictReader(io.StringIO(_contenido(resp).decode())))
+    assert filas[0]["razon_social"] == "Empresa, S.A."
+
+
+def test_export_ndjson_con_gzip():
+    api = APIClient()
+    _datos()
+
+    resp = api.get("/api/facturas/export/?formato=ndjson&gzip=true")
+    assert resp.status_code == 200
+    assert resp["Content-Type"] == "application/gzip"
+    assert resp["Content-Disposition"] == 'attachment; filename="facturas.ndjson.gz"'
+
+    lineas = [json.loads(l) for l in gzip.decompress(_contenido(resp)).decode().splitlines()]
+    assert len(lineas) == 5
+    assert lineas[0]["monto_total"] == "1000.50"
+
+    assert api.get("/api/operaciones/export/?formato=ndjson").status_code == 200
+    assert api.get("/api/facturas/export/?formato=xml").status_code == 400
@@ -116,3 +116,60 @@ def test_filtro_fecha_invalida_devuelve_400_con_wrapper_si_existe():
     else:
         # Respuesta DRF clásica
         assert "fecha_desde" in body
+
+
+def _factura(cliente, numero: str, rut_deudor: str):
+    return Factura.objects.create(
+        cliente=cliente,
+        numero_factura=numero,
+        rut_deudor=rut_deudor,
+        razon_social_deudor="Deudor",
+        monto_total="1000.00",
+        fecha_emision="2026-02-01",
+        fecha_vencimiento="2026-03-01",
+        estado=EstadoFactura.DISPONIBLE,
+    )
+
+
+def test_filtro_por_rut_deudor_acepta_cualquier_escritura():
+    client = APIClient()
+    c1 = _cliente("12.345.678-5", "a@a.cl")
+    f = _factura(c1, "F-30", "9.876.543-3")
+    _factura(c1, "F-31", "76.543.210-3")
+
+    f.refresh_from_db()
+    assert f.rut_deudor_numero == 9876543
+
+    for rut in ("9.876.543-3", "9876543-3", "09.876.543-3", " 9876543-3"):
+        data = client.get("/api/facturas/", {"rut_deudor": rut}).json()
+        assert [r["numero_factura"] for r in data["results"]] == ["F-30"]
+
+    resp = client.get("/api/facturas/?rut_deudor=9.876.543-0")
+    assert resp.status_code == 400
+    assert "rut_deudor" in resp.json()["errors"]
+
+
+def test_filtro_por_prefijo_de_rut_deudor():
+    client = APIClient()
+    c1 = _cliente("12.345.678-5", "a@a.cl")
+    _factura(c1, "F-40", "76.543.210-3")
+    _factura(c1, "F-41", "7.654.302-K")
+    _factura(c1, "F-42", "9.876.543-3")
+
+    data = client.get("/api/facturas/?rut_deudor_prefijo=76.543.2").json()
+    assert sorted(r["numero_factura"] for r in data["results"]) == ["F-40"]
+
+    # 7.654.302-K también empieza con 7654
+    data = client.get("/api/facturas/?rut_deudor_prefijo=7654").json()
+    assert sorted(r["numero_factura"] for r in data["results"]) == ["F-40", "F-41"]
+
+    assert client.get("/api/facturas/?rut_deudor_prefijo=76-5").status_code == 400
+
+
+def test_rut_deudor_numero_se_actualiza_con_el_rut():
+    c1 = _cliente("12.345.678-5", "a@a.cl")
+    f = _factura(c1, "F-50", "76.543.210-3")
+
+    Factura.objects.filter(id=f.id).update(rut_deudor="9.876.543-3")
+    f.refresh_from_db()
+    assert f.rut_deudor_numero == 9876543
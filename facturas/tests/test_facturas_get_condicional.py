@@ -0,0 +1,135 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from clientes.modelos import Cliente, EstadoCliente
+from facturas.modelos import EstadoFactura, Factura
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _cache_limpia():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _cliente():
+    return Cliente.objects.create(
+        rut="12.345.678-5",
+        razon_social="Empresa Demo SpA",
+        email="demo@empresa.cl",
+        linea_credito="10000000.00",
+        linea_disponible="10000000.00",
+        estado=EstadoCliente.ACTIVO,
+    )
+
+
+def _factura(cliente, numero="F-1"):
+    hoy = timezone.localdate()
+    return Factura.objects.create(
+        cliente=cliente,
+        numero_factura=numero,
+        rut_deudor="76.543.210-3",
+        razon_social_deudor="Deudor SpA",
+        monto_total="1000.00",
+        fecha_emision=hoy,
+        fecha_vencimiento=hoy + timezone.timedelta(days=30),
+        estado=EstadoFactura.DISPONIBLE,
+    )
+
+
+def test_detalle_responde_304_sin_consultas_con_etag_vigente(django_capture_on_commit_callbacks):
+    api = APIClient()
+    f = _factura(_cliente())
+    url = f"/api/facturas/{f.id}/"
+
+    resp = api.get(url)
+    etag = resp["ETag"]
+    assert resp["Last-Modified"]
+    assert resp["Cache-Control"] == "private, no-cache"
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = api.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp["ETag"] == etag
+    assert len(ctx.captured_queries) == 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        api.post(f"{url}pagar/")
+    resp = api.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 200
+    assert resp["ETag"] != etag
+
+
+def test_detalle_responde_304_por_if_modified_since():
+    api = APIClient()
+    f = _factura(_cliente())
+    url = f"/api/facturas/{f.id}/"
+
+    ultimo = api.get(url)["Last-Modified"]
+    assert api.get(url, HTTP_IF_MODIFIED_SINCE=ultimo).status_code == 304
+
+
+def test_factura_anulada_se_sirve_inmutable_y_no_admite_cambios(django_capture_on_commit_callbacks):
+    api = APIClient()
+    f = _factura(_cliente())
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert api.post(f"/api/facturas/{f.id}/anular/").status_code == 200
+
+    resp = api.get(f"/api/facturas/{f.id}/")
+    assert resp.json()["estado"] == EstadoFactura.ANULADA
+    assert resp["Cache-Control"] == "private, max-age=31536000, immutable"
+
+    assert api.post(f"/api/facturas/{f.id}/pagar/").status_code == 400
+    assert api.post(f"/api/facturas/{f.id}/anular/").status_code == 400
+    assert api.patch(f"/api/facturas/{f.id}/", {"razon_social_deudor": "Otro"}, format="json").status_code == 400
+    assert api.delete(f"/api/facturas/{f.id}/").status_code == 400
+    assert Factura.objects.filter(id=f.id, razon_social_deudor="Deudor SpA").exists()
+
+
+def test_listado_responde_304_y_cambia_con_los_datos():
+    api = APIClient()
+    c = _cliente()
+    f = _factura(c)
+    url = f"/api/facturas/?cliente_id={c.id}"
+
+    resp = api.get(url)
+    etag = resp["ETag"]
+    assert resp.json()["count"] == 1
+
+    # La marca y el total salen de un solo aggregate; un 304 no pide la página
+    with CaptureQueriesContext(connection) as ctx:
+        assert api.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+    assert len(ctx.captured_queries) == 1
+
+    # Con datos nuevos la marca cambia y la página usa el total ya calculado
+    _factura(c, "F-2")
+    with CaptureQueriesContext(connection) as ctx:
+        resp = api.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 200
+    assert resp.json()["count"] == 2
+    assert len(ctx.captured_queries) == 2
+    etag = resp["ETag"]
+
+    f.delete()
+    assert api.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+def test_listado_por_cursor_usa_la_marca_de_la_pagina():
+    api = APIClient()
+    c = _cliente()
+    _factura(c)
+    url = "/api/facturas/?paginacion=cursor"
+
+    etag = api.get(url)["ETag"]
+    assert api.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    _factura(c, "F-2")
+    assert api.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
@@ -0,0 +1,108 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from clientes.modelos import Cliente, EstadoCliente
+from facturas.modelos import Factura, EstadoFactura
+
+pytestmark = pytest.mark.django_db
+
+
+def _facturas(n):
+    cliente = Cliente.objects.create(
+        rut="12.345.678-5",
+        razon_social="Empresa",
+        email="a@a.cl",
+        linea_credito="10000000.00",
+        linea_disponible="10000000.00",
+        estado=EstadoCliente.ACTIVO,
+    )
+    Factura.objects.bulk_create(
+        [
+            Factura(
+                cliente=cliente,
+                numero_factura=f"F-{i}",
+                rut_deudor="76.543.210-3",
+                razon_social_deudor="Deudor",
+                monto_total="1000.00",
+                fecha_emision="2026-02-01",
+                fecha_vencimiento="2026-03-01",
+                estado=EstadoFactura.DISPONIBLE,
+            )
+            for i in range(n)
+        ]
+    )
+    # creado_en repetido de a tres: el id desempata
+    ahora = timezone.now()
+    for f in Factura.objects.all():
+        Factura.objects.filter(id=f.id).update(creado_en=ahora - timezone.timedelta(minutes=f.id // 3))
+    return list(Factura.objects.order_by("-creado_en", "-id").values_list("id", flat=True))
+
+
+def _ids(resp):
+    return [r["id"] for r in resp.json()["results"]]
+
+
+def test_cursor_recorre_adelante_y_atras_sin_count():
+    api = APIClient()
+    esperados = _facturas(11)
+
+    paginas = []
+    url = "/api/facturas/?paginacion=cursor&limite=4"
+    with CaptureQueriesContext(connection) as ctx:
+        while url:
+            resp = api.get(url)
+            assert resp.status_code == 200, resp.data
+            assert "count" not in resp.json()
+            paginas.append(resp.json())
+            url = resp.json()["next"]
+
+    assert not [q for q in ctx.captured_queries if "COUNT(" in q["sql"]]
+    assert [r["id"] for p in paginas for r in p["results"]] == esperados
+    assert paginas[0]["previous"] is None
+
+    # Volver desde la última página reconstruye las anteriores
+    resp = api.get(paginas[-1]["previous"])
+    assert _ids(resp) == [r["id"] for r in paginas[1]["results"]]
+    resp = api.get(resp.json()["previous"])
+    assert _ids(resp) == [r["id"] for r in paginas[0]["results"]]
+    assert resp.json()["previous"] is None
+
+
+def test_cursor_con_total_filtros_y_errores():
+    api = APIClient()
+    _facturas(5)
+
+    resp = api.get("/api/facturas/?paginacion=cursor&limite=2&total=true&estado=disponible")
+    assert resp.json()["count"] == 5
+    assert len(resp.json()["results"]) == 2
+
+    assert api.get("/api/facturas/?cursor=xyz").status_code == 400
+    assert api.get("/api/facturas/?paginacion=cursor&limite=0").status_code == 400
+
+    # Sin opt-in se mantiene la paginación por número de página
+    resp = api.get("/api/facturas/?page=1")
+    assert resp.json()["count"] == 5
+
+
+def test_cursor_en_clientes_y_operaciones():
+    api = APIClient()
+    _facturas(1)
+    Cliente.objects.create(
+        rut="11.111.111-1",
+        razon_social="Otra",
+        email="b@b.cl",
+        linea_credito="1000.00",
+        linea_disponible="1000.00",
+        estado=EstadoCliente.ACTIVO,
+    )
+
+    resp = api.get("/api/clientes/?paginacion=cursor&limite=1")
+    assert resp.status_code == 200
+    assert len(resp.json()["results"]) == 1
+    assert api.get(resp.json()["next"]).json()["next"] is None
+
+    resp = api.get("/api/operaciones/?paginacion=cursor")
+    assert resp.json() == {"next": None, "previous": None, "results": []}
@@ -0,0 +1,72 @@
+import pytest
+from decimal import Decimal
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from clientes.modelos import Cliente, EstadoCliente
+from facturas.modelos import Factura, EstadoFactura
+from facturas.servicios import marcar_facturas_vencidas
+
+pytestmark = pytest.mark.django_db
+
+
+def _cliente():
+    return Cliente.objects.create(
+        rut="12.345.678-5",
+        razon_social="Empresa",
+        email="a@a.cl",
+        linea_credito="1000000.00",
+        linea_disponible="1000000.00",
+        estado=EstadoCliente.ACTIVO,
+    )
+
+
+def _factura(cliente, numero, dias, estado=EstadoFactura.DISPONIBLE):
+    hoy = timezone.localdate()
+    return Factura.objects.create(
+        cliente=cliente,
+        numero_factura=numero,
+        rut_deudor="76.543.210-3",
+        razon_social_deudor="Deudor",
+        monto_total=Decimal("1000.00"),
+        fecha_emision=hoy - timezone.timedelta(days=60),
+        fecha_vencimiento=hoy + timezone.timedelta(days=dias),
+        estado=estado,
+    )
+
+
+def test_barrido_marca_solo_disponibles_vencidas_en_lotes():
+    c = _cliente()
+    vencidas = [_factura(c, f"V-{i}", -(i + 1)) for i in range(5)]
+    vigente = _factura(c, "OK", 10)
+    hoy_vence = _factura(c, "HOY", 0)
+    en_proceso = _factura(c, "EP", -3, estado=EstadoFactura.EN_PROCESO)
+
+    lotes = []
+    total = marcar_facturas_vencidas(tamano_lote=2, al_procesar_lote=lambda n, m: lotes.append(m))
+
+    assert total == 5
+    assert lotes == [2, 2, 1]
+    assert Factura.objects.filter(id__in=[f.id for f in vencidas], estado=EstadoFactura.VENCIDA).count() == 5
+    for f, estado in ((vigente, EstadoFactura.DISPONIBLE), (hoy_vence, EstadoFactura.DISPONIBLE),
+                      (en_proceso, EstadoFactura.EN_PROCESO)):
+        f.refresh_from_db()
+        assert f.estado == estado
+
+    # idempotente: una segunda pasada no encuentra nada
+    assert marcar_facturas_vencidas() == 0
+
+
+def test_comando_y_operacion_con_factura_marcada_vencida():
+    api = APIClient()
+    c = _cliente()
+    f = _factura(c, "V-1", -1)
+
+    call_command("marcar_facturas_vencidas", "--lote", "10")
+    f.refresh_from_db()
+    assert f.estado == EstadoFactura.VENCIDA
+
+    resp = api.post("/api/operaciones/", {"cliente": c.id, "facturas_ids": [f.id]}, format="json")
+    assert resp.status_code == 400
+    assert "vencidas" in str(resp.data).lower()
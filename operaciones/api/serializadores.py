@@ -1,3 +1,4 @@
+from django.conf import settings
 from rest_framework import serializers
 
 from operaciones.modelos import OperacionCesion, EstadoOperacion
@@ -48,3 +49,30 @@ class SerializadorOperacion(serializers.ModelSerializer):
 
 class SerializadorRechazo(serializers.Serializer):
     motivo_rechazo = serializers.CharField(min_length=3)
+
+
+class SerializadorSolicitudLote(serializers.Serializer):
+    cliente = serializers.IntegerField()
+    # Las reglas de facturas_ids (vacías, duplicadas) las valida el dominio
+    facturas_ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=True)
+    tasa_descuento = serializers.DecimalField(max_digits=5, decimal_places=2, required=False, allow_null=True)
+
+
+class SerializadorOperacionLote(serializers.Serializer):
+    operaciones = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=settings.OPERACIONES_LOTE_MAX,
+    )
+
+
+class SerializadorTransicionLote(serializers.Serializer):
+    operaciones_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=settings.OPERACIONES_LOTE_MAX,
+    )
+
+
+class SerializadorRechazoLote(SerializadorTransicionLote):
+    motivo_rechazo = serializers.CharField(min_length=3)
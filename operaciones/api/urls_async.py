@@ -0,0 +1,9 @@
+from django.urls import path
+
+from operaciones.api import vistas_async
+
+urlpatterns = [
+    path("operaciones/", vistas_async.listar_operaciones),
+    path("operaciones/<str:pk>/", vistas_async.detalle_operacion),
+    path("operaciones/<int:pk>/eventos/", vistas_async.eventos_operacion),
+]
@@ -1,20 +1,65 @@
+import json
+
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
-from operaciones.api.serializadores import SerializadorOperacion, SerializadorRechazo
-from operaciones.modelos import OperacionCesion
-from operaciones.selectores import obtener_operaciones_filtradas
+from core import cache_lecturas
+from core.condicional import GetCondicional
+from core.enrutador import alias_lectura
+from core.exportacion import respuesta_exportacion
+from core.idempotencia import idempotente
+from operaciones.api.serializadores import (
+    SerializadorOperacion,
+    SerializadorOperacionLote,
+    SerializadorRechazo,
+    SerializadorRechazoLote,
+    SerializadorSolicitudLote,
+    SerializadorTransicionLote,
+)
+from operaciones.modelos import EstadoOperacion, OperacionCesion
+from operaciones.selectores import (
+    codificar_cursor_evento,
+    obtener_eventos_operacion,
+    obtener_operaciones_filtradas,
+)
 from operaciones.servicios import (
     crear_operacion,
+    crear_operaciones_lote,
     aprobar_operacion,
+    aprobar_operaciones_lote,
     rechazar_operacion,
+    rechazar_operaciones_lote,
     registrar_desembolso,
+    registrar_desembolsos_lote,
     finalizar_operacion_si_pagada,
 )
-from operaciones.modelos import OperacionEvento
 from drf_spectacular.utils import extend_schema, extend_schema_view
 
+EVENTOS_LIMITE_DEFECTO = 100
+EVENTOS_LIMITE_MAX = 500
+EVENTOS_CHUNK = 2000
+
+CAMPOS_EXPORT = (
+    "id",
+    "cliente",
+    "fecha_solicitud",
+    "fecha_aprobacion",
+    "fecha_desembolso",
+    "fecha_finalizacion",
+    "monto_total_facturas",
+    "tasa_descuento",
+    "monto_descuento",
+    "monto_a_desembolsar",
+    "estado",
+    "motivo_rechazo",
+    "creado_en",
+    "actualizado_en",
+)
+
+
 @extend_schema(tags=["Operaciones"])
 @extend_schema_view(
     list=extend_schema(tags=["Operaciones"]),
@@ -23,19 +68,31 @@ from drf_spectacular.utils import extend_schema, extend_schema_view
     update=extend_schema(tags=["Operaciones"]),
     partial_update=extend_schema(tags=["Operaciones"]),
     destroy=extend_schema(tags=["Operaciones"]),
+    export=extend_schema(tags=["Operaciones"]),
     aprobar=extend_schema(tags=["Operaciones"]),
     rechazar=extend_schema(tags=["Operaciones"]),
     desembolsar=extend_schema(tags=["Operaciones"]),
     finalizar=extend_schema(tags=["Operaciones"]),
     eventos=extend_schema(tags=["Operaciones"]),
+    lote=extend_schema(tags=["Operaciones"], request=SerializadorOperacionLote),
+    aprobar_lote=extend_schema(tags=["Operaciones"], request=SerializadorTransicionLote),
+    rechazar_lote=extend_schema(tags=["Operaciones"], request=SerializadorRechazoLote),
+    desembolsar_lote=extend_schema(tags=["Operaciones"], request=SerializadorTransicionLote),
 )
-class VistaOperacion(viewsets.ModelViewSet):
+class VistaOperacion(GetCondicional, cache_lecturas.DetalleCacheado, viewsets.ModelViewSet):
     serializer_class = SerializadorOperacion
+    recurso_cache = cache_lecturas.OPERACION
+    estados_inmutables = (EstadoOperacion.FINALIZADA, EstadoOperacion.RECHAZADA)
     http_method_names = ["get", "post", "head", "options"]
 
     def get_queryset(self):
         return obtener_operaciones_filtradas(self.request.query_params)
 
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request):
+        return respuesta_exportacion(self.get_queryset(), CAMPOS_EXPORT, "operaciones", request.query_params)
+
+    @idempotente
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -46,12 +103,97 @@ class VistaOperacion(viewsets.ModelViewSet):
         )
         return Response(self.get_serializer(operacion).data, status=201)
 
+    @action(detail=False, methods=["post"], url_path="lote")
+    @idempotente
+    def lote(self, request):
+        s = SerializadorOperacionLote(data=request.data)
+        s.is_valid(raise_exception=True)
+        items = s.validated_data["operaciones"]
+
+        resultados = [None] * len(items)
+        indices, solicitudes = [], []
+        for i, item in enumerate(items):
+            si = SerializadorSolicitudLote(data=item)
+            if not si.is_valid():
+                resultados[i] = {"indice": i, "estado": "error", "errores": si.errors}
+                continue
+            indices.append(i)
+            solicitudes.append(
+                {
+                    "cliente_id": si.validated_data["cliente"],
+                    "facturas_ids": si.validated_data["facturas_ids"],
+                    "tasa_descuento": si.validated_data.get("tasa_descuento"),
+                }
+            )
+
+        for i, r in zip(indices, crear_operaciones_lote(solicitudes)):
+            resultados[i] = self._item_lote(i, r, "creada")
+        return self._respuesta_lote(resultados, "creada")
+
+    @action(detail=False, methods=["post"], url_path="aprobar-lote")
+    @idempotente
+    def aprobar_lote(self, request):
+        s = SerializadorTransicionLote(data=request.data)
+        s.is_valid(raise_exception=True)
+        ids = s.validated_data["operaciones_ids"]
+        return self._respuesta_transicion_lote(ids, aprobar_operaciones_lote(ids), "aprobada")
+
+    @action(detail=False, methods=["post"], url_path="rechazar-lote")
+    @idempotente
+    def rechazar_lote(self, request):
+        s = SerializadorRechazoLote(data=request.data)
+        s.is_valid(raise_exception=True)
+        ids = s.validated_data["operaciones_ids"]
+        resultados = rechazar_operaciones_lote(ids, s.validated_data["motivo_rechazo"])
+        return self._respuesta_transicion_lote(ids, resultados, "rechazada")
+
+    @action(detail=False, methods=["post"], url_path="desembolsar-lote")
+    @idempotente
+    def desembolsar_lote(self, request):
+        s = SerializadorTransicionLote(data=request.data)
+        s.is_valid(raise_exception=True)
+        ids = s.validated_data["operaciones_ids"]
+        return self._respuesta_transicion_lote(ids, registrar_desembolsos_lote(ids), "desembolsada")
+
+    def _item_lote(self, indice, resultado, estado_ok):
+        if "operacion" in resultado:
+            return {
+                "indice": indice,
+                "estado": estado_ok,
+                "operacion": self.get_serializer(resultado["operacion"]).data,
+            }
+        return {"indice": indice, "estado": "error", "errores": resultado["errores"]}
+
+    def _respuesta_lote(self, resultados, estado_ok):
+        # Forma de POST /lote/: {"total", "creadas", "fallidas", "resultados"}. Las
+        # transiciones en lote usan la misma, con el conteo nombrado por su
+        # estado ("aprobadas", "rechazadas", "desembolsadas")
+        exitosas = sum(1 for r in resultados if r["estado"] == estado_ok)
+        return Response(
+            {
+                "total": len(resultados),
+                f"{estado_ok}s": exitosas,
+                "fallidas": len(resultados) - exitosas,
+                "resultados": resultados,
+            }
+        )
+
+    def _respuesta_transicion_lote(self, ids, resultados, estado_ok):
+        items = []
+        for i, (op_id, r) in enumerate(zip(ids, resultados)):
+            item = self._item_lote(i, r, estado_ok)
+            item["operacion_id"] = op_id
+            items.append(item)
+        return self._respuesta_lote(items, estado_ok)
+
     @action(detail=True, methods=["post"])
+    @idempotente
     def aprobar(self, request, pk=None):
         operacion = aprobar_operacion(int(pk))
         return Response(self.get_serializer(operacion).data)
 
     @action(detail=True, methods=["post"])
+    @idempotente
     def rechazar(self, request, pk=None):
         s = SerializadorRechazo(data=request.data)
         s.is_valid(raise_exception=True)
@@ -60,28 +202,56 @@ class VistaOperacion(viewsets.ModelViewSet):
         return Response(self.get_serializer(operacion).data)
 
     @action(detail=True, methods=["post"], url_path="desembolsar")
+    @idempotente
     def desembolsar(self, request, pk=None):
         operacion = registrar_desembolso(int(pk))
         return Response(self.get_serializer(operacion).data)
 
     @action(detail=True, methods=["post"], url_path="finalizar")
+    @idempotente
     def finalizar(self, request, pk=None):
         operacion = finalizar_operacion_si_pagada(int(pk))
         return Response(self.get_serializer(operacion).data)
     
     @action(detail=True, methods=["get"], url_path="eventos")
     def eventos(self, request, pk=None):
-        eventos = OperacionEvento.objects.filter(operacion_id=pk).order_by("fecha")
-        data = [
+        eventos = obtener_eventos_operacion(int(pk), request.query_params)
+
+        if request.query_params.get("formato") == "ndjson":
+            filas = eventos.using(alias_lectura()).iterator(chunk_size=EVENTOS_CHUNK)
+            return StreamingHttpResponse(
+                (json.dumps(self._evento_a_dict(e), ensure_ascii=False) + "\n" for e in filas),
+                content_type="application/x-ndjson",
+            )
+
+        limite = self._limite_eventos(request.query_params.get("limite"))
+        pagina = list(eventos[: limite + 1])
+        siguiente = None
+        if len(pagina) > limite:
+            pagina = pagina[:limite]
+            siguiente = codificar_cursor_evento(pagina[-1]["fecha"], pagina[-1]["id"])
+
+        return Response(
             {
-                "id": e.id,
-                "tipo": e.tipo,
-                "fecha": e.fecha.isoformat(),
-                "estado_anterior": e.estado_anterior,
-                "estado_nuevo": e.estado_nuevo,
-                "detalle": e.detalle,
+                "operacion_id": int(pk),
+                "eventos": [self._evento_a_dict(e) for e in pagina],
+                "siguiente": siguiente,
             }
-            for e in eventos
-        ]
-        return Response({"operacion_id": int(pk), "eventos": data})
+        )
+
+    @staticmethod
+    def _limite_eventos(valor) -> int:
+        if valor is None:
+            return EVENTOS_LIMITE_DEFECTO
+        try:
+            limite = int(valor)
+        except ValueError:
+            limite = 0
+        if not 1 <= limite <= EVENTOS_LIMITE_MAX:
+            raise ValidationError({"limite": f"Debe ser un entero entre 1 y {EVENTOS_LIMITE_MAX}."})
+        return limite
+
+    @staticmethod
+    def _evento_a_dict(evento: dict) -> dict:
+        return {**evento, "fecha": evento["fecha"].isoformat()}
 
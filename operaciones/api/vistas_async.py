@@ -0,0 +1,48 @@
+import json
+
+from django.http import StreamingHttpResponse
+
+from core.asincrono import respuesta_detalle, respuesta_json, respuesta_listado, vista_lectura_async
+from core.enrutador import alias_lectura
+from operaciones.api.vistas import EVENTOS_CHUNK, VistaOperacion
+from operaciones.selectores import codificar_cursor_evento, obtener_eventos_operacion, obtener_operaciones_filtradas
+
+
+@vista_lectura_async
+async def listar_operaciones(request):
+    return await respuesta_listado(request, VistaOperacion, obtener_operaciones_filtradas(request.query_params))
+
+
+@vista_lectura_async
+async def detalle_operacion(request, pk):
+    return await respuesta_detalle(request, VistaOperacion, obtener_operaciones_filtradas(request.query_params), pk)
+
+
+@vista_lectura_async
+async def eventos_operacion(request, pk):
+    eventos = obtener_eventos_operacion(pk, request.query_params)
+
+    if request.query_params.get("formato") == "ndjson":
+        # El alias se fija aquí: el stream se consume después de salir del middleware
+        filas = eventos.using(alias_lectura())
+
+        async def lineas():
+            async for evento in filas.aiterator(chunk_size=EVENTOS_CHUNK):
+                yield json.dumps(VistaOperacion._evento_a_dict(evento), ensure_ascii=False) + "\n"
+
+        return StreamingHttpResponse(lineas(), content_type="application/x-ndjson")
+
+    limite = VistaOperacion._limite_eventos(request.query_params.get("limite"))
+    pagina = [evento async for evento in eventos[: limite + 1]]
+    siguiente = None
+    if len(pagina) > limite:
+        pagina = pagina[:limite]
+        siguiente = codificar_cursor_evento(pagina[-1]["fecha"], pagina[-1]["id"])
+
+    return respuesta_json(
+        {
+            "operacion_id": pk,
+            "eventos": [VistaOperacion._evento_a_dict(e) for e in pagina],
+            "siguiente": siguiente,
+        }
+    )
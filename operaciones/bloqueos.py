@@ -0,0 +1,86 @@
+"""
+Capa de bloqueos de operaciones.servicios.
+
+Todos los servicios toman los locks en un único orden global para evitar
+deadlocks entre transacciones concurrentes:
+
+    OperacionCesion -> Factura -> Cliente
+
+y dentro de cada tabla, ordenados por id. El cliente va al final porque los
+servicios individuales lo modifican con un UPDATE atómico de su línea
+(clientes.servicios.consumir_linea / liberar_linea) justo antes de terminar;
+ese UPDATE toma el lock de la fila en ese momento, así que tiene que ser la
+última tabla del orden. (Antes de los UPDATE atómicos el cliente se bloqueaba
+primero con SELECT ... FOR UPDATE; ese orden quedó reemplazado por este.)
+
+ORDEN_GLOBAL es el contrato: test_bloqueos_y_reintentos verifica que cada
+servicio toque las tablas en ese orden. Las funciones retornan dicts por id.
+"""
+from django.db.models import Model
+
+from clientes.modelos import Cliente
+from facturas.modelos import Factura
+from operaciones.modelos import OperacionCesion, OperacionFactura
+
+ORDEN_GLOBAL = (OperacionCesion, Factura, Cliente)
+
+# FOR NO KEY UPDATE no bloquea los FOR KEY SHARE que toman los INSERT con FK
+# hacia la fila (p.ej. crear operaciones o facturas del mismo cliente).
+ACTUALIZAR = "no_key_update"
+# FOR SHARE: impide cambios a la fila sin bloquear otros lectores con SHARE.
+COMPARTIDO = "share"
+
+
+def _bloquear(modelo: type[Model], ids, modo: str) -> dict:
+    ids = sorted(set(ids))
+    if not ids:
+        return {}
+
+    if modo == COMPARTIDO:
+        tabla = modelo._meta.db_table
+        filas = modelo.objects.raw(
+            f'SELECT * FROM "{tabla}" WHERE id = ANY(%s) ORDER BY id FOR SHARE',
+            [ids],
+        )
+    else:
+        filas = modelo.objects.select_for_update(no_key=True).filter(id__in=ids).order_by("id")
+
+    return {fila.id: fila for fila in filas}
+
+
+def bloquear_clientes(ids, modo: str = ACTUALIZAR) -> dict[int, Cliente]:
+    return _bloquear(Cliente, ids, modo)
+
+
+def bloquear_operaciones(ids) -> dict[int, OperacionCesion]:
+    return _bloquear(OperacionCesion, ids, ACTUALIZAR)
+
+
+def bloquear_facturas(ids, modo: str = ACTUALIZAR) -> dict[int, Factura]:
+    return _bloquear(Factura, ids, modo)
+
+
+def facturas_de_operaciones(operaciones_ids) -> dict[int, list[int]]:
+    """operacion_id -> ids de factura, sin lock (la asociación no cambia tras crear)."""
+    resultado: dict[int, list[int]] = {}
+    for op_id, factura_id in (
+        OperacionFactura.objects.filter(operacion_id__in=operaciones_ids)
+        .order_by("factura_id")
+        .values_list("operacion_id", "factura_id")
+    ):
+        resultado.setdefault(op_id, []).append(factura_id)
+    return resultado
+
+
+def bloquear_operaciones_con_facturas(operaciones_ids, modo_facturas: str = ACTUALIZAR):
+    """
+    Bloquea, en el orden global, las operaciones y sus facturas.
+    Retorna (operaciones, facturas, facturas_por_operacion).
+    """
+    operaciones = bloquear_operaciones(operaciones_ids)
+    facturas_por_operacion = facturas_de_operaciones(operaciones.keys())
+    facturas = bloquear_facturas(
+        (fid for fids in facturas_por_operacion.values() for fid in fids),
+        modo_facturas,
+    )
+    return operaciones, facturas, facturas_por_operacion
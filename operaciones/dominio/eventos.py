@@ -1,13 +1,103 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import transaction
+
 from core.request_context import request_id_ctx
-from operaciones.modelos import OperacionEvento
+from operaciones.modelos import EventoOutbox, OperacionEvento
 
-def registrar_evento(*, operacion, tipo, estado_anterior="", estado_nuevo="", detalle=None):
+# Eventos acumulados por la transacción_con_eventos en curso (None: escritura inmediata)
+_buffer_eventos: ContextVar[list[OperacionEvento] | None] = ContextVar("buffer_eventos", default=None)
+
+
+def construir_evento(*, operacion, tipo, estado_anterior="", estado_nuevo="", detalle=None) -> OperacionEvento:
     payload = dict(detalle or {})
     payload["request_id"] = request_id_ctx.get()
-    OperacionEvento.objects.create(
+    return OperacionEvento(
         operacion=operacion,
         tipo=tipo,
         estado_anterior=estado_anterior or "",
         estado_nuevo=estado_nuevo or "",
         detalle=payload,
     )
+
+
+def construir_outbox(evento: OperacionEvento) -> EventoOutbox:
+    return EventoOutbox(
+        evento_id=evento.id,
+        operacion_id=evento.operacion_id,
+        tipo=evento.tipo,
+        payload={
+            "evento_id": evento.id,
+            "operacion_id": evento.operacion_id,
+            "tipo": evento.tipo,
+            "fecha": evento.fecha,
+            "estado_anterior": evento.estado_anterior,
+            "estado_nuevo": evento.estado_nuevo,
+            "detalle": evento.detalle,
+        },
+    )
+
+
+def _escribir_eventos(eventos: list[OperacionEvento]) -> None:
+    if not eventos:
+        return
+    # bulk_create en PostgreSQL devuelve los ids, necesarios para el outbox
+    OperacionEvento.objects.bulk_create(eventos)
+    EventoOutbox.objects.bulk_create([construir_outbox(e) for e in eventos])
+
+
+@contextmanager
+def _transaccion_con_eventos(using):
+    padre = _buffer_eventos.get()
+    buffer: list[OperacionEvento] = []
+    token = _buffer_eventos.set(buffer)
+    try:
+        with transaction.atomic(using=using):
+            yield
+            if padre is None:
+                _escribir_eventos(buffer)
+    finally:
+        _buffer_eventos.reset(token)
+    # Bloque anidado (savepoint) confirmado: sus eventos pasan al bloque externo
+    if padre is not None:
+        padre.extend(buffer)
+
+
+def transaccion_con_eventos(func=None, *, using=None):
+    """
+    transaction.atomic que acumula los eventos registrados dentro del bloque y
+    los inserta con un solo bulk_create (eventos + outbox) justo antes del commit.
+
+    Si el bloque falla no se escribe nada. Los bloques anidados funcionan como
+    savepoints: sus eventos se descartan si el savepoint se revierte y, si no,
+    se suman al bloque externo. Fuera de un bloque, registrar_evento escribe de
+    inmediato, lo que permite usarlo en comandos y scripts.
+
+    Se usa como decorador (con o sin paréntesis) o como context manager.
+    """
+    if callable(func):
+        return _transaccion_con_eventos(using)(func)
+    return _transaccion_con_eventos(using)
+
+
+def registrar_evento(*, operacion, tipo, estado_anterior="", estado_nuevo="", detalle=None):
+    registrar_eventos_lote(
+        [
+            construir_evento(
+                operacion=operacion,
+                tipo=tipo,
+                estado_anterior=estado_anterior,
+                estado_nuevo=estado_nuevo,
+                detalle=detalle,
+            )
+        ]
+    )
+
+
+def registrar_eventos_lote(eventos: list[OperacionEvento]) -> None:
+    buffer = _buffer_eventos.get()
+    if buffer is not None:
+        buffer.extend(eventos)
+    else:
+        _escribir_eventos(eventos)
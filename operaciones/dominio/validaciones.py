@@ -5,6 +5,9 @@ from clientes.modelos import EstadoCliente
 from facturas.modelos import EstadoFactura
 from operaciones.modelos.operacion_cesion import EstadoOperacion
 
+# Estados desde los que una operación puede finalizar por pago
+ESTADOS_FINALIZABLES = (EstadoOperacion.APROBADA, EstadoOperacion.DESEMBOLSADA)
+
 def validar_cliente_activo(cliente):
     if cliente.estado != EstadoCliente.ACTIVO:
         raise ValidationError({"cliente": "El cliente debe estar en estado ACTIVO para cursar operaciones."})
@@ -23,13 +26,19 @@ def validar_facturas_mismo_cliente(facturas, cliente_id):
     if any(f.cliente_id != cliente_id for f in facturas):
         raise ValidationError({"facturas_ids": "Todas las facturas deben pertenecer al mismo cliente."})
 
+def _esta_vencida(factura, hoy) -> bool:
+    # Marcada por el barrido de vencidas, o vencida desde la última pasada
+    return factura.estado == EstadoFactura.VENCIDA or factura.fecha_vencimiento < hoy
+
 def validar_facturas_disponibles(facturas):
-    no_disponibles = [f.id for f in facturas if f.estado != EstadoFactura.DISPONIBLE]
+    no_disponibles = [
+        f.id for f in facturas if f.estado not in (EstadoFactura.DISPONIBLE, EstadoFactura.VENCIDA)
+    ]
     if no_disponibles:
         raise ValidationError({"facturas_ids": f"Facturas no disponibles: {no_disponibles}."})
 
 def validar_facturas_no_vencidas(facturas, hoy):
-    vencidas = [f.id for f in facturas if f.fecha_vencimiento < hoy]
+    vencidas = [f.id for f in facturas if _esta_vencida(f, hoy)]
     if vencidas:
         raise ValidationError({"facturas_ids": f"No se pueden incluir facturas vencidas: {vencidas}."})
 
@@ -62,7 +71,7 @@ def validar_operacion_aprobada_para_desembolsar(operacion):
         raise ValidationError({"estado": "Solo se puede desembolsar una operación aprobada."})
 
 def validar_operacion_estado_para_finalizar(operacion):
-    if operacion.estado not in (EstadoOperacion.APROBADA, EstadoOperacion.DESEMBOLSADA):
+    if operacion.estado not in ESTADOS_FINALIZABLES:
         raise ValidationError({"estado": "Solo se puede finalizar una operación aprobada o desembolsada."})
 
 def validar_operacion_tiene_facturas(facturas):
@@ -70,18 +79,25 @@ def validar_operacion_tiene_facturas(facturas):
         raise ValidationError({"facturas": "La operación no tiene facturas asociadas."})
 
 def validar_facturas_siguen_disponibles_para_aprobar(facturas, hoy):
-    if any(f.estado != EstadoFactura.DISPONIBLE for f in facturas):
+    if any(f.estado not in (EstadoFactura.DISPONIBLE, EstadoFactura.VENCIDA) for f in facturas):
         raise ValidationError({"facturas": "La operación contiene facturas que ya no están disponibles."})
-    if any(f.fecha_vencimiento < hoy for f in facturas):
+    if any(_esta_vencida(f, hoy) for f in facturas):
         raise ValidationError({"facturas": "La operación contiene facturas vencidas."})
 
 def validar_facturas_pagadas_para_finalizar(facturas):
     if any(f.estado != EstadoFactura.PAGADA for f in facturas):
         raise ValidationError({"facturas": "No se puede finalizar: no todas las facturas están pagadas."})
 
+_MSG_LINEA_INSUFICIENTE = "El monto excede la línea disponible del cliente."
+
 def validar_linea_disponible_suficiente(cliente, monto_operacion):
     if monto_operacion > cliente.linea_disponible:
-        raise ValidationError({"linea_disponible": "El monto excede la línea disponible del cliente."})
+        raise ValidationError({"linea_disponible": _MSG_LINEA_INSUFICIENTE})
+
+def validar_linea_consumida(lineas):
+    # lineas: resultado de clientes.servicios.consumir_linea (None si no alcanzó)
+    if lineas is None:
+        raise ValidationError({"linea_disponible": _MSG_LINEA_INSUFICIENTE})
 
 def validar_monto_operacion_positivo(monto):
     if monto <= Decimal("0.00"):
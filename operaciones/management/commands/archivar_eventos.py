@@ -0,0 +1,27 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from operaciones.particiones import archivar_particion, particiones_a_archivar
+
+
+class Command(BaseCommand):
+    help = "Archiva en JSONL comprimido y elimina las particiones de eventos más antiguas que la retención"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--retencion-meses", type=int, default=12, help="Meses completos a conservar en BD")
+        parser.add_argument("--destino", required=True, help="Directorio donde dejar los archivos .jsonl.gz")
+
+    def handle(self, *args, **options):
+        if options["retencion_meses"] < 1:
+            raise CommandError("--retencion-meses debe ser mayor o igual a 1.")
+        destino = Path(options["destino"])
+        if not destino.is_dir():
+            raise CommandError(f"El directorio de destino no existe: {destino}")
+
+        nombres = particiones_a_archivar(options["retencion_meses"], timezone.now().date())
+        for nombre in nombres:
+            ruta, filas = archivar_particion(nombre, destino)
+            self.stdout.write(f"  📦 {nombre}: {filas} eventos → {ruta}")
+        self.stdout.write(self.style.SUCCESS(f"✔ Particiones archivadas: {len(nombres)}"))
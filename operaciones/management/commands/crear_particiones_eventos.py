@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from operaciones.particiones import crear_particiones_futuras
+
+
+class Command(BaseCommand):
+    help = "Crea por adelantado las particiones mensuales de la tabla de eventos de operaciones"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--meses", type=int, default=3, help="Meses a crear por delante del actual")
+
+    def handle(self, *args, **options):
+        creadas = crear_particiones_futuras(options["meses"], timezone.now().date())
+        for nombre in creadas:
+            self.stdout.write(f"  + {nombre}")
+        self.stdout.write(self.style.SUCCESS(f"✔ Particiones creadas: {len(creadas)}"))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from operaciones.servicios import barrer_operaciones_pagadas
+
+
+class Command(BaseCommand):
+    help = "Finaliza todas las operaciones aprobadas/desembolsadas cuyas facturas están pagadas"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lote", type=int, default=500, help="Operaciones finalizadas por transacción")
+
+    def handle(self, *args, **options):
+        self.stdout.write("🧾 Barrido de operaciones pagadas...")
+
+        def informar(numero_lote, finalizadas):
+            self.stdout.write(f"  lote {numero_lote}: {finalizadas} operaciones")
+
+        total = barrer_operaciones_pagadas(tamano_lote=options["lote"], al_procesar_lote=informar)
+        self.stdout.write(self.style.SUCCESS(f"✔ Operaciones finalizadas: {total}"))
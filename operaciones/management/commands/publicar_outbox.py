@@ -0,0 +1,55 @@
+import threading
+
+from django.core.management.base import BaseCommand, CommandError
+
+from operaciones.outbox import ejecutar_publicador
+
+
+class Command(BaseCommand):
+    help = "Publica los eventos pendientes del outbox de operaciones en el sink configurado"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=1, help="Workers en paralelo (uno por partición)")
+        parser.add_argument("--lote", type=int, default=500, help="Eventos publicados por transacción")
+        parser.add_argument("--intervalo", type=float, default=1.0, help="Segundos de espera sin pendientes")
+        parser.add_argument("--una-vez", action="store_true", help="Vaciar el outbox y terminar")
+
+    def handle(self, *args, **options):
+        workers = options["workers"]
+        if workers < 1:
+            raise CommandError("--workers debe ser mayor o igual a 1.")
+
+        detener = threading.Event()
+        totales = [0] * workers
+        errores = []
+
+        def worker(particion):
+            try:
+                totales[particion] = ejecutar_publicador(
+                    particion=particion,
+                    particiones=workers,
+                    tamano_lote=options["lote"],
+                    intervalo=options["intervalo"],
+                    detener=detener,
+                    hasta_vaciar=options["una_vez"],
+                )
+            except Exception as exc:
+                errores.append(exc)
+
+        hilos = [threading.Thread(target=worker, args=(i,), name=f"outbox-{i}") for i in range(workers)]
+        for hilo in hilos:
+            hilo.start()
+
+        self.stdout.write(f"📤 Publicando outbox con {workers} worker(s)...")
+        try:
+            for hilo in hilos:
+                while hilo.is_alive():
+                    hilo.join(timeout=0.5)
+        except KeyboardInterrupt:
+            detener.set()
+            for hilo in hilos:
+                hilo.join()
+
+        if errores:
+            raise CommandError(f"Error publicando outbox: {errores[0]}")
+        self.stdout.write(self.style.SUCCESS(f"✔ Eventos publicados: {sum(totales)}"))
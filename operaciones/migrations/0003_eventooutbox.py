@@ -0,0 +1,30 @@
+# Generated by Django 4.2.28 on 2026-10-17 10:44
+
+import django.core.serializers.json
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('operaciones', '0002_operacionevento'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventoOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('evento_id', models.BigIntegerField()),
+                ('operacion_id', models.BigIntegerField()),
+                ('tipo', models.CharField(max_length=20)),
+                ('payload', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('creado_en', models.DateTimeField(default=django.utils.timezone.now)),
+                ('enviado_en', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('enviado_en__isnull', True)), fields=['id'], name='outbox_pendientes_idx'), models.Index(fields=['enviado_en'], name='operaciones_enviado_da03df_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.28 on 2026-10-17 10:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('operaciones', '0003_eventooutbox'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='operacionevento',
+            index=models.Index(fields=['operacion', 'fecha', 'id'], name='operaciones_operaci_2552dd_idx'),
+        ),
+    ]
@@ -0,0 +1,99 @@
+from django.db import migrations
+
+# Convierte operaciones_operacionevento en una tabla particionada por rango
+# mensual de `fecha`. En la BD la PK pasa a ser (id, fecha), requisito de
+# Postgres para particionar; para Django `id` sigue siendo la PK, así que el
+# estado de migraciones no cambia. Se crean particiones para los meses con
+# datos y los dos siguientes, más una partición DEFAULT para lo que quede fuera.
+PARTICIONAR = """
+ALTER TABLE operaciones_operacionevento RENAME TO operaciones_operacionevento_previa;
+ALTER TABLE operaciones_operacionevento_previa
+    RENAME CONSTRAINT operaciones_operacionevento_pkey TO operaciones_operacionevento_previa_pkey;
+DROP INDEX operaciones_operacionevento_operacion_id_bd3169b5;
+DROP INDEX operaciones_tipo_87151e_idx;
+DROP INDEX operaciones_fecha_7f9dbc_idx;
+DROP INDEX operaciones_operaci_2552dd_idx;
+
+CREATE SEQUENCE operaciones_operacionevento_id_seq_nueva;
+
+CREATE TABLE operaciones_operacionevento (
+    id bigint NOT NULL DEFAULT nextval('operaciones_operacionevento_id_seq_nueva'),
+    tipo varchar(20) NOT NULL,
+    fecha timestamp with time zone NOT NULL,
+    estado_anterior varchar(20) NOT NULL,
+    estado_nuevo varchar(20) NOT NULL,
+    detalle jsonb NOT NULL,
+    operacion_id bigint NOT NULL,
+    CONSTRAINT operaciones_operacionevento_pkey PRIMARY KEY (id, fecha),
+    CONSTRAINT operaciones_operacio_operacion_id_bd3169b5_fk_operacion
+        FOREIGN KEY (operacion_id) REFERENCES operaciones_operacioncesion (id) DEFERRABLE INITIALLY DEFERRED
+) PARTITION BY RANGE (fecha);
+
+ALTER SEQUENCE operaciones_operacionevento_id_seq_nueva OWNED BY operaciones_operacionevento.id;
+
+CREATE INDEX operaciones_operacionevento_operacion_id_bd3169b5 ON operaciones_operacionevento (operacion_id);
+CREATE INDEX operaciones_tipo_87151e_idx ON operaciones_operacionevento (tipo);
+CREATE INDEX operaciones_fecha_7f9dbc_idx ON operaciones_operacionevento (fecha);
+CREATE INDEX operaciones_operaci_2552dd_idx ON operaciones_operacionevento (operacion_id, fecha, id);
+
+CREATE TABLE operaciones_operacionevento_default PARTITION OF operaciones_operacionevento DEFAULT;
+
+DO $$
+DECLARE
+    mes date;
+    hasta date := (date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months')::date;
+BEGIN
+    SELECT date_trunc('month', coalesce(min(fecha), now()) AT TIME ZONE 'UTC')::date
+      INTO mes
+      FROM operaciones_operacionevento_previa;
+    WHILE mes < hasta LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF operaciones_operacionevento FOR VALUES FROM (%L) TO (%L)',
+            'operaciones_operacionevento_p' || to_char(mes, 'YYYYMM'),
+            mes::timestamp AT TIME ZONE 'UTC',
+            (mes + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+        );
+        mes := (mes + interval '1 month')::date;
+    END LOOP;
+END $$;
+
+INSERT INTO operaciones_operacionevento (id, tipo, fecha, estado_anterior, estado_nuevo, detalle, operacion_id)
+SELECT id, tipo, fecha, estado_anterior, estado_nuevo, detalle, operacion_id
+  FROM operaciones_operacionevento_previa;
+
+SELECT setval(
+    'operaciones_operacionevento_id_seq_nueva',
+    (SELECT coalesce(max(id), 0) + 1 FROM operaciones_operacionevento_previa),
+    false
+);
+
+DROP TABLE operaciones_operacionevento_previa;
+ALTER SEQUENCE operaciones_operacionevento_id_seq_nueva RENAME TO operaciones_operacionevento_id_seq;
+"""
+
+DESPARTICIONAR = """
+CREATE TABLE operaciones_operacionevento_plana (LIKE operaciones_operacionevento INCLUDING DEFAULTS);
+INSERT INTO operaciones_operacionevento_plana SELECT * FROM operaciones_operacionevento;
+ALTER SEQUENCE operaciones_operacionevento_id_seq OWNED BY operaciones_operacionevento_plana.id;
+DROP TABLE operaciones_operacionevento;
+ALTER TABLE operaciones_operacionevento_plana RENAME TO operaciones_operacionevento;
+
+ALTER TABLE operaciones_operacionevento ADD CONSTRAINT operaciones_operacionevento_pkey PRIMARY KEY (id);
+ALTER TABLE operaciones_operacionevento ADD CONSTRAINT operaciones_operacio_operacion_id_bd3169b5_fk_operacion
+    FOREIGN KEY (operacion_id) REFERENCES operaciones_operacioncesion (id) DEFERRABLE INITIALLY DEFERRED;
+CREATE INDEX operaciones_operacionevento_operacion_id_bd3169b5 ON operaciones_operacionevento (operacion_id);
+CREATE INDEX operaciones_tipo_87151e_idx ON operaciones_operacionevento (tipo);
+CREATE INDEX operaciones_fecha_7f9dbc_idx ON operaciones_operacionevento (fecha);
+CREATE INDEX operaciones_operaci_2552dd_idx ON operaciones_operacionevento (operacion_id, fecha, id);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('operaciones', '0004_operacionevento_operaciones_operaci_2552dd_idx'),
+    ]
+
+    operations = [
+        migrations.RunSQL(PARTICIONAR, reverse_sql=DESPARTICIONAR),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.28 on 2026-10-17 10:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('operaciones', '0005_particionar_operacionevento'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='operacioncesion',
+            name='operaciones_fecha_s_cd24ba_idx',
+        ),
+        migrations.AddIndex(
+            model_name='operacioncesion',
+            index=models.Index(fields=['fecha_solicitud', 'id'], name='operaciones_fecha_s_a4650a_idx'),
+        ),
+    ]
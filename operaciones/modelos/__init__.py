@@ -1,3 +1,4 @@
 from .operacion_cesion import OperacionCesion, EstadoOperacion
 from .operacion_factura import OperacionFactura
-from .evento import OperacionEvento, TipoEventoOperacion 
+from .evento import OperacionEvento, TipoEventoOperacion
+from .outbox import EventoOutbox
@@ -13,6 +13,8 @@ class TipoEventoOperacion(models.TextChoices):
 
 
 class OperacionEvento(models.Model):
+    # En BD la tabla está particionada por mes de `fecha` con PK (id, fecha);
+    # ver migración 0005 y operaciones/particiones.py
     operacion = models.ForeignKey(OperacionCesion, on_delete=models.CASCADE, related_name="eventos")
     tipo = models.CharField(max_length=20, choices=TipoEventoOperacion.choices)
     fecha = models.DateTimeField(default=timezone.now)
@@ -27,4 +29,5 @@ class OperacionEvento(models.Model):
         indexes = [
             models.Index(fields=["tipo"]),
             models.Index(fields=["fecha"]),
+            models.Index(fields=["operacion", "fecha", "id"]),
         ]
@@ -42,7 +42,7 @@ class OperacionCesion(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=["estado"]),
-            models.Index(fields=["fecha_solicitud"]),
+            models.Index(fields=["fecha_solicitud", "id"]),
         ]
 
     def __str__(self) -> str:
@@ -0,0 +1,35 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class EventoOutbox(models.Model):
+    """
+    Copia de un OperacionEvento pendiente de publicar hacia sistemas externos.
+
+    Se escribe en la misma transacción que el evento. evento_id y operacion_id
+    se guardan como enteros (sin FK) para no acoplar el outbox al ciclo de vida
+    de la tabla de eventos.
+    """
+
+    evento_id = models.BigIntegerField()
+    operacion_id = models.BigIntegerField()
+    tipo = models.CharField(max_length=20)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+
+    creado_en = models.DateTimeField(default=timezone.now)
+    enviado_en = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=Q(enviado_en__isnull=True),
+                name="outbox_pendientes_idx",
+            ),
+            models.Index(fields=["enviado_en"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.tipo} op={self.operacion_id} evento={self.evento_id}"
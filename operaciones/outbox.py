@@ -0,0 +1,111 @@
+import json
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models.functions import Mod
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from core import metricas
+from operaciones.modelos import EventoOutbox
+
+logger = logging.getLogger(__name__)
+
+# Primer componente de pg_try_advisory_xact_lock(clave, particion) del publicador
+_CLAVE_LOCK_PARTICION = 0x6F7574
+
+
+class SinkArchivoJsonl:
+    """Sink local: agrega cada mensaje como una línea JSON al archivo OUTBOX_ARCHIVO."""
+
+    _lock = threading.Lock()
+
+    def __init__(self, ruta: str | None = None):
+        self.ruta = ruta or settings.OUTBOX_ARCHIVO
+
+    def publicar(self, mensajes: list[dict]) -> None:
+        lineas = "".join(json.dumps(m, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n" for m in mensajes)
+        with self._lock, open(self.ruta, "a", encoding="utf-8") as f:
+            f.write(lineas)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def obtener_sink():
+    return import_string(settings.OUTBOX_SINK)()
+
+
+def publicar_lote(*, particion: int = 0, particiones: int = 1, tamano_lote: int = 500, sink=None) -> int:
+    """
+    Publica hasta `tamano_lote` eventos pendientes de una partición y los marca enviados.
+
+    Los eventos se reparten por operacion_id % particiones; cada partición la
+    procesa un solo publicador a la vez (advisory lock de transacción), en orden
+    de id, de modo que los eventos de una operación salen en orden. Si el sink
+    falla la transacción se revierte y el lote se reintenta: la entrega es
+    at-least-once y el consumidor debe deduplicar por `id`.
+
+    Retorna la cantidad de eventos publicados (0 si no hay pendientes o si
+    otro publicador tiene la partición).
+    """
+    sink = sink or obtener_sink()
+
+    with transaction.atomic():
+        with connection.cursor() as cur:
+            cur.execute("SELECT pg_try_advisory_xact_lock(%s, %s)", [_CLAVE_LOCK_PARTICION, particion])
+            if not cur.fetchone()[0]:
+                return 0
+
+        pendientes = list(
+            EventoOutbox.objects.select_for_update(skip_locked=True)
+            .annotate(particion=Mod("operacion_id", particiones))
+            .filter(enviado_en__isnull=True, particion=particion)
+            .order_by("id")
+            .values("id", "payload")[:tamano_lote]
+        )
+        if not pendientes:
+            return 0
+
+        sink.publicar([{"id": p["id"], **p["payload"]} for p in pendientes])
+        EventoOutbox.objects.filter(id__in=[p["id"] for p in pendientes]).update(enviado_en=timezone.now())
+
+    metricas.incrementar("outbox.publicados", len(pendientes))
+    return len(pendientes)
+
+
+def ejecutar_publicador(
+    *,
+    particion: int,
+    particiones: int,
+    tamano_lote: int,
+    intervalo: float,
+    detener: threading.Event,
+    hasta_vaciar: bool = False,
+) -> int:
+    """Bucle de un worker: publica lotes de su partición hasta que se pida detener."""
+    sink = obtener_sink()
+    total = 0
+    try:
+        while not detener.is_set():
+            try:
+                publicados = publicar_lote(
+                    particion=particion, particiones=particiones, tamano_lote=tamano_lote, sink=sink
+                )
+            except Exception:
+                metricas.incrementar("outbox.errores")
+                logger.exception("Error publicando outbox", extra={"particion": particion})
+                publicados = 0
+                if hasta_vaciar:
+                    raise
+            total += publicados
+            if publicados < tamano_lote:
+                if hasta_vaciar:
+                    break
+                detener.wait(intervalo)
+    finally:
+        connection.close()
+    return total
@@ -0,0 +1,140 @@
+import gzip
+import os
+import re
+from datetime import date
+from pathlib import Path
+
+from django.db import connection, transaction
+
+from operaciones.modelos import OperacionEvento
+
+# Tabla particionada por mes de `fecha` (migración 0005): <tabla>_pYYYYMM + <tabla>_default
+TABLA = OperacionEvento._meta.db_table
+DEFECTO = f"{TABLA}_default"
+_PATRON_PARTICION = re.compile(rf"^{TABLA}_p(\d{{4}})(\d{{2}})$")
+
+
+def inicio_mes(d: date) -> date:
+    return d.replace(day=1)
+
+
+def sumar_meses(mes: date, n: int) -> date:
+    total = mes.year * 12 + (mes.month - 1) + n
+    return date(total // 12, total % 12 + 1, 1)
+
+
+def nombre_particion(mes: date) -> str:
+    return f"{TABLA}_p{mes:%Y%m}"
+
+
+def _mes_de(nombre: str) -> date:
+    m = _PATRON_PARTICION.match(nombre)
+    return date(int(m.group(1)), int(m.group(2)), 1)
+
+
+def _limite(mes: date) -> str:
+    # Literal timestamptz en UTC; se interpola porque DDL no admite parámetros
+    return f"'{mes.isoformat()} 00:00:00+00'"
+
+
+def particiones_mensuales() -> dict[date, tuple[str, bool]]:
+    """
+    Tablas mensuales de eventos existentes: {mes: (nombre, adjunta)}.
+    Incluye las ya separadas de la tabla padre pendientes de archivar.
+    """
+    with connection.cursor() as cur:
+        cur.execute(
+            "SELECT relname, relispartition FROM pg_class WHERE relkind = 'r' AND relname LIKE %s",
+            [f"{TABLA}_p%"],
+        )
+        filas = cur.fetchall()
+
+    meses = {}
+    for nombre, adjunta in filas:
+        m = _PATRON_PARTICION.match(nombre)
+        if m:
+            meses[date(int(m.group(1)), int(m.group(2)), 1)] = (nombre, adjunta)
+    return meses
+
+
+@transaction.atomic
+def crear_particion(mes: date) -> bool:
+    """
+    Crea la partición del mes si no existe. Los eventos de ese mes que hayan
+    caído en la partición DEFAULT se mueven a la nueva antes de adjuntarla.
+    Retorna True si la creó.
+    """
+    mes = inicio_mes(mes)
+    if mes in particiones_mensuales():
+        return False
+
+    nombre = nombre_particion(mes)
+    desde, hasta = mes, sumar_meses(mes, 1)
+    with connection.cursor() as cur:
+        cur.execute(f'CREATE TABLE "{nombre}" (LIKE "{TABLA}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+        cur.execute(
+            f"""
+            WITH movidos AS (
+                DELETE FROM "{DEFECTO}" WHERE fecha >= {_limite(desde)} AND fecha < {_limite(hasta)}
+                RETURNING *
+            )
+            INSERT INTO "{nombre}" SELECT * FROM movidos
+            """
+        )
+        cur.execute(
+            f'ALTER TABLE "{TABLA}" ATTACH PARTITION "{nombre}" '
+            f"FOR VALUES FROM ({_limite(desde)}) TO ({_limite(hasta)})"
+        )
+    return True
+
+
+def crear_particiones_futuras(meses: int, hoy: date) -> list[str]:
+    """Asegura particiones desde el mes de `hoy` hasta `meses` meses adelante."""
+    actual = inicio_mes(hoy)
+    creadas = []
+    for i in range(meses + 1):
+        mes = sumar_meses(actual, i)
+        if crear_particion(mes):
+            creadas.append(nombre_particion(mes))
+    return creadas
+
+
+def particiones_a_archivar(retencion_meses: int, hoy: date) -> list[str]:
+    """Particiones (adjuntas o ya separadas) de meses anteriores a la retención, de la más antigua a la más nueva."""
+    corte = sumar_meses(inicio_mes(hoy), -retencion_meses)
+    return [nombre for mes, (nombre, _) in sorted(particiones_mensuales().items()) if mes < corte]
+
+
+def archivar_particion(nombre: str, destino: Path, tamano_lote: int = 5000) -> tuple[Path, int]:
+    """
+    Separa la partición de la tabla padre, exporta sus filas a
+    <destino>/<nombre>.jsonl.gz y recién entonces la elimina.
+
+    Cada paso es reanudable: si la exportación falla la tabla queda separada
+    (fuera de las consultas) y la próxima ejecución la vuelve a exportar.
+    """
+    if not _PATRON_PARTICION.match(nombre):
+        raise ValueError(f"No es una partición mensual de eventos: {nombre}")
+
+    _, adjunta = particiones_mensuales().get(_mes_de(nombre), (nombre, False))
+    if adjunta:
+        with transaction.atomic(), connection.cursor() as cur:
+            cur.execute(f'ALTER TABLE "{TABLA}" DETACH PARTITION "{nombre}"')
+
+    ruta = destino / f"{nombre}.jsonl.gz"
+    temporal = ruta.with_name(ruta.name + ".tmp")
+    filas = 0
+    with transaction.atomic():
+        with connection.chunked_cursor() as cur, open(temporal, "wb") as archivo:
+            cur.execute(f'SELECT row_to_json(e)::text FROM "{nombre}" e ORDER BY fecha, id')
+            with gzip.GzipFile(fileobj=archivo, mode="wb") as gz:
+                while lote := cur.fetchmany(tamano_lote):
+                    gz.write("".join(linea + "\n" for (linea,) in lote).encode())
+                    filas += len(lote)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+    os.replace(temporal, ruta)
+
+    with transaction.atomic(), connection.cursor() as cur:
+        cur.execute(f'DROP TABLE "{nombre}"')
+    return ruta, filas
@@ -1,7 +1,12 @@
-from datetime import date
+import base64
+from datetime import date, datetime
+
+from django.db.models import Q
 from rest_framework.exceptions import ValidationError
 
-from operaciones.modelos import OperacionCesion
+from operaciones.modelos import OperacionCesion, OperacionEvento, TipoEventoOperacion
+
+CAMPOS_EVENTO = ("id", "tipo", "fecha", "estado_anterior", "estado_nuevo", "detalle")
 
 
 def _parse_date(name: str, value: str) -> date:
@@ -12,7 +17,7 @@ def _parse_date(name: str, value: str) -> date:
 
 
 def obtener_operaciones_filtradas(params):
-    qs = OperacionCesion.objects.select_related("cliente").all().order_by("-fecha_solicitud")
+    qs = OperacionCesion.objects.select_related("cliente").all().order_by("-fecha_solicitud", "-id")
 
     cliente_id = params.get("cliente_id")
     if cliente_id:
@@ -31,3 +36,39 @@ def obtener_operaciones_filtradas(params):
         qs = qs.filter(fecha_solicitud__date__lte=_parse_date("fecha_hasta", fecha_hasta))
 
     return qs
+
+
+def codificar_cursor_evento(fecha: datetime, evento_id: int) -> str:
+    crudo = f"{fecha.isoformat()}|{evento_id}".encode()
+    return base64.urlsafe_b64encode(crudo).decode().rstrip("=")
+
+
+def _decodificar_cursor_evento(cursor: str) -> tuple[datetime, int]:
+    try:
+        crudo = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        fecha, evento_id = crudo.split("|")
+        return datetime.fromisoformat(fecha), int(evento_id)
+    except ValueError:
+        raise ValidationError({"cursor": "Cursor inválido."})
+
+
+def obtener_eventos_operacion(operacion_id: int, params):
+    """
+    Eventos de una operación en orden (fecha, id) como diccionarios, listos
+    para paginar por keyset sobre el índice (operacion_id, fecha, id).
+    """
+    qs = OperacionEvento.objects.filter(operacion_id=operacion_id).order_by("fecha", "id")
+
+    tipo = params.get("tipo")
+    if tipo:
+        if tipo not in TipoEventoOperacion.values:
+            raise ValidationError({"tipo": f"Tipo de evento inválido. Opciones: {TipoEventoOperacion.values}."})
+        qs = qs.filter(tipo=tipo)
+
+    cursor = params.get("cursor")
+    if cursor:
+        fecha, evento_id = _decodificar_cursor_evento(cursor)
+        # (fecha, id) > cursor; el fecha >= acota el rango del índice
+        qs = qs.filter(Q(fecha__gte=fecha) & (Q(fecha__gt=fecha) | Q(id__gt=evento_id)))
+
+    return qs.values(*CAMPOS_EVENTO)
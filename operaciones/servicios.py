@@ -2,17 +2,35 @@ import logging
 from datetime import date
 from decimal import Decimal
 
-from django.db import transaction
+from django.db import connection
+from django.db.models import Case, DecimalField, Value, When
 from django.utils import timezone
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import NotFound, ValidationError
 
 from clientes.modelos import Cliente
+from clientes.servicios import consumir_linea, liberar_linea, liberar_lineas
+from core import cache_lecturas
+from core.reintentos import con_reintentos
 from facturas.modelos import Factura
 from facturas.modelos.factura import EstadoFactura
+from facturas.servicios import marcar_pagada, marcar_pagadas_lote
+from operaciones.bloqueos import (
+    COMPARTIDO,
+    bloquear_clientes,
+    bloquear_facturas,
+    bloquear_operaciones,
+    bloquear_operaciones_con_facturas,
+)
 from operaciones.modelos import OperacionCesion, OperacionFactura, EstadoOperacion, TipoEventoOperacion
 from operaciones.dominio.calculos import calcular_descuento
-from operaciones.dominio.eventos import registrar_evento
+from operaciones.dominio.eventos import (
+    construir_evento,
+    registrar_evento,
+    registrar_eventos_lote,
+    transaccion_con_eventos,
+)
 from operaciones.dominio.validaciones import (
+    ESTADOS_FINALIZABLES,
     validar_cliente_activo,
     validar_facturas_ids,
     validar_facturas_existen,
@@ -21,6 +39,7 @@ from operaciones.dominio.validaciones import (
     validar_facturas_no_vencidas,
     validar_facturas_pagadas_para_finalizar,
     validar_facturas_siguen_disponibles_para_aprobar,
+    validar_linea_consumida,
     validar_linea_disponible_suficiente,
     validar_monto_total_positivo,
     obtener_tasa,
@@ -39,37 +58,22 @@ def _hoy() -> date:
     return timezone.localdate()
 
 
-@transaction.atomic
-def crear_operacion(cliente_id: int, facturas_ids: list[int], tasa_descuento: Decimal | None = None) -> OperacionCesion:
-    validar_facturas_ids(facturas_ids)
-
-    cliente = Cliente.objects.select_for_update().get(id=cliente_id)
-    validar_cliente_activo(cliente)
-
-    facturas = list(
-        Factura.objects.select_for_update()
-        .filter(id__in=facturas_ids)
-        .select_related("cliente")
-    )
-
+def _preparar_operacion(cliente, facturas, facturas_ids, tasa, hoy) -> OperacionCesion:
+    """Valida las facturas de una solicitud y arma la operación (sin guardar)."""
     validar_facturas_existen(facturas, facturas_ids)
     validar_facturas_mismo_cliente(facturas, cliente.id)
     validar_facturas_disponibles(facturas)
-
-    hoy = _hoy()
     validar_facturas_no_vencidas(facturas, hoy)
 
     monto_total = sum((f.monto_total for f in facturas), Decimal("0.00"))
     validar_monto_total_positivo(monto_total)
 
-    tasa = obtener_tasa(tasa_descuento)
-
     venc_mas_lejano = max(f.fecha_vencimiento for f in facturas)
     dias = (venc_mas_lejano - hoy).days
 
     monto_desc, monto_desemb = calcular_descuento(monto_total, tasa, dias)
 
-    operacion = OperacionCesion.objects.create(
+    return OperacionCesion(
         cliente=cliente,
         fecha_solicitud=timezone.now(),
         tasa_descuento=tasa,
@@ -79,6 +83,50 @@ def crear_operacion(cliente_id: int, facturas_ids: list[int], tasa_descuento: De
         estado=EstadoOperacion.PENDIENTE,
     )
 
+
+def _detalle_creacion(operacion: OperacionCesion, facturas_ids: list[int]) -> dict:
+    return {
+        "facturas_ids": facturas_ids,
+        "monto_total_facturas": str(operacion.monto_total_facturas),
+        "tasa_descuento": str(operacion.tasa_descuento),
+        "monto_descuento": str(operacion.monto_descuento),
+        "monto_a_desembolsar": str(operacion.monto_a_desembolsar),
+    }
+
+
+def _bloquear_operacion(operacion_id: int) -> OperacionCesion:
+    operacion = bloquear_operaciones([operacion_id]).get(operacion_id)
+    if operacion is None:
+        raise NotFound("La operación no existe.")
+    return operacion
+
+
+def _obtener_operacion_bloqueada(operacion_id: int, **opciones):
+    operaciones, facturas, facturas_por_operacion = bloquear_operaciones_con_facturas([operacion_id], **opciones)
+    operacion = operaciones.get(operacion_id)
+    if operacion is None:
+        raise NotFound("La operación no existe.")
+    return operacion, [facturas[fid] for fid in facturas_por_operacion.get(operacion_id, [])]
+
+
+@con_reintentos
+@transaccion_con_eventos
+def crear_operacion(cliente_id: int, facturas_ids: list[int], tasa_descuento: Decimal | None = None) -> OperacionCesion:
+    # Validaciones sin estado antes de tomar locks
+    validar_facturas_ids(facturas_ids)
+    tasa = obtener_tasa(tasa_descuento)
+
+    # Crear no modifica cliente ni facturas: basta con FOR SHARE
+    facturas = list(bloquear_facturas(facturas_ids, COMPARTIDO).values())
+
+    cliente = bloquear_clientes([cliente_id], COMPARTIDO).get(cliente_id)
+    if cliente is None:
+        raise ValidationError({"cliente": "El cliente no existe."})
+    validar_cliente_activo(cliente)
+
+    operacion = _preparar_operacion(cliente, facturas, facturas_ids, tasa, _hoy())
+    operacion.save()
+
     OperacionFactura.objects.bulk_create(
         [OperacionFactura(operacion=operacion, factura=f) for f in facturas]
     )
@@ -87,55 +135,124 @@ def crear_operacion(cliente_id: int, facturas_ids: list[int], tasa_descuento: De
         operacion=operacion,
         tipo=TipoEventoOperacion.CREADA,
         estado_nuevo=operacion.estado,
-        detalle={
-            "facturas_ids": facturas_ids,
-            "monto_total_facturas": str(monto_total),
-            "tasa_descuento": str(tasa),
-            "monto_descuento": str(monto_desc),
-            "monto_a_desembolsar": str(monto_desemb),
-        },
+        detalle=_detalle_creacion(operacion, facturas_ids),
     )
 
     logger.info("Operación creada", extra={"operacion_id": operacion.id, "cliente_id": cliente.id})
     return operacion
 
 
-@transaction.atomic
-def aprobar_operacion(operacion_id: int) -> OperacionCesion:
-    operacion = (
-        OperacionCesion.objects.select_for_update()
-        .select_related("cliente")
-        .get(id=operacion_id)
+@con_reintentos
+@transaccion_con_eventos
+def crear_operaciones_lote(solicitudes: list[dict]) -> list[dict]:
+    """
+    Crea muchas operaciones en una sola transacción.
+
+    solicitudes: lista de {"cliente_id", "facturas_ids", "tasa_descuento"}.
+    Retorna un resultado por solicitud, en el mismo orden:
+    {"operacion": OperacionCesion} o {"errores": <detalle de ValidationError>}.
+    Una solicitud inválida no impide crear las demás.
+    """
+    resultados: list[dict | None] = [None] * len(solicitudes)
+    hoy = _hoy()
+
+    # 1) Validaciones sin estado (no requieren BD)
+    validas = []
+    for i, sol in enumerate(solicitudes):
+        try:
+            validar_facturas_ids(sol["facturas_ids"])
+            tasa = obtener_tasa(sol.get("tasa_descuento"))
+        except ValidationError as exc:
+            resultados[i] = {"errores": exc.detail}
+            continue
+        validas.append((i, sol, tasa))
+
+    # 2) Una sola consulta de facturas y un lock compartido por cliente
+    facturas_por_id = bloquear_facturas(
+        (fid for _, sol, _ in validas for fid in sol["facturas_ids"]),
+        COMPARTIDO,
     )
+    clientes = bloquear_clientes((sol["cliente_id"] for _, sol, _ in validas), COMPARTIDO)
+
+    # 3) Reglas de negocio por solicitud, en memoria
+    preparadas = []
+    for i, sol, tasa in validas:
+        cliente = clientes.get(sol["cliente_id"])
+        if cliente is None:
+            resultados[i] = {"errores": {"cliente": "El cliente no existe."}}
+            continue
+
+        facturas_ids = sol["facturas_ids"]
+        facturas = [facturas_por_id[fid] for fid in facturas_ids if fid in facturas_por_id]
+        try:
+            validar_cliente_activo(cliente)
+            operacion = _preparar_operacion(cliente, facturas, facturas_ids, tasa, hoy)
+        except ValidationError as exc:
+            resultados[i] = {"errores": exc.detail}
+            continue
+        preparadas.append((i, operacion, facturas, facturas_ids))
+
+    # 4) Inserciones masivas
+    OperacionCesion.objects.bulk_create([op for _, op, _, _ in preparadas])
 
-    validar_operacion_pendiente_para_aprobar(operacion)
+    OperacionFactura.objects.bulk_create(
+        [
+            OperacionFactura(operacion=op, factura=f)
+            for _, op, facturas, _ in preparadas
+            for f in facturas
+        ]
+    )
+
+    registrar_eventos_lote(
+        [
+            construir_evento(
+                operacion=op,
+                tipo=TipoEventoOperacion.CREADA,
+                estado_nuevo=op.estado,
+                detalle=_detalle_creacion(op, facturas_ids),
+            )
+            for _, op, _, facturas_ids in preparadas
+        ]
+    )
+
+    for i, op, _, _ in preparadas:
+        resultados[i] = {"operacion": op}
+
+    logger.info(
+        "Lote de operaciones procesado",
+        extra={"solicitudes": len(solicitudes), "creadas": len(preparadas)},
+    )
+    return resultados
 
-    # Lock cliente (consistencia línea)
-    cliente = Cliente.objects.select_for_update().get(id=operacion.cliente_id)
 
-    facturas = list(Factura.objects.select_for_update().filter(operaciones=operacion))
+@con_reintentos
+@transaccion_con_eventos
+def aprobar_operacion(operacion_id: int) -> OperacionCesion:
+    operacion, facturas = _obtener_operacion_bloqueada(operacion_id)
+
+    validar_operacion_pendiente_para_aprobar(operacion)
     validar_operacion_tiene_facturas(facturas)
 
     hoy = _hoy()
     validar_facturas_siguen_disponibles_para_aprobar(facturas, hoy)
 
-    validar_linea_disponible_suficiente(cliente, operacion.monto_total_facturas)
+    # Consumo de línea con UPDATE condicional atómico (sin lock previo del cliente)
+    lineas = consumir_linea(operacion.cliente_id, operacion.monto_total_facturas)
+    validar_linea_consumida(lineas)
+    linea_anterior, linea_nueva = lineas
 
     facturas_ids = [f.id for f in facturas]
 
     # Actualizar facturas -> cedida
-    Factura.objects.filter(id__in=facturas_ids).update(estado=EstadoFactura.CEDIDA)
-
-    # Actualizar línea disponible
-    linea_anterior = cliente.linea_disponible
-    cliente.linea_disponible = (cliente.linea_disponible - operacion.monto_total_facturas).quantize(Decimal("0.01"))
-    cliente.save(update_fields=["linea_disponible", "actualizado_en"])
+    Factura.objects.filter(id__in=facturas_ids).update(estado=EstadoFactura.CEDIDA, actualizado_en=timezone.now())
+    cache_lecturas.invalidar(cache_lecturas.FACTURA, facturas_ids)
 
     estado_anterior = operacion.estado
     operacion.estado = EstadoOperacion.APROBADA
     operacion.fecha_aprobacion = timezone.now()
     operacion.motivo_rechazo = ""
     operacion.save(update_fields=["estado", "fecha_aprobacion", "motivo_rechazo", "actualizado_en"])
+    cache_lecturas.invalidar(cache_lecturas.OPERACION, [operacion.id])
 
     registrar_evento(
         operacion=operacion,
@@ -144,27 +261,29 @@ def aprobar_operacion(operacion_id: int) -> OperacionCesion:
         estado_nuevo=operacion.estado,
         detalle={
             "linea_disponible_anterior": str(linea_anterior.quantize(Decimal("0.01"))),
-            "linea_disponible_nueva": str(cliente.linea_disponible),
+            "linea_disponible_nueva": str(linea_nueva.quantize(Decimal("0.01"))),
             "facturas_ids": facturas_ids,
         },
     )
 
-    logger.info("Operación aprobada", extra={"operacion_id": operacion.id, "cliente_id": cliente.id})
+    logger.info("Operación aprobada", extra={"operacion_id": operacion.id, "cliente_id": operacion.cliente_id})
     return operacion
 
 
-@transaction.atomic
+@con_reintentos
+@transaccion_con_eventos
 def rechazar_operacion(operacion_id: int, motivo: str) -> OperacionCesion:
-    operacion = OperacionCesion.objects.select_for_update().get(id=operacion_id)
+    motivo = validar_motivo_rechazo(motivo)
 
+    operacion = _bloquear_operacion(operacion_id)
     validar_operacion_pendiente_para_rechazar(operacion)
-    motivo = validar_motivo_rechazo(motivo)
 
     estado_anterior = operacion.estado
     operacion.estado = EstadoOperacion.RECHAZADA
     operacion.motivo_rechazo = motivo
     operacion.fecha_aprobacion = None
     operacion.save(update_fields=["estado", "motivo_rechazo", "fecha_aprobacion", "actualizado_en"])
+    cache_lecturas.invalidar(cache_lecturas.OPERACION, [operacion.id])
 
     registrar_evento(
         operacion=operacion,
@@ -178,9 +297,10 @@ def rechazar_operacion(operacion_id: int, motivo: str) -> OperacionCesion:
     return operacion
 
 
-@transaction.atomic
+@con_reintentos
+@transaccion_con_eventos
 def registrar_desembolso(operacion_id: int) -> OperacionCesion:
-    operacion = OperacionCesion.objects.select_for_update().get(id=operacion_id)
+    operacion = _bloquear_operacion(operacion_id)
 
     validar_operacion_aprobada_para_desembolsar(operacion)
 
@@ -188,6 +308,7 @@ def registrar_desembolso(operacion_id: int) -> OperacionCesion:
     operacion.estado = EstadoOperacion.DESEMBOLSADA
     operacion.fecha_desembolso = timezone.now()
     operacion.save(update_fields=["estado", "fecha_desembolso", "actualizado_en"])
+    cache_lecturas.invalidar(cache_lecturas.OPERACION, [operacion.id])
 
     registrar_evento(
         operacion=operacion,
@@ -201,38 +322,411 @@ def registrar_desembolso(operacion_id: int) -> OperacionCesion:
     return operacion
 
 
-@transaction.atomic
+@con_reintentos
+@transaccion_con_eventos
 def finalizar_operacion_si_pagada(operacion_id: int) -> OperacionCesion:
-    operacion = OperacionCesion.objects.select_for_update().select_related("cliente").get(id=operacion_id)
+    # Las facturas solo se leen: FOR SHARE evita que cambien mientras se finaliza
+    operacion, facturas = _obtener_operacion_bloqueada(operacion_id, modo_facturas=COMPARTIDO)
 
     validar_operacion_estado_para_finalizar(operacion)
-
-    # Lock cliente para restaurar línea
-    cliente = Cliente.objects.select_for_update().get(id=operacion.cliente_id)
-
-    facturas = list(Factura.objects.select_for_update().filter(operaciones=operacion))
     validar_operacion_tiene_facturas(facturas)
     validar_facturas_pagadas_para_finalizar(facturas)
 
-    linea_anterior = cliente.linea_disponible
-    cliente.linea_disponible = (cliente.linea_disponible + operacion.monto_total_facturas).quantize(Decimal("0.01"))
-    cliente.save(update_fields=["linea_disponible", "actualizado_en"])
+    # Restitución de línea en una sola sentencia (sin lock previo del cliente)
+    linea_anterior, linea_nueva = liberar_linea(operacion.cliente_id, operacion.monto_total_facturas)
 
     estado_anterior = operacion.estado
     operacion.estado = EstadoOperacion.FINALIZADA
     operacion.fecha_finalizacion = timezone.now()
     operacion.save(update_fields=["estado", "fecha_finalizacion", "actualizado_en"])
+    cache_lecturas.invalidar(cache_lecturas.OPERACION, [operacion.id])
 
     registrar_evento(
         operacion=operacion,
         tipo=TipoEventoOperacion.FINALIZADA,
         estado_anterior=estado_anterior,
         estado_nuevo=operacion.estado,
-        detalle={
-            "linea_disponible_anterior": str(linea_anterior.quantize(Decimal("0.01"))),
-            "linea_disponible_nueva": str(cliente.linea_disponible),
-        },
+        detalle=_detalle_restitucion(linea_anterior, linea_nueva, operacion.monto_total_facturas),
     )
 
-    logger.info("Operación finalizada", extra={"operacion_id": operacion.id, "cliente_id": cliente.id})
-    return operacion
\ No newline at end of file
+    logger.info("Operación finalizada", extra={"operacion_id": operacion.id, "cliente_id": operacion.cliente_id})
+    return operacion
+
+
+def _detalle_restitucion(anterior: Decimal, nueva: Decimal, monto: Decimal) -> dict:
+    # Si la línea de crédito bajó durante la operación, lo que no cabe bajo el
+    # tope no se restituye: queda explícito en el evento como linea_excedente.
+    detalle = {
+        "linea_disponible_anterior": str(anterior.quantize(Decimal("0.01"))),
+        "linea_disponible_nueva": str(nueva.quantize(Decimal("0.01"))),
+    }
+    excedente = anterior + monto - nueva
+    if excedente > 0:
+        detalle["linea_excedente"] = str(excedente.quantize(Decimal("0.01")))
+    return detalle
+
+
+# ---------------------------------------------------------------------------
+# Transiciones en lote
+# ---------------------------------------------------------------------------
+
+def _ids_unicos(operaciones_ids: list[int]) -> tuple[list[int], set[int]]:
+    vistos, repetidos = set(), set()
+    for op_id in operaciones_ids:
+        if op_id in vistos:
+            repetidos.add(op_id)
+        vistos.add(op_id)
+    return sorted(vistos), repetidos
+
+
+def _validar_item_lote(op_id: int, operaciones: dict, repetidos: set[int]) -> OperacionCesion:
+    if op_id in repetidos:
+        raise ValidationError({"operacion": "La operación aparece más de una vez en el lote."})
+    operacion = operaciones.get(op_id)
+    if operacion is None:
+        raise ValidationError({"operacion": "La operación no existe."})
+    return operacion
+
+
+@con_reintentos
+@transaccion_con_eventos
+def aprobar_operaciones_lote(operaciones_ids: list[int]) -> list[dict]:
+    """
+    Aprueba muchas operaciones en una sola transacción.
+
+    Bloquea operaciones, facturas y clientes en el orden global, aplica las mismas
+    reglas que aprobar_operacion acumulando el consumo de línea por cliente dentro
+    del lote, y persiste con UPDATEs por conjunto y un único bulk de eventos.
+    Retorna un resultado por id, en el orden recibido:
+    {"operacion": OperacionCesion} o {"errores": <detalle de ValidationError>}.
+    """
+    ids, repetidos = _ids_unicos(operaciones_ids)
+    operaciones, facturas, facturas_por_operacion = bloquear_operaciones_con_facturas(ids)
+    # El lote calcula la línea de varias operaciones en memoria: necesita el
+    # valor vigente bloqueado (al final, respetando el orden global).
+    clientes = bloquear_clientes(op.cliente_id for op in operaciones.values())
+
+    hoy = _hoy()
+    ahora = timezone.now()
+    resultados = []
+    aprobadas = []
+    facturas_cedidas = []
+    lineas_anteriores: dict[int, Decimal] = {}
+    eventos = []
+
+    for op_id in operaciones_ids:
+        try:
+            operacion = _validar_item_lote(op_id, operaciones, repetidos)
+            validar_operacion_pendiente_para_aprobar(operacion)
+
+            facturas_op = [facturas[fid] for fid in facturas_por_operacion.get(op_id, [])]
+            validar_operacion_tiene_facturas(facturas_op)
+            validar_facturas_siguen_disponibles_para_aprobar(facturas_op, hoy)
+
+            cliente = clientes[operacion.cliente_id]
+            validar_linea_disponible_suficiente(cliente, operacion.monto_total_facturas)
+        except ValidationError as exc:
+            resultados.append({"errores": exc.detail})
+            continue
+
+        # Estado en memoria: las siguientes operaciones del lote ven la línea
+        # ya consumida y las facturas ya cedidas.
+        lineas_anteriores.setdefault(cliente.id, cliente.linea_disponible)
+        linea_anterior = cliente.linea_disponible
+        cliente.linea_disponible = (cliente.linea_disponible - operacion.monto_total_facturas).quantize(Decimal("0.01"))
+        for f in facturas_op:
+            f.estado = EstadoFactura.CEDIDA
+        facturas_cedidas.extend(f.id for f in facturas_op)
+
+        estado_anterior = operacion.estado
+        operacion.estado = EstadoOperacion.APROBADA
+        operacion.fecha_aprobacion = ahora
+        operacion.motivo_rechazo = ""
+        operacion.actualizado_en = ahora
+        aprobadas.append(operacion.id)
+
+        eventos.append(
+            construir_evento(
+                operacion=operacion,
+                tipo=TipoEventoOperacion.APROBADA,
+                estado_anterior=estado_anterior,
+                estado_nuevo=operacion.estado,
+                detalle={
+                    "linea_disponible_anterior": str(linea_anterior.quantize(Decimal("0.01"))),
+                    "linea_disponible_nueva": str(cliente.linea_disponible),
+                    "facturas_ids": [f.id for f in facturas_op],
+                },
+            )
+        )
+        resultados.append({"operacion": operacion})
+
+    if aprobadas:
+        Factura.objects.filter(id__in=facturas_cedidas).update(estado=EstadoFactura.CEDIDA, actualizado_en=ahora)
+
+        Cliente.objects.filter(id__in=lineas_anteriores).update(
+            linea_disponible=Case(
+                *[When(id=cid, then=Value(clientes[cid].linea_disponible)) for cid in lineas_anteriores],
+                output_field=DecimalField(max_digits=15, decimal_places=2),
+            ),
+            actualizado_en=ahora,
+        )
+
+        OperacionCesion.objects.filter(id__in=aprobadas).update(
+            estado=EstadoOperacion.APROBADA,
+            fecha_aprobacion=ahora,
+            motivo_rechazo="",
+            actualizado_en=ahora,
+        )
+
+        cache_lecturas.invalidar(cache_lecturas.FACTURA, facturas_cedidas)
+        cache_lecturas.invalidar(cache_lecturas.CLIENTE, lineas_anteriores)
+        cache_lecturas.invalidar(cache_lecturas.OPERACION, aprobadas)
+        registrar_eventos_lote(eventos)
+
+    logger.info("Lote de aprobaciones procesado", extra={"solicitadas": len(operaciones_ids), "aprobadas": len(aprobadas)})
+    return resultados
+
+
+def _transicion_simple_lote(operaciones_ids, *, validar, estado_nuevo, tipo_evento, campos, detalle) -> list[dict]:
+    """Transición de estado sin efectos sobre clientes ni facturas (rechazo, desembolso)."""
+    ids, repetidos = _ids_unicos(operaciones_ids)
+    operaciones = bloquear_operaciones(ids)
+
+    ahora = timezone.now()
+    resultados = []
+    eventos = []
+    for op_id in operaciones_ids:
+        try:
+            operacion = _validar_item_lote(op_id, operaciones, repetidos)
+            validar(operacion)
+        except ValidationError as exc:
+            resultados.append({"errores": exc.detail})
+            continue
+
+        estado_anterior = operacion.estado
+        operacion.estado = estado_nuevo
+        operacion.actualizado_en = ahora
+        for campo, valor in campos(ahora).items():
+            setattr(operacion, campo, valor)
+
+        eventos.append(
+            construir_evento(
+                operacion=operacion,
+                tipo=tipo_evento,
+                estado_anterior=estado_anterior,
+                estado_nuevo=operacion.estado,
+                detalle=detalle(operacion),
+            )
+        )
+        resultados.append({"operacion": operacion})
+
+    if eventos:
+        ids_actualizados = [e.operacion.id for e in eventos]
+        OperacionCesion.objects.filter(id__in=ids_actualizados).update(
+            estado=estado_nuevo, actualizado_en=ahora, **campos(ahora)
+        )
+        cache_lecturas.invalidar(cache_lecturas.OPERACION, ids_actualizados)
+        registrar_eventos_lote(eventos)
+
+    return resultados
+
+
+@con_reintentos
+@transaccion_con_eventos
+def rechazar_operaciones_lote(operaciones_ids: list[int], motivo: str) -> list[dict]:
+    motivo = validar_motivo_rechazo(motivo)
+    resultados = _transicion_simple_lote(
+        operaciones_ids,
+        validar=validar_operacion_pendiente_para_rechazar,
+        estado_nuevo=EstadoOperacion.RECHAZADA,
+        tipo_evento=TipoEventoOperacion.RECHAZADA,
+        campos=lambda ahora: {"motivo_rechazo": motivo, "fecha_aprobacion": None},
+        detalle=lambda op: {"motivo_rechazo": motivo},
+    )
+    logger.info("Lote de rechazos procesado", extra={"solicitadas": len(operaciones_ids)})
+    return resultados
+
+
+@con_reintentos
+@transaccion_con_eventos
+def registrar_desembolsos_lote(operaciones_ids: list[int]) -> list[dict]:
+    resultados = _transicion_simple_lote(
+        operaciones_ids,
+        validar=validar_operacion_aprobada_para_desembolsar,
+        estado_nuevo=EstadoOperacion.DESEMBOLSADA,
+        tipo_evento=TipoEventoOperacion.DESEMBOLSADA,
+        campos=lambda ahora: {"fecha_desembolso": ahora},
+        detalle=lambda op: {"monto_a_desembolsar": str(op.monto_a_desembolsar)},
+    )
+    logger.info("Lote de desembolsos procesado", extra={"solicitadas": len(operaciones_ids)})
+    return resultados
+
+
+# ---------------------------------------------------------------------------
+# Finalización por pago
+# ---------------------------------------------------------------------------
+
+def operaciones_vigentes_de_facturas(facturas_ids) -> list[int]:
+    """Ids de las operaciones aprobadas/desembolsadas que contienen alguna de las facturas."""
+    return list(
+        OperacionFactura.objects.filter(
+            factura_id__in=facturas_ids,
+            operacion__estado__in=ESTADOS_FINALIZABLES,
+        )
+        .order_by("operacion_id")
+        .values_list("operacion_id", flat=True)
+        .distinct()
+    )
+
+
+@con_reintentos
+@transaccion_con_eventos
+def finalizar_operaciones_pagadas(operaciones_ids: list[int] | None = None, *, tamano_lote: int = 500) -> list[int]:
+    """
+    Finaliza, con SQL por conjunto, las operaciones aprobadas/desembolsadas
+    cuyas facturas están todas pagadas.
+
+    Con operaciones_ids finaliza esas (esperando sus locks, como en el pago de
+    facturas). Sin ids toma a lo sumo `tamano_lote` elegibles con SKIP LOCKED:
+    las que otra transacción tenga tomadas quedan para la siguiente pasada (ver
+    barrer_operaciones_pagadas).
+
+    Un UPDATE ... RETURNING cambia el estado, otro restituye la línea agregada
+    por cliente y los eventos se insertan en un solo bulk. Retorna los ids finalizados.
+    """
+    if operaciones_ids is not None and not operaciones_ids:
+        return []
+
+    op_tabla = OperacionCesion._meta.db_table
+    of_tabla = OperacionFactura._meta.db_table
+    f_tabla = Factura._meta.db_table
+
+    if operaciones_ids is not None:
+        filtro_ids, limite, bloqueo = "AND o.id = ANY(%(ids)s)", None, "FOR NO KEY UPDATE OF o"
+    else:
+        filtro_ids, limite, bloqueo = "", tamano_lote, "FOR NO KEY UPDATE OF o SKIP LOCKED"
+    ahora = timezone.now()
+
+    with connection.cursor() as cur:
+        cur.execute(
+            f"""
+            WITH elegibles AS (
+                SELECT o.id, o.estado
+                  FROM {op_tabla} o
+                 WHERE o.estado = ANY(%(estados)s) {filtro_ids}
+                   AND EXISTS (SELECT 1 FROM {of_tabla} x WHERE x.operacion_id = o.id)
+                   AND NOT EXISTS (
+                       SELECT 1
+                         FROM {of_tabla} x
+                         JOIN {f_tabla} f ON f.id = x.factura_id
+                        WHERE x.operacion_id = o.id AND f.estado <> %(pagada)s
+                   )
+                 ORDER BY o.id
+                 LIMIT %(limite)s
+                   {bloqueo}
+            )
+            UPDATE {op_tabla} AS o
+               SET estado = %(finalizada)s, fecha_finalizacion = %(ahora)s, actualizado_en = %(ahora)s
+              FROM elegibles e
+             WHERE o.id = e.id
+         RETURNING o.id, o.cliente_id, o.monto_total_facturas, e.estado
+            """,
+            {
+                "ids": operaciones_ids,
+                "limite": limite,
+                "estados": list(ESTADOS_FINALIZABLES),
+                "pagada": EstadoFactura.PAGADA,
+                "finalizada": EstadoOperacion.FINALIZADA,
+                "ahora": ahora,
+            },
+        )
+        finalizadas = sorted(cur.fetchall())
+
+    if not finalizadas:
+        return []
+    cache_lecturas.invalidar(cache_lecturas.OPERACION, [op_id for op_id, *_ in finalizadas])
+
+    montos: dict[int, Decimal] = {}
+    for _, cliente_id, monto, _ in finalizadas:
+        montos[cliente_id] = montos.get(cliente_id, Decimal("0.00")) + monto
+    lineas = liberar_lineas(montos)
+
+    # Detalle por operación: la línea del cliente avanza en orden de id
+    corriendo = {cid: anterior for cid, (anterior, _) in lineas.items()}
+    eventos = []
+    for op_id, cliente_id, monto, estado_anterior in finalizadas:
+        anterior = corriendo[cliente_id]
+        nueva = min(anterior + monto, lineas[cliente_id][1])
+        corriendo[cliente_id] = nueva
+        eventos.append(
+            construir_evento(
+                operacion=OperacionCesion(id=op_id),
+                tipo=TipoEventoOperacion.FINALIZADA,
+                estado_anterior=estado_anterior,
+                estado_nuevo=EstadoOperacion.FINALIZADA,
+                detalle={**_detalle_restitucion(anterior, nueva, monto), "origen": "pago"},
+            )
+        )
+    registrar_eventos_lote(eventos)
+
+    logger.info("Operaciones finalizadas por pago", extra={"finalizadas": len(finalizadas)})
+    return [op_id for op_id, *_ in finalizadas]
+
+
+def barrer_operaciones_pagadas(*, tamano_lote: int = 500, al_procesar_lote=None) -> int:
+    """
+    Finaliza todas las operaciones pagadas en lotes, cada uno en su propia
+    transacción corta (y con reintentos), sin esperar por operaciones que una
+    aprobación o un pago en curso tengan bloqueadas.
+
+    al_procesar_lote: callable(numero_lote, finalizadas) para informar avance.
+    Retorna el total de operaciones finalizadas.
+    """
+    total = 0
+    numero_lote = 0
+
+    while True:
+        finalizadas = len(finalizar_operaciones_pagadas(tamano_lote=tamano_lote))
+        if finalizadas == 0:
+            break
+        numero_lote += 1
+        total += finalizadas
+        if al_procesar_lote:
+            al_procesar_lote(numero_lote, finalizadas)
+        if finalizadas < tamano_lote:
+            break
+
+    logger.info("Barrido de operaciones pagadas", extra={"total": total, "lotes": numero_lote})
+    return total
+
+
+@con_reintentos
+@transaccion_con_eventos
+def registrar_pago_factura(factura: Factura) -> Factura:
+    """
+    Marca la factura como pagada y finaliza las operaciones que con ello quedan
+    con todas sus facturas pagadas.
+    """
+    # Orden global de locks: la operación dueña antes que la factura. Así dos
+    # pagos concurrentes de la misma operación se serializan y el último ve
+    # todas las facturas pagadas.
+    operaciones_ids = list(bloquear_operaciones(operaciones_vigentes_de_facturas([factura.id])))
+    marcar_pagada(factura)
+    finalizar_operaciones_pagadas(operaciones_ids)
+    return factura
+
+
+@con_reintentos
+@transaccion_con_eventos
+def registrar_pago_facturas(facturas_ids: list[int]) -> int:
+    """
+    Variante por conjunto de registrar_pago_factura para cargas masivas.
+    Retorna la cantidad de facturas que pasaron a PAGADA.
+    """
+    if not facturas_ids:
+        return 0
+
+    operaciones_ids = list(bloquear_operaciones(operaciones_vigentes_de_facturas(facturas_ids)))
+    pagadas = marcar_pagadas_lote(facturas_ids)
+    finalizar_operaciones_pagadas(operaciones_ids)
+    return pagadas
@@ -0,0 +1,182 @@
+import pytest
+from decimal import Decimal
+from django.db import OperationalError, connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from clientes.modelos import Cliente, EstadoCliente
+from core import metricas
+from core.reintentos import con_reintentos
+from facturas.modelos import Factura, EstadoFactura
+from operaciones.bloqueos import ORDEN_GLOBAL
+
+
+def _cliente():
+    return Cliente.objects.create(
+        rut="12.345.678-5",
+        razon_social="Empresa",
+        email="a@a.cl",
+        linea_credito="1000000.00",
+        linea_disponible="1000000.00",
+        estado=EstadoCliente.ACTIVO,
+    )
+
+
+def _factura(cliente, numero):
+    hoy = timezone.localdate()
+    return Factura.objects.create(
+        cliente=cliente,
+        numero_factura=numero,
+        rut_deudor="76.543.210-3",
+        razon_social_deudor="Deudor",
+        monto_total=Decimal("100000.00"),
+        fecha_emision=hoy,
+        fecha_vencimiento=hoy + timezone.timedelta(days=30),
+        estado=EstadoFactura.DISPONIBLE,
+    )
+
+
+def _locks(queries):
+    tablas = []
+    for q in queries:
+        sql = q["sql"]
+        if " FOR " not in sql:
+            continue
+        assert "ORDER BY" in sql, sql
+        for tabla in ("clientes_cliente", "operaciones_operacioncesion", "facturas_factura"):
+            if f'FROM "{tabla}"' in sql:
+                tablas.append(tabla)
+    return tablas
+
+
+@pytest.mark.django_db
+def test_crear_y_aprobar_bloquean_en_orden_global():
+    api = APIClient()
+    c = _cliente()
+    f2 = _factura(c, "F-2")
+    f1 = _factura(c, "F-1")
+
+    with CaptureQueriesContext(connection) as ctx:
+        r = api.post("/api/operaciones/", {"cliente": c.id, "facturas_ids": [f2.id, f1.id]}, format="json")
+    assert r.status_code == 201, r.data
+    assert _locks(ctx.captured_queries) == ["facturas_factura", "clientes_cliente"]
+    assert any("FOR SHARE" in q["sql"] for q in ctx.captured_queries)
+
+    op_id = r.json()["id"]
+    with CaptureQueriesContext(connection) as ctx:
+        r = api.post(f"/api/operaciones/{op_id}/aprobar/")
+    assert r.status_code == 200, r.data
+    # Sin lock previo del cliente: la línea se descuenta con un UPDATE condicional
+    assert _locks(ctx.captured_queries) == ["operaciones_operacioncesion", "facturas_factura"]
+    assert any(
+        q["sql"].lstrip().startswith("UPDATE clientes_cliente") and "linea_disponible >=" in q["sql"]
+        for q in ctx.captured_queries
+    )
+
+
+def _primer_contacto(queries):
+    """Tablas del orden global en el orden en que cada una se bloquea o se actualiza por primera vez."""
+    tablas = [m._meta.db_table for m in ORDEN_GLOBAL]
+    vistas = []
+    for q in queries:
+        sql = q["sql"].lstrip()
+        for tabla in tablas:
+            toca = (" FOR " in sql and f'FROM "{tabla}"' in sql) or sql.startswith(
+                (f'UPDATE "{tabla}"', f"UPDATE {tabla} ")
+            )
+            if toca and tabla not in vistas:
+                vistas.append(tabla)
+    return vistas
+
+
+@pytest.mark.django_db
+def test_todos_los_servicios_respetan_el_orden_global():
+    api = APIClient()
+    c = _cliente()
+    facturas = [_factura(c, f"F-{i}") for i in range(8)]
+
+    def crear(*fs):
+        r = api.post("/api/operaciones/", {"cliente": c.id, "facturas_ids": [f.id for f in fs]}, format="json")
+        assert r.status_code == 201, r.data
+        return r.json()["id"]
+
+    op1, op2, op3 = crear(facturas[0]), crear(facturas[1]), crear(facturas[2])
+    op4, op5 = crear(facturas[3]), crear(facturas[4])
+    pasos = [
+        ("post", "/api/operaciones/lote/", {"operaciones": [{"cliente": c.id, "facturas_ids": [facturas[5].id]}]}),
+        ("post", f"/api/operaciones/{op1}/aprobar/", None),
+        ("post", f"/api/operaciones/{op1}/desembolsar/", None),
+        ("post", f"/api/operaciones/{op2}/rechazar/", {"motivo_rechazo": "Riesgo"}),
+        ("post", "/api/operaciones/aprobar-lote/", {"operaciones_ids": [op3, op4]}),
+        ("post", "/api/operaciones/desembolsar-lote/", {"operaciones_ids": [op3, op4]}),
+        ("post", "/api/operaciones/rechazar-lote/", {"operaciones_ids": [op5], "motivo_rechazo": "Riesgo"}),
+        # Pagar la factura finaliza la operación y libera la línea del cliente
+        ("post", f"/api/facturas/{facturas[0].id}/pagar/", None),
+    ]
+    orden = [m._meta.db_table for m in ORDEN_GLOBAL]
+    for metodo, url, data in pasos:
+        with CaptureQueriesContext(connection) as ctx:
+            r = getattr(api, metodo)(url, data, format="json")
+        assert r.status_code in (200, 201), (url, r.data)
+        tocadas = _primer_contacto(ctx.captured_queries)
+        assert tocadas and tocadas == sorted(tocadas, key=orden.index), (url, tocadas)
+
+
+@pytest.mark.django_db
+def test_aprobar_operacion_inexistente_devuelve_404():
+    resp = APIClient().post("/api/operaciones/999999/aprobar/")
+    assert resp.status_code == 404
+    assert resp.json()["code"] == "NOT_FOUND"
+
+
+class _Deadlock(Exception):
+    sqlstate = "40P01"
+
+
+def _error_deadlock():
+    exc = OperationalError("deadlock detected")
+    exc.__cause__ = _Deadlock()
+    return exc
+
+
+def test_reintenta_deadlock_y_cuenta_reintentos(settings):
+    settings.DB_REINTENTOS_BASE_MS = 0
+    llamadas = []
+
+    @con_reintentos(intentos=3)
+    def servicio():
+        llamadas.append(1)
+        if len(llamadas) < 3:
+            raise _error_deadlock()
+        return "ok"
+
+    antes = metricas.obtener("db.reintentos.deadlock")
+    assert servicio() == "ok"
+    assert len(llamadas) == 3
+    assert metricas.obtener("db.reintentos.deadlock") - antes == 2
+
+
+def test_no_reintenta_errores_no_transitorios(settings):
+    settings.DB_REINTENTOS_BASE_MS = 0
+    llamadas = []
+
+    @con_reintentos(intentos=3)
+    def servicio():
+        llamadas.append(1)
+        raise OperationalError("otra cosa")
+
+    with pytest.raises(OperationalError):
+        servicio()
+    assert len(llamadas) == 1
+
+
+def test_agota_reintentos_y_propaga(settings):
+    settings.DB_REINTENTOS_BASE_MS = 0
+
+    @con_reintentos(intentos=2)
+    def servicio():
+        raise _error_deadlock()
+
+    with pytest.raises(OperationalError):
+        servicio()
@@ -0,0 +1,82 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from clientes.modelos import Cliente, EstadoCliente
+from core.request_context import request_id_ctx
+from operaciones.dominio.eventos import registrar_evento, transaccion_con_eventos
+from operaciones.modelos import EventoOutbox, OperacionCesion, OperacionEvento, TipoEventoOperacion
+
+pytestmark = pytest.mark.django_db
+
+
+def _operacion():
+    cliente = Cliente.objects.create(
+        rut="12.345.678-5",
+        razon_social="Empresa",
+        email="a@a.cl",
+        linea_credito="1000.00",
+        linea_disponible="1000.00",
+        estado=EstadoCliente.ACTIVO,
+    )
+    return OperacionCesion.objects.create(
+        cliente=cliente,
+        monto_total_facturas="100.00",
+        tasa_descuento="2.00",
+        monto_descuento="2.00",
+        monto_a_desembolsar="98.00",
+    )
+
+
+def _inserts_de_eventos(ctx):
+    tabla = OperacionEvento._meta.db_table
+    return [q for q in ctx.captured_queries if q["sql"].startswith(f'INSERT INTO "{tabla}"')]
+
+
+def test_eventos_se_escriben_en_un_solo_insert_al_cerrar_el_bloque():
+    op = _operacion()
+    with CaptureQueriesContext(connection) as ctx:
+        with transaccion_con_eventos():
+            for _ in range(5):
+                registrar_evento(operacion=op, tipo=TipoEventoOperacion.ERROR)
+            assert OperacionEvento.objects.count() == 0
+
+    assert len(_inserts_de_eventos(ctx)) == 1
+    assert OperacionEvento.objects.count() == 5
+    assert EventoOutbox.objects.count() == 5
+
+
+def test_rollback_y_savepoint_revertido_no_escriben_eventos():
+    op = _operacion()
+    with pytest.raises(RuntimeError):
+        with transaccion_con_eventos():
+            registrar_evento(operacion=op, tipo=TipoEventoOperacion.ERROR)
+            raise RuntimeError("falla")
+    assert OperacionEvento.objects.count() == 0
+
+    with transaccion_con_eventos():
+        registrar_evento(operacion=op, tipo=TipoEventoOperacion.APROBADA)
+        try:
+            with transaccion_con_eventos():
+                registrar_evento(operacion=op, tipo=TipoEventoOperacion.ERROR)
+                raise RuntimeError("falla en savepoint")
+        except RuntimeError:
+            pass
+        with transaccion_con_eventos():
+            registrar_evento(operacion=op, tipo=TipoEventoOperacion.DESEMBOLSADA)
+
+    tipos = list(OperacionEvento.objects.order_by("id").values_list("tipo", flat=True))
+    assert tipos == [TipoEventoOperacion.APROBADA, TipoEventoOperacion.DESEMBOLSADA]
+
+
+def test_fuera_de_transaccion_escribe_de_inmediato_con_request_id():
+    op = _operacion()
+    token = request_id_ctx.set("cmd-123")
+    try:
+        registrar_evento(operacion=op, tipo=TipoEventoOperacion.ERROR, detalle={"origen": "comando"})
+    finally:
+        request_id_ctx.reset(token)
+
+    evento = OperacionEvento.objects.get()
+    assert evento.detalle == {"origen": "comando", "request_id": "cmd-123"}
+    assert EventoOutbox.objects.get().evento_id == evento.id
@@ -0,0 +1,90 @@
+import gzip
+import json
+from datetime import datetime, timezone as dt_timezone
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from clientes.modelos import Cliente, EstadoCliente
+from operaciones.modelos import OperacionCesion, OperacionEvento, TipoEventoOperacion
+from operaciones.particiones import DEFECTO, TABLA, crear_particion, nombre_particion, particiones_mensuales
+
+pytestmark = pytest.mark.django_db
+
+
+def _operacion():
+    cliente = Cliente.objects.create(
+        rut="12.345.678-5",
+        razon_social="Empresa",
+        email="a@a.cl",
+        linea_credito="1000.00",
+        linea_disponible="1000.00",
+        estado=EstadoCliente.ACTIVO,
+    )
+    return OperacionCesion.objects.create(cliente=cliente)
+
+
+def _evento(op, fecha):
+    return OperacionEvento.objects.create(operacion=op, tipo=TipoEventoOperacion.ERROR, fecha=fecha)
+
+
+def _particion_de(evento):
+    with connection.cursor() as cur:
+        cur.execute(f'SELECT tableoid::regclass::text FROM "{TABLA}" WHERE id = %s', [evento.id])
+        return cur.fetchone()[0]
+
+
+def test_eventos_caen_en_la_particion_del_mes_y_la_default_se_vacia_al_crearla():
+    op = _operacion()
+    actual = _evento(op, timezone.now())
+    assert _particion_de(actual) == nombre_particion(timezone.now().date().replace(day=1))
+
+    lejano = _evento(op, datetime(2040, 5, 10, tzinfo=dt_timezone.utc))
+    assert _particion_de(lejano) == DEFECTO
+
+    assert crear_particion(datetime(2040, 5, 1).date()) is True
+    assert crear_particion(datetime(2040, 5, 1).date()) is False
+    assert _particion_de(lejano) == "operaciones_operacionevento_p204005"
+
+    # El endpoint sigue viendo los eventos de todas las particiones
+    eventos = OperacionEvento.objects.filter(operacion=op).order_by("fecha", "id")
+    assert [e.id for e in eventos] == [actual.id, lejano.id]
+
+
+def test_consultas_por_fecha_usan_poda_de_particiones():
+    crear_particion(datetime(2040, 5, 1).date())
+    qs = OperacionEvento.objects.filter(fecha__gte=datetime(2040, 5, 2, tzinfo=dt_timezone.utc))
+    plan = qs.explain()
+    assert "operaciones_operacionevento_p204005" in plan
+    assert nombre_particion(timezone.now().date().replace(day=1)) not in plan
+
+
+def test_comandos_crean_futuras_y_archivan_las_antiguas(tmp_path):
+    op = _operacion()
+    hoy = timezone.now().date()
+
+    call_command("crear_particiones_eventos", "--meses", "4")
+    meses = particiones_mensuales()
+    assert len([m for m in meses if m >= hoy.replace(day=1)]) >= 5
+
+    viejo = datetime(2020, 3, 15, tzinfo=dt_timezone.utc)
+    crear_particion(viejo.date())
+    eventos = [_evento(op, viejo.replace(hour=h)) for h in range(3)]
+    reciente = _evento(op, timezone.now())
+    # En producción los eventos ya están confirmados; aquí comparten la
+    # transacción del test y sus FK diferidas impedirían el DROP
+    with connection.cursor() as cur:
+        cur.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+    call_command("archivar_eventos", "--retencion-meses", "12", "--destino", str(tmp_path))
+
+    archivo = tmp_path / "operaciones_operacionevento_p202003.jsonl.gz"
+    with gzip.open(archivo, "rt") as f:
+        filas = [json.loads(linea) for linea in f]
+    assert [fila["id"] for fila in filas] == [e.id for e in eventos]
+    assert filas[0]["operacion_id"] == op.id
+
+    assert "operaciones_operacionevento_p202003" not in {n for n, _ in particiones_mensuales().values()}
+    assert list(OperacionEvento.objects.values_list("id", flat=True)) == [reciente.id]
@@ -0,0 +1,119 @@
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from clientes.modelos import Cliente, EstadoCliente
+from core.modelos import SolicitudIdempotente
+from facturas.modelos import Factura, EstadoFactura
+from operaciones.modelos import OperacionCesion
+
+pytestmark = pytest.mark.django_db
+
+
+def _cliente():
+    return Cliente.objects.create(
+        rut="12.345.678-5",
+        razon_social="Empresa",
+        email="a@a.cl",
+        linea_credito="1000000.00",
+        linea_disponible="1000000.00",
+        estado=EstadoCliente.ACTIVO,
+    )
+
+
+def _factura(cliente, numero="F-1"):
+    hoy = timezone.localdate()
+    return Factura.objects.create(
+        cliente=cliente,
+        numero_factura=numero,
+        rut_deudor="76.543.210-3",
+        razon_social_deudor="Deudor",
+        monto_total=Decimal("100000.00"),
+        fecha_emision=hoy,
+        fecha_vencimiento=hoy + timezone.timedelta(days=30),
+        estado=EstadoFactura.DISPONIBLE,
+    )
+
+
+def test_post_repetido_con_misma_clave_no_duplica_operacion():
+    api = APIClient()
+    c = _cliente()
+    f = _factura(c)
+    payload = {"cliente": c.id, "facturas_ids": [f.id]}
+
+    r1 = api.post("/api/operaciones/", payload, format="json", HTTP_IDEMPOTENCY_KEY="k-1")
+    r2 = api.post("/api/operaciones/", payload, format="json", HTTP_IDEMPOTENCY_KEY="k-1")
+
+    assert r1.status_code == r2.status_code == 201
+    assert r1.json() == r2.json()
+    assert r2["Idempotent-Replayed"] == "true"
+    assert OperacionCesion.objects.count() == 1
+
+
+def test_misma_clave_con_otro_payload_devuelve_409():
+    api = APIClient()
+    c = _cliente()
+    f1 = _factura(c, "F-1")
+    f2 = _factura(c, "F-2")
+
+    api.post("/api/operaciones/", {"cliente": c.id, "facturas_ids": [f1.id]}, format="json", HTTP_IDEMPOTENCY_KEY="k-2")
+    r = api.post("/api/operaciones/", {"cliente": c.id, "facturas_ids": [f2.id]}, format="json", HTTP_IDEMPOTENCY_KEY="k-2")
+
+    assert r.status_code == 409
+    assert r.json()["code"] == "CONFLICT"
+
+
+def test_clave_demasiado_larga_devuelve_400_sin_ejecutar():
+    api = APIClient()
+    c = _cliente()
+    f = _factura(c)
+
+    r = api.post(
+        "/api/operaciones/",
+        {"cliente": c.id, "facturas_ids": [f.id]},
+        format="json",
+        HTTP_IDEMPOTENCY_KEY="k" * 256,
+    )
+
+    assert r.status_code == 400
+    assert r.json()["code"] == "VALIDATION_ERROR"
+    assert "Idempotency-Key" in r.json()["errors"]
+    assert not OperacionCesion.objects.exists()
+
+
+def test_error_de_negocio_se_repite_sin_ejecutar_el_servicio():
+    api = APIClient()
+    c = _cliente()
+    f = _factura(c)
+    op_id = api.post("/api/operaciones/", {"cliente": c.id, "facturas_ids": [f.id]}, format="json").json()["id"]
+    api.post(f"/api/operaciones/{op_id}/rechazar/", {"motivo_rechazo": "Riesgo"}, format="json")
+
+    r1 = api.post(f"/api/operaciones/{op_id}/aprobar/", HTTP_IDEMPOTENCY_KEY="k-3")
+    assert r1.status_code == 400
+
+    with mock.patch("operaciones.api.vistas.aprobar_operacion") as servicio:
+        r2 = api.post(f"/api/operaciones/{op_id}/aprobar/", HTTP_IDEMPOTENCY_KEY="k-3")
+    servicio.assert_not_called()
+    assert r2.status_code == 400
+    assert r2.json() == r1.json()
+
+
+def test_clave_expirada_se_ejecuta_de_nuevo_y_purga():
+    api = APIClient()
+    c = _cliente()
+
+    r1 = api.post(f"/api/clientes/{c.id}/suspender/", HTTP_IDEMPOTENCY_KEY="k-4")
+    assert r1.status_code == 200
+    SolicitudIdempotente.objects.filter(clave="k-4").update(expira_en=timezone.now() - timedelta(seconds=1))
+
+    r2 = api.post(f"/api/clientes/{c.id}/suspender/", HTTP_IDEMPOTENCY_KEY="k-4")
+    assert "Idempotent-Replayed" not in r2
+
+    SolicitudIdempotente.objects.filter(clave="k-4").update(expira_en=timezone.now() - timedelta(seconds=1))
+    call_command("purgar_idempotencia")
+    assert not SolicitudIdempotente.objects.exists()
@@ -0,0 +1,172 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from clientes.modelos import Cliente, EstadoCliente
+from facturas.modelos import EstadoFactura, Factura
+from operaciones.modelos import OperacionCesion, OperacionEvento, TipoEventoOperacion
+
+pytestmark = pytest.mark.django_db
+
+
+def _datos():
+    cliente = Cliente.objects.create(
+        rut="12.345.678-5",
+        razon_social="Empresa",
+        email="a@a.cl",
+        linea_credito="1000000.00",
+        linea_disponible="900000.00",
+        estado=EstadoCliente.ACTIVO,
+    )
+    Factura.objects.bulk_create(
+        [
+            Factura(
+                cliente=cliente,
+                numero_factura=f"F-{i}",
+                rut_deudor="76.543.210-3",
+                razon_social_deudor="Deudor",
+                monto_total="1000.00",
+                fecha_emision="2026-02-01",
+                fecha_vencimiento="2026-03-01",
+                estado=EstadoFactura.PAGADA if i % 4 == 0 else EstadoFactura.DISPONIBLE,
+            )
+            for i in range(25)
+        ]
+    )
+    op = OperacionCesion.objects.create(cliente=cliente, tasa_descuento="2.00")
+    fecha = timezone.now()
+    OperacionEvento.objects.bulk_create(
+        [
+            OperacionEvento(operacion=op, fecha=fecha, tipo=TipoEventoOperacion.CREADA, detalle={"i": i})
+            for i in range(5)
+        ]
+    )
+    return cliente, op
+
+
+def _async(metodo, url, **extra):
+    async def solicitud():
+        return await getattr(AsyncClient(), metodo)(url, **extra)
+
+    return async_to_sync(solicitud)()
+
+
+def _async_get(url, **extra):
+    return _async("get", url, **extra)
+
+
+def _mismas_respuestas(url_sync):
+    sync = APIClient().get(url_sync)
+    asincrona = _async_get(url_sync.replace("/api/", "/api/async/", 1))
+    assert asincrona.status_code == sync.status_code, asincrona.content
+    assert json.loads(asincrona.content.replace(b"/api/async/", b"/api/")) == sync.json()
+    return asincrona
+
+
+def test_listados_y_detalles_async_responden_igual_que_la_api_sincrona():
+    cliente, op = _datos()
+    factura = Factura.objects.order_by("id").first()
+
+    for url in [
+        "/api/clientes/",
+        f"/api/clientes/?estado={EstadoCliente.ACTIVO}&linea_credito_min=10",
+        f"/api/clientes/{cliente.id}/",
+        f"/api/clientes/{cliente.id}/linea-disponible/",
+        "/api/facturas/",
+        "/api/facturas/?page=2",
+        f"/api/facturas/?estado={EstadoFactura.PAGADA}&total=estimado",
+        f"/api/facturas/{factura.id}/",
+        "/api/operaciones/",
+        f"/api/operaciones/{op.id}/",
+        f"/api/operaciones/{op.id}/eventos/?limite=2",
+    ]:
+        _mismas_respuestas(url)
+
+
+def test_async_con_las_mismas_cabeceras_condicionales_y_304():
+    cache.clear()
+    cliente, op = _datos()
+    anulada = Factura.objects.order_by("id").first()
+    Factura.objects.filter(id=anulada.id).update(estado=EstadoFactura.ANULADA)
+
+    for url in [
+        "/api/clientes/",
+        f"/api/clientes/{cliente.id}/",
+        "/api/facturas/?page=2",
+        "/api/facturas/?paginacion=cursor&limite=5",
+        "/api/facturas/?total=estimado",
+        f"/api/facturas/{anulada.id}/",
+        f"/api/operaciones/{op.id}/",
+    ]:
+        sync = APIClient().get(url)
+        asincrona = _async_get(url.replace("/api/", "/api/async/", 1))
+        assert asincrona.status_code == sync.status_code == 200, url
+        assert asincrona["Cache-Control"] == sync["Cache-Control"], url
+        assert asincrona["Last-Modified"] == sync["Last-Modified"], url
+        assert asincrona.has_header("ETag"), url
+
+        revalidada = _async_get(url.replace("/api/", "/api/async/", 1), headers={"If-None-Match": asincrona["ETag"]})
+        assert revalidada.status_code == 304, url
+
+    assert "immutable" in _async_get(f"/api/async/facturas/{anulada.id}/")["Cache-Control"]
+
+
+def test_detalle_async_sale_del_cache_de_lecturas():
+    cache.clear()
+    cliente, _ = _datos()
+
+    _async_get(f"/api/async/clientes/{cliente.id}/")
+    with CaptureQueriesContext(connection) as ctx:
+        detalle = _async_get(f"/api/async/clientes/{cliente.id}/")
+        linea = _async_get(f"/api/async/clientes/{cliente.id}/linea-disponible/")
+    assert detalle.status_code == linea.status_code == 200
+    assert not ctx.captured_queries
+
+
+def test_paginacion_cursor_async_recorre_todo_el_listado():
+    _datos()
+    esperados = list(Factura.objects.order_by("-creado_en", "-id").values_list("id", flat=True))
+
+    vistos = []
+    url = "/api/async/facturas/?paginacion=cursor&limite=10&total=true"
+    while url:
+        body = json.loads(_async_get(url).content)
+        assert body["count"] == 25
+        vistos += [r["id"] for r in body["results"]]
+        url = body["next"]
+    assert vistos == esperados
+
+
+def test_errores_async_con_el_formato_de_la_api():
+    cliente, _ = _datos()
+
+    assert _mismas_respuestas("/api/facturas/?fecha_desde=ayer").status_code == 400
+    assert _mismas_respuestas("/api/facturas/?page=99").status_code == 404
+    assert _mismas_respuestas("/api/clientes/999999/").status_code == 404
+    assert _mismas_respuestas(f"/api/clientes/{cliente.id}/?estado={EstadoCliente.SUSPENDIDO}").status_code == 404
+
+    resp = _async("post", "/api/async/clientes/")
+    assert resp.status_code == 405
+    assert resp["Allow"] == "GET, HEAD"
+    assert json.loads(resp.content)["code"] == "METHOD_NOT_ALLOWED"
+
+
+def test_eventos_async_en_ndjson():
+    _, op = _datos()
+
+    resp = _async_get(f"/api/async/operaciones/{op.id}/eventos/?formato=ndjson")
+    assert resp.status_code == 200
+    assert resp["Content-Type"] == "application/x-ndjson"
+
+    async def leer():
+        return b"".join([parte async for parte in resp.streaming_content])
+
+    lineas = async_to_sync(leer)().decode().splitlines()
+    assert [json.loads(linea)["detalle"]["i"] for linea in lineas] == list(range(5))
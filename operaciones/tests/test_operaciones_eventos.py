@@ -0,0 +1,83 @@
+import json
+
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from clientes.modelos import Cliente, EstadoCliente
+from operaciones.modelos import OperacionCesion, OperacionEvento, TipoEventoOperacion
+
+pytestmark = pytest.mark.django_db
+
+
+def _operacion_con_eventos(n):
+    cliente = Cliente.objects.create(
+        rut="12.345.678-5",
+        razon_social="Empresa",
+        email="a@a.cl",
+        linea_credito="1000.00",
+        linea_disponible="1000.00",
+        estado=EstadoCliente.ACTIVO,
+    )
+    op = OperacionCesion.objects.create(cliente=cliente)
+    fecha = timezone.now()
+    OperacionEvento.objects.bulk_create(
+        [
+            OperacionEvento(
+                operacion=op,
+                # fechas repetidas de a pares: el id desempata el orden
+                fecha=fecha + timezone.timedelta(seconds=i // 2),
+                tipo=TipoEventoOperacion.ERROR if i % 3 else TipoEventoOperacion.CREADA,
+                detalle={"i": i},
+            )
+            for i in range(n)
+        ]
+    )
+    return op
+
+
+def test_eventos_paginados_por_cursor_sin_saltos_ni_repetidos():
+    api = APIClient()
+    op = _operacion_con_eventos(7)
+
+    vistos = []
+    url = f"/api/operaciones/{op.id}/eventos/?limite=3"
+    cursor = None
+    while True:
+        resp = api.get(url + (f"&cursor={cursor}" if cursor else ""))
+        assert resp.status_code == 200, resp.data
+        body = resp.json()
+        assert body["operacion_id"] == op.id
+        assert len(body["eventos"]) <= 3
+        vistos += [e["detalle"]["i"] for e in body["eventos"]]
+        cursor = body["siguiente"]
+        if cursor is None:
+            break
+
+    assert vistos == list(range(7))
+
+
+def test_eventos_filtrados_por_tipo_y_parametros_invalidos():
+    api = APIClient()
+    op = _operacion_con_eventos(7)
+
+    resp = api.get(f"/api/operaciones/{op.id}/eventos/?tipo=creada")
+    assert [e["detalle"]["i"] for e in resp.json()["eventos"]] == [0, 3, 6]
+    assert resp.json()["siguiente"] is None
+
+    assert api.get(f"/api/operaciones/{op.id}/eventos/?tipo=otro").status_code == 400
+    assert api.get(f"/api/operaciones/{op.id}/eventos/?limite=0").status_code == 400
+    assert api.get(f"/api/operaciones/{op.id}/eventos/?cursor=@@@").status_code == 400
+
+
+def test_eventos_en_streaming_ndjson():
+    api = APIClient()
+    op = _operacion_con_eventos(5)
+
+    resp = api.get(f"/api/operaciones/{op.id}/eventos/?formato=ndjson&tipo=error")
+    assert resp.status_code == 200
+    assert resp["Content-Type"] == "application/x-ndjson"
+
+    lineas = [json.loads(l) for l in b"".join(resp.streaming_content).decode().splitlines()]
+    assert [l["detalle"]["i"] for l in lineas] == [1, 2, 4]
+    assert set(lineas[0]) == {"id", "tipo", "fecha", "estado_anterior", "estado_nuevo", "detalle"}
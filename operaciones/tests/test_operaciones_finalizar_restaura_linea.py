@@ -1,10 +1,16 @@
+import threading
+
 import pytest
 from decimal import Decimal
+from django.core.management import call_command
+from django.db import connection, transaction
 from django.utils import timezone
 from rest_framework.test import APIClient
 
 from clientes.modelos import Cliente, EstadoCliente
 from facturas.modelos import Factura, EstadoFactura
+from operaciones.modelos import EstadoOperacion, OperacionCesion, OperacionEvento, TipoEventoOperacion
+from operaciones.servicios import barrer_operaciones_pagadas
 
 pytestmark = pytest.mark.django_db
 
@@ -52,17 +58,148 @@ def test_finalizar_operacion_restaura_linea_disponible():
     c.refresh_from_db()
     assert c.linea_disponible == Decimal("150000.00")
 
-    # pagar facturas
+    # pagar facturas => al pagar la última, la operación se finaliza sola
     api.post(f"/api/facturas/{f1.id}/pagar/")
+    c.refresh_from_db()
+    assert c.linea_disponible == Decimal("150000.00")
+
     api.post(f"/api/facturas/{f2.id}/pagar/")
     f1.refresh_from_db()
     f2.refresh_from_db()
     assert f1.estado == EstadoFactura.PAGADA
     assert f2.estado == EstadoFactura.PAGADA
 
-    # finalizar => restaura línea
+    # finalizada => restaura línea
+    assert OperacionCesion.objects.get(id=op_id).estado == EstadoOperacion.FINALIZADA
+    c.refresh_from_db()
+    assert c.linea_disponible == Decimal("300000.00")
+
+    ev = OperacionEvento.objects.get(operacion_id=op_id, tipo=TipoEventoOperacion.FINALIZADA)
+    assert ev.detalle["linea_disponible_anterior"] == "150000.00"
+    assert ev.detalle["linea_disponible_nueva"] == "300000.00"
+
+    # ya no es finalizable por la acción manual
+    r_final = api.post(f"/api/operaciones/{op_id}/finalizar/")
+    assert r_final.status_code == 400
+
+
+def test_finalizar_manual_cuando_facturas_pagadas_por_otra_via():
+    api = APIClient()
+    c = _cliente()
+    f1 = _factura(c, "F-1", "100000.00")
+
+    op_id = api.post("/api/operaciones/", {"cliente": c.id, "facturas_ids": [f1.id]}, format="json").json()["id"]
+    api.post(f"/api/operaciones/{op_id}/aprobar/")
+    Factura.objects.filter(id=f1.id).update(estado=EstadoFactura.PAGADA)
+
     r_final = api.post(f"/api/operaciones/{op_id}/finalizar/")
     assert r_final.status_code == 200
 
     c.refresh_from_db()
     assert c.linea_disponible == Decimal("300000.00")
+    assert "linea_excedente" not in OperacionEvento.objects.get(
+        operacion_id=op_id, tipo=TipoEventoOperacion.FINALIZADA
+    ).detalle
+
+
+def test_finalizar_registra_excedente_si_bajo_la_linea_de_credito():
+    api = APIClient()
+    c = _cliente()
+    f1 = _factura(c, "F-1", "100000.00")
+
+    op_id = api.post("/api/operaciones/", {"cliente": c.id, "facturas_ids": [f1.id]}, format="json").json()["id"]
+    api.post(f"/api/operaciones/{op_id}/aprobar/")
+    # la línea de crédito baja mientras la operación está vigente
+    Cliente.objects.filter(id=c.id).update(linea_credito=Decimal("250000.00"))
+    api.post(f"/api/facturas/{f1.id}/pagar/")
+
+    c.refresh_from_db()
+    assert c.linea_disponible == Decimal("250000.00")
+    ev = OperacionEvento.objects.get(operacion_id=op_id, tipo=TipoEventoOperacion.FINALIZADA)
+    assert ev.detalle["linea_disponible_nueva"] == "250000.00"
+    assert ev.detalle["linea_excedente"] == "50000.00"
+
+
+def test_finalizacion_masiva_por_conjunto():
+    api = APIClient()
+    c = _cliente()
+    otro = Cliente.objects.create(
+        rut="11.111.111-1",
+        razon_social="Otra",
+        email="b@b.cl",
+        linea_credito="100000.00",
+        linea_disponible="100000.00",
+        estado=EstadoCliente.ACTIVO,
+    )
+    fa, fb, fc = _factura(c, "F-A", "100000.00"), _factura(c, "F-B", "50000.00"), _factura(c, "F-C", "10000.00")
+    fo = _factura(otro, "F-O", "40000.00")
+
+    ops = []
+    for cli, f in ((c, fa), (c, fb), (c, fc), (otro, fo)):
+        op_id = api.post("/api/operaciones/", {"cliente": cli.id, "facturas_ids": [f.id]}, format="json").json()["id"]
+        api.post(f"/api/operaciones/{op_id}/aprobar/")
+        ops.append(op_id)
+
+    # pagadas "por fuera" (p.ej. carga masiva), salvo F-C
+    Factura.objects.filter(id__in=[fa.id, fb.id, fo.id]).update(estado=EstadoFactura.PAGADA)
+
+    call_command("finalizar_operaciones_pagadas")
+
+    estados = dict(OperacionCesion.objects.values_list("id", "estado"))
+    assert estados[ops[0]] == EstadoOperacion.FINALIZADA
+    assert estados[ops[1]] == EstadoOperacion.FINALIZADA
+    assert estados[ops[2]] == EstadoOperacion.APROBADA
+    assert estados[ops[3]] == EstadoOperacion.FINALIZADA
+
+    c.refresh_from_db()
+    otro.refresh_from_db()
+    assert c.linea_disponible == Decimal("290000.00")
+    assert otro.linea_disponible == Decimal("100000.00")
+
+    detalles = [
+        OperacionEvento.objects.get(operacion_id=op_id, tipo=TipoEventoOperacion.FINALIZADA).detalle
+        for op_id in ops[:2]
+    ]
+    assert detalles[0]["linea_disponible_anterior"] == "140000.00"
+    assert detalles[0]["linea_disponible_nueva"] == "240000.00"
+    assert detalles[1]["linea_disponible_nueva"] == "290000.00"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_barrido_por_lotes_salta_operaciones_bloqueadas():
+    api = APIClient()
+    c = _cliente()
+    ops = []
+    for i in range(3):
+        f = _factura(c, f"F-{i}", "10000.00")
+        op_id = api.post("/api/operaciones/", {"cliente": c.id, "facturas_ids": [f.id]}, format="json").json()["id"]
+        api.post(f"/api/operaciones/{op_id}/aprobar/")
+        ops.append(op_id)
+    Factura.objects.update(estado=EstadoFactura.PAGADA)
+
+    lotes = []
+    tomada, liberar = threading.Event(), threading.Event()
+
+    def bloquear_primera():
+        try:
+            with transaction.atomic():
+                OperacionCesion.objects.select_for_update(no_key=True).get(id=ops[0])
+                tomada.set()
+                liberar.wait(10)
+        finally:
+            connection.close()
+
+    hilo = threading.Thread(target=bloquear_primera)
+    hilo.start()
+    tomada.wait(10)
+    try:
+        total = barrer_operaciones_pagadas(tamano_lote=1, al_procesar_lote=lambda n, k: lotes.append((n, k)))
+    finally:
+        liberar.set()
+        hilo.join()
+
+    assert total == 2
+    assert lotes == [(1, 1), (2, 1)]
+    estados = dict(OperacionCesion.objects.values_list("id", "estado"))
+    assert estados[ops[0]] == EstadoOperacion.APROBADA
+    assert estados[ops[1]] == estados[ops[2]] == EstadoOperacion.FINALIZADA
@@ -0,0 +1,107 @@
+import pytest
+from decimal import Decimal
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from clientes.modelos import Cliente, EstadoCliente
+from facturas.modelos import Factura, EstadoFactura
+from operaciones.modelos import OperacionCesion, OperacionEvento, TipoEventoOperacion
+
+pytestmark = pytest.mark.django_db
+
+
+def _cliente(rut, estado=EstadoCliente.ACTIVO):
+    return Cliente.objects.create(
+        rut=rut,
+        razon_social="Empresa",
+        email="a@a.cl",
+        linea_credito="1000000.00",
+        linea_disponible="1000000.00",
+        estado=estado,
+    )
+
+
+def _factura(cliente, numero, monto="100000.00", dias=30):
+    hoy = timezone.localdate()
+    return Factura.objects.create(
+        cliente=cliente,
+        numero_factura=numero,
+        rut_deudor="76.543.210-3",
+        razon_social_deudor="Deudor",
+        monto_total=Decimal(monto),
+        fecha_emision=hoy - timezone.timedelta(days=40),
+        fecha_vencimiento=hoy + timezone.timedelta(days=dias),
+        estado=EstadoFactura.DISPONIBLE,
+    )
+
+
+def test_lote_crea_validas_y_reporta_errores_por_item():
+    api = APIClient()
+    c1 = _cliente("12.345.678-5")
+    c2 = _cliente("11.111.111-1")
+    c_susp = _cliente("9.876.543-3", estado=EstadoCliente.SUSPENDIDO)
+
+    f1 = _factura(c1, "F-1")
+    f2 = _factura(c1, "F-2", monto="50000.00")
+    f3 = _factura(c2, "F-3")
+    f_vencida = _factura(c2, "F-V", dias=-1)
+    f_susp = _factura(c_susp, "F-S")
+
+    payload = {
+        "operaciones": [
+            {"cliente": c1.id, "facturas_ids": [f1.id, f2.id]},
+            {"cliente": c2.id, "facturas_ids": [f3.id], "tasa_descuento": "3.00"},
+            {"cliente": c2.id, "facturas_ids": [f_vencida.id]},
+            {"cliente": c_susp.id, "facturas_ids": [f_susp.id]},
+            {"cliente": c1.id, "facturas_ids": []},
+            {"cliente": 999999, "facturas_ids": [f1.id]},
+            {"facturas_ids": [f1.id]},
+        ]
+    }
+
+    resp = api.post("/api/operaciones/lote/", payload, format="json")
+    assert resp.status_code == 200, resp.data
+    body = resp.json()
+
+    assert body["total"] == 7
+    assert body["creadas"] == 2
+    assert body["fallidas"] == 5
+
+    res = body["resultados"]
+    assert [r["indice"] for r in res] == list(range(7))
+    assert res[0]["estado"] == "creada"
+    assert Decimal(res[0]["operacion"]["monto_total_facturas"]) == Decimal("150000.00")
+    assert res[1]["estado"] == "creada"
+    assert Decimal(res[1]["operacion"]["tasa_descuento"]) == Decimal("3.00")
+    assert "facturas_ids" in res[2]["errores"]
+    assert "cliente" in res[3]["errores"]
+    assert "facturas_ids" in res[4]["errores"]
+    assert "cliente" in res[5]["errores"]
+    assert "cliente" in res[6]["errores"]
+
+    ops = OperacionCesion.objects.all()
+    assert ops.count() == 2
+    op1 = ops.get(id=res[0]["operacion"]["id"])
+    assert set(op1.facturas.values_list("id", flat=True)) == {f1.id, f2.id}
+    assert OperacionEvento.objects.filter(tipo=TipoEventoOperacion.CREADA).count() == 2
+
+
+def test_lote_cantidad_de_consultas_no_crece_con_las_solicitudes(django_assert_max_num_queries):
+    api = APIClient()
+    c = _cliente("12.345.678-5")
+    facturas = [_factura(c, f"F-{i}") for i in range(20)]
+
+    payload = {"operaciones": [{"cliente": c.id, "facturas_ids": [f.id]} for f in facturas]}
+
+    with django_assert_max_num_queries(10):
+        resp = api.post("/api/operaciones/lote/", payload, format="json")
+
+    assert resp.status_code == 200, resp.data
+    assert resp.json()["creadas"] == 20
+
+
+def test_lote_vacio_devuelve_400():
+    api = APIClient()
+    resp = api.post("/api/operaciones/lote/", {"operaciones": []}, format="json")
+    assert resp.status_code == 400
+    assert resp.json()["code"] == "VALIDATION_ERROR"
@@ -0,0 +1,143 @@
+import pytest
+from decimal import Decimal
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from clientes.modelos import Cliente, EstadoCliente
+from facturas.modelos import Factura, EstadoFactura
+from operaciones.modelos import EstadoOperacion, OperacionCesion, OperacionEvento, TipoEventoOperacion
+
+pytestmark = pytest.mark.django_db
+
+
+def _cliente(rut="12.345.678-5", linea="250000.00"):
+    return Cliente.objects.create(
+        rut=rut,
+        razon_social="Empresa",
+        email="a@a.cl",
+        linea_credito=linea,
+        linea_disponible=linea,
+        estado=EstadoCliente.ACTIVO,
+    )
+
+
+def _factura(cliente, numero, monto="100000.00"):
+    hoy = timezone.localdate()
+    return Factura.objects.create(
+        cliente=cliente,
+        numero_factura=numero,
+        rut_deudor="76.543.210-3",
+        razon_social_deudor="Deudor",
+        monto_total=Decimal(monto),
+        fecha_emision=hoy,
+        fecha_vencimiento=hoy + timezone.timedelta(days=30),
+        estado=EstadoFactura.DISPONIBLE,
+    )
+
+
+def _operacion(api, cliente, *facturas):
+    resp = api.post(
+        "/api/operaciones/",
+        {"cliente": cliente.id, "facturas_ids": [f.id for f in facturas]},
+        format="json",
+    )
+    assert resp.status_code == 201, resp.data
+    return resp.json()["id"]
+
+
+def test_aprobar_lote_acumula_consumo_de_linea_por_cliente():
+    api = APIClient()
+    c = _cliente(linea="250000.00")
+    otro = _cliente(rut="11.111.111-1", linea="500000.00")
+
+    op1 = _operacion(api, c, _factura(c, "F-1"))
+    op2 = _operacion(api, c, _factura(c, "F-2"))
+    op3 = _operacion(api, c, _factura(c, "F-3"))  # excede la línea tras op1 y op2
+    op4 = _operacion(api, otro, _factura(otro, "F-4"))
+
+    resp = api.post(
+        "/api/operaciones/aprobar-lote/",
+        {"operaciones_ids": [op1, op2, op3, op4, 999999]},
+        format="json",
+    )
+    assert resp.status_code == 200, resp.data
+    body = resp.json()
+    assert body["aprobadas"] == 3
+    assert body["fallidas"] == 2
+
+    res = body["resultados"]
+    assert [r["operacion_id"] for r in res] == [op1, op2, op3, op4, 999999]
+    assert res[0]["estado"] == "aprobada"
+    assert res[1]["estado"] == "aprobada"
+    assert "linea_disponible" in res[2]["errores"]
+    assert res[3]["estado"] == "aprobada"
+    assert "operacion" in res[4]["errores"]
+
+    c.refresh_from_db()
+    otro.refresh_from_db()
+    assert c.linea_disponible == Decimal("50000.00")
+    assert otro.linea_disponible == Decimal("400000.00")
+
+    assert OperacionCesion.objects.get(id=op3).estado == EstadoOperacion.PENDIENTE
+    assert Factura.objects.filter(estado=EstadoFactura.CEDIDA).count() == 3
+
+    ev = OperacionEvento.objects.get(operacion_id=op2, tipo=TipoEventoOperacion.APROBADA)
+    assert ev.detalle["linea_disponible_anterior"] == "150000.00"
+    assert ev.detalle["linea_disponible_nueva"] == "50000.00"
+
+
+def test_aprobar_lote_no_cede_dos_veces_la_misma_factura():
+    api = APIClient()
+    c = _cliente(linea="1000000.00")
+    f = _factura(c, "F-1")
+
+    op1 = _operacion(api, c, f)
+    op2 = _operacion(api, c, f)
+
+    resp = api.post("/api/operaciones/aprobar-lote/", {"operaciones_ids": [op1, op2]}, format="json")
+    res = resp.json()["resultados"]
+    assert res[0]["estado"] == "aprobada"
+    assert "facturas" in res[1]["errores"]
+
+
+def test_rechazar_y_desembolsar_lote():
+    api = APIClient()
+    c = _cliente(linea="1000000.00")
+    op1 = _operacion(api, c, _factura(c, "F-1"))
+    op2 = _operacion(api, c, _factura(c, "F-2"))
+    op3 = _operacion(api, c, _factura(c, "F-3"))
+
+    api.post(f"/api/operaciones/{op1}/aprobar/")
+
+    r_rech = api.post(
+        "/api/operaciones/rechazar-lote/",
+        {"operaciones_ids": [op1, op2, op3], "motivo_rechazo": "Riesgo deudor"},
+        format="json",
+    )
+    assert r_rech.status_code == 200, r_rech.data
+    assert r_rech.json()["rechazadas"] == 2
+    res = r_rech.json()["resultados"]
+    assert "estado" in res[0]["errores"]
+    assert res[1]["operacion"]["motivo_rechazo"] == "Riesgo deudor"
+    assert OperacionCesion.objects.filter(estado=EstadoOperacion.RECHAZADA).count() == 2
+
+    r_des = api.post("/api/operaciones/desembolsar-lote/", {"operaciones_ids": [op1, op2]}, format="json")
+    assert r_des.json()["desembolsadas"] == 1
+    res = r_des.json()["resultados"]
+    assert res[0]["estado"] == "desembolsada"
+    assert res[1]["estado"] == "error"
+
+    op = OperacionCesion.objects.get(id=op1)
+    assert op.estado == EstadoOperacion.DESEMBOLSADA
+    assert op.fecha_desembolso is not None
+    assert OperacionEvento.objects.filter(tipo=TipoEventoOperacion.DESEMBOLSADA).count() == 1
+
+
+def test_lote_rechaza_ids_repetidos():
+    api = APIClient()
+    c = _cliente()
+    op1 = _operacion(api, c, _factura(c, "F-1"))
+
+    resp = api.post("/api/operaciones/desembolsar-lote/", {"operaciones_ids": [op1, op1]}, format="json")
+    res = resp.json()["resultados"]
+    assert all(r["estado"] == "error" for r in res)
@@ -0,0 +1,121 @@
+import json
+
+import pytest
+from decimal import Decimal
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from clientes.modelos import Cliente, EstadoCliente
+from facturas.modelos import Factura, EstadoFactura
+from operaciones.modelos import EventoOutbox, OperacionEvento
+from operaciones.outbox import publicar_lote
+
+pytestmark = pytest.mark.django_db
+
+
+class SinkMemoria:
+    def __init__(self, fallar=False):
+        self.mensajes = []
+        self.fallar = fallar
+
+    def publicar(self, mensajes):
+        if self.fallar:
+            raise ConnectionError("sink caído")
+        self.mensajes.extend(mensajes)
+
+
+def _cliente(rut="12.345.678-5"):
+    return Cliente.objects.create(
+        rut=rut,
+        razon_social="Empresa",
+        email="a@a.cl",
+        linea_credito="1000000.00",
+        linea_disponible="1000000.00",
+        estado=EstadoCliente.ACTIVO,
+    )
+
+
+def _factura(cliente, numero):
+    hoy = timezone.localdate()
+    return Factura.objects.create(
+        cliente=cliente,
+        numero_factura=numero,
+        rut_deudor="76.543.210-3",
+        razon_social_deudor="Deudor",
+        monto_total=Decimal("100000.00"),
+        fecha_emision=hoy,
+        fecha_vencimiento=hoy + timezone.timedelta(days=30),
+        estado=EstadoFactura.DISPONIBLE,
+    )
+
+
+def _operacion_aprobada(api, cliente, numero):
+    f = _factura(cliente, numero)
+    resp = api.post("/api/operaciones/", {"cliente": cliente.id, "facturas_ids": [f.id]}, format="json")
+    assert resp.status_code == 201, resp.data
+    op_id = resp.json()["id"]
+    assert api.post(f"/api/operaciones/{op_id}/aprobar/", {}, format="json").status_code == 200
+    return op_id
+
+
+def test_cada_evento_se_escribe_en_el_outbox_en_la_misma_transaccion():
+    api = APIClient()
+    c = _cliente()
+    op1 = _operacion_aprobada(api, c, "F-1")
+    op2 = _operacion_aprobada(api, c, "F-2")
+    api.post("/api/operaciones/desembolsar-lote/", {"operaciones_ids": [op1, op2]}, format="json")
+
+    eventos = list(OperacionEvento.objects.order_by("id").values_list("id", "operacion_id", "tipo"))
+    outbox = list(EventoOutbox.objects.order_by("id").values_list("evento_id", "operacion_id", "tipo"))
+    assert len(eventos) == 6
+    assert outbox == eventos
+
+
+def test_publicador_entrega_en_orden_por_operacion_y_marca_enviados():
+    api = APIClient()
+    c = _cliente()
+    ops = [_operacion_aprobada(api, c, f"F-{i}") for i in range(4)]
+
+    sinks = [SinkMemoria(), SinkMemoria()]
+    for particion, sink in enumerate(sinks):
+        while publicar_lote(particion=particion, particiones=2, tamano_lote=3, sink=sink):
+            pass
+
+    publicados = sinks[0].mensajes + sinks[1].mensajes
+    assert len(publicados) == 8
+    assert not EventoOutbox.objects.filter(enviado_en__isnull=True).exists()
+    for op_id in ops:
+        tipos = [m["tipo"] for m in publicados if m["operacion_id"] == op_id]
+        assert tipos == ["creada", "aprobada"]
+    for particion, sink in enumerate(sinks):
+        assert all(m["operacion_id"] % 2 == particion for m in sink.mensajes)
+
+
+def test_si_el_sink_falla_el_lote_queda_pendiente():
+    api = APIClient()
+    _operacion_aprobada(api, _cliente(), "F-1")
+
+    with pytest.raises(ConnectionError):
+        publicar_lote(sink=SinkMemoria(fallar=True))
+    assert EventoOutbox.objects.filter(enviado_en__isnull=True).count() == 2
+
+    sink = SinkMemoria()
+    assert publicar_lote(sink=sink) == 2
+    assert [m["id"] for m in sink.mensajes] == list(EventoOutbox.objects.order_by("id").values_list("id", flat=True))
+
+
+@pytest.mark.django_db(transaction=True)
+def test_comando_publica_con_varios_workers_en_archivo(tmp_path, settings):
+    settings.OUTBOX_ARCHIVO = str(tmp_path / "outbox.jsonl")
+    api = APIClient()
+    c = _cliente()
+    for i in range(3):
+        _operacion_aprobada(api, c, f"F-{i}")
+
+    call_command("publicar_outbox", "--workers", "3", "--una-vez")
+
+    lineas = [json.loads(l) for l in (tmp_path / "outbox.jsonl").read_text().splitlines()]
+    assert len(lineas) == 6
+    assert {l["tipo"] for l in lineas} == {"creada", "aprobada"}
+    assert not EventoOutbox.objects.filter(enviado_en__isnull=True).exists()